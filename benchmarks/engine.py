@@ -0,0 +1,246 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Benchmarks the per-part overhead of the PyFunceble engines.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# pylint: disable=consider-using-with
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+ENGINES: List[str] = ["subprocess", "in-process"]
+
+# Executed by the spawned interpreter. It mimics a launcher process: the
+# orchestration (and with it PyFunceble) is loaded before the engine starts
+# PyFunceble.
+BOOTSTRAP = """
+import sys
+
+import dead_hosts.launcher.orchestration
+from dead_hosts.launcher.engine import PyFuncebleEngine
+
+PyFuncebleEngine(sys.argv[1]).run("-f", sys.argv[2], "--no-files")
+"""
+
+
+def create_workspace(destination: str, subjects: int) -> Dict[str, str]:
+    """
+    Creates a synthetic workspace: a file to test and a PyFunceble
+    configuration directory that doesn't need any network access to start.
+    """
+
+    config_dir = os.path.join(destination, "config")
+    output_dir = os.path.join(destination, "output")
+
+    os.makedirs(config_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    now = datetime.now(timezone.utc)
+
+    with open(
+        os.path.join(config_dir, "user_agents.json"), "w", encoding="utf-8"
+    ) as file_stream:
+        json.dump(
+            {"chrome": {x: "Mozilla/5.0" for x in ("linux", "macosx", "win10")}},
+            file_stream,
+        )
+
+    with open(
+        os.path.join(config_dir, ".pyfunceble_intern_downtime.json"),
+        "w",
+        encoding="utf-8",
+    ) as file_stream:
+        json.dump(
+            {"user_agents": {"iso": now.isoformat(), "timestamp": now.timestamp()}},
+            file_stream,
+        )
+
+    input_file = os.path.join(destination, "origin.list")
+
+    with open(input_file, "w", encoding="utf-8") as file_stream:
+        file_stream.write("# Generated by the engine benchmark.\n")
+        file_stream.writelines(f"example-{x}.invalid\n" for x in range(subjects))
+
+    return {
+        "input_file": input_file,
+        "PYFUNCEBLE_CONFIG_DIR": config_dir,
+        "PYFUNCEBLE_OUTPUT_LOCATION": output_dir,
+    }
+
+
+def spawn(engine: str, workspace: str, environment: Dict[str, str]) -> dict:
+    """
+    Spawns a launcher-like process once and measures it.
+    """
+
+    files = create_workspace(workspace, int(environment["BENCHMARK_SUBJECTS"]))
+
+    environment = dict(environment)
+    environment["PYFUNCEBLE_CONFIG_DIR"] = files["PYFUNCEBLE_CONFIG_DIR"]
+    environment["PYFUNCEBLE_OUTPUT_LOCATION"] = files["PYFUNCEBLE_OUTPUT_LOCATION"]
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", BOOTSTRAP, engine, files["input_file"]],
+        cwd=workspace,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    # The usage covers the reaped descendants too: the child PyFunceble of
+    # the subprocess engine is accounted.
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+
+    return {
+        "returncode": os.waitstatus_to_exitcode(status),
+        "wall_ms": wall_time * 1000,
+        "cpu_ms": (usage.ru_utime + usage.ru_stime) * 1000,
+    }
+
+
+def summarize(values: List[float]) -> dict:
+    """
+    Provides the summary of the given measurements.
+    """
+
+    return {
+        "min": min(values),
+        "median": statistics.median(values),
+        "max": max(values),
+        "runs": values,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Provides the CLI of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the per-part overhead of the PyFunceble engines."
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="The number of timed runs."
+    )
+    parser.add_argument(
+        "--subjects",
+        type=int,
+        default=0,
+        help="The number of subjects to test. Default: none - overhead only.",
+    )
+    parser.add_argument("-o", "--output", help="Where to write the JSON report.")
+
+    arguments = parser.parse_args(argv)
+
+    environment = {
+        x: y
+        for x, y in os.environ.items()
+        if not x.startswith(("GITHUB_", "PLATFORM_", "DEV_PLATFORM_", "DEAD_HOSTS_"))
+        and x not in ("GIT_EMAIL", "INFRASTRUCTURE_DEBUG")
+    }
+    environment["PYFUNCEBLE_AUTO_CONFIGURATION"] = "yes"
+    environment["BENCHMARK_SUBJECTS"] = str(arguments.subjects)
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": arguments.repeat,
+            "subjects": arguments.subjects,
+        },
+        "engines": {},
+    }
+
+    root = tempfile.mkdtemp(prefix="dead-hosts-benchmark-")
+
+    try:
+        for engine in ENGINES:
+            runs = []
+
+            # The first run warms up the file system caches and is ignored.
+            for index in range(arguments.repeat + 1):
+                workspace = os.path.join(root, f"{engine}-{index}")
+                runs.append(spawn(engine, workspace, environment))
+                shutil.rmtree(workspace, ignore_errors=True)
+
+            runs.pop(0)
+
+            report["engines"][engine] = {
+                "returncodes": sorted({x["returncode"] for x in runs}),
+                "wall_ms": summarize([x["wall_ms"] for x in runs]),
+                "cpu_ms": summarize([x["cpu_ms"] for x in runs]),
+            }
+
+            data = report["engines"][engine]
+
+            print(
+                f"{engine:<12}median {data['wall_ms']['median']:>8.1f} ms"
+                f" | cpu {data['cpu_ms']['median']:>8.1f} ms"
+                f" | exit codes {data['returncodes']}"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    saved = (
+        report["engines"]["subprocess"]["wall_ms"]["median"]
+        - report["engines"]["in-process"]["wall_ms"]["median"]
+    )
+    report["saved_wall_ms_per_part"] = saved
+
+    print(f"Saved per part: {saved:.1f} ms")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file_stream:
+            json.dump(report, file_stream, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
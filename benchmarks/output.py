@@ -0,0 +1,271 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Benchmarks the generation of clean.list from a PyFunceble ACTIVE list.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from PyFunceble.helpers.file import FileHelper
+
+import dead_hosts.launcher.defaults.outputs
+from dead_hosts.launcher.output import (
+    OutputWriter,
+    get_compressions,
+    get_format_destinations,
+    open_compressor,
+)
+
+HEADER: List[str] = ["# Generated by the output benchmark."]
+
+
+def create_active_list(path: str, subjects: int) -> None:
+    """
+    Creates a synthetic PyFunceble ACTIVE list.
+    """
+
+    with open(path, "w", encoding="utf-8") as file_stream:
+        file_stream.write("# Generated by PyFunceble.\n# Date: today\n\n")
+        file_stream.writelines(f"example-{x}.com\n" for x in range(subjects))
+
+
+def write_line_by_line(source: str, destination: str) -> None:
+    """
+    Writes the output the way we used to: one (append) write per line.
+    """
+
+    output_file = FileHelper(destination)
+    output_file.write("\n".join(HEADER) + "\n\n", overwrite=True)
+
+    with open(source, "r", encoding="utf-8") as file_stream:
+        for line in file_stream:
+            if line.startswith("#"):
+                continue
+
+            output_file.write(line)
+
+    output_file.write("\n")
+
+
+def write_in_blocks(source: str, destination: str) -> None:
+    """
+    Writes the output through our output writer.
+    """
+
+    OutputWriter(destination, HEADER).write([source])
+
+
+def write_all_formats(source: str, destination: str) -> None:
+    """
+    Writes the output and all its other formats through our output writer.
+    """
+
+    OutputWriter(
+        destination,
+        HEADER,
+        formats=get_format_destinations(
+            os.path.dirname(destination),
+            dead_hosts.launcher.defaults.outputs.FORMATS,
+        ),
+    ).write([source])
+
+
+def write_compressed(source: str, destination: str) -> None:
+    """
+    Writes the output and its compressed versions through our output writer.
+    """
+
+    OutputWriter(
+        destination,
+        HEADER,
+        compressions=get_compressions(
+            dead_hosts.launcher.defaults.outputs.COMPRESSIONS
+        ),
+    ).write([source])
+
+
+def write_compressed_after(source: str, destination: str) -> None:
+    """
+    Writes the output through our output writer, then compresses it - one
+    compression after the other.
+    """
+
+    write_in_blocks(source, destination)
+
+    for name in get_compressions(dead_hosts.launcher.defaults.outputs.COMPRESSIONS):
+        extension = dead_hosts.launcher.defaults.outputs.COMPRESSIONS[name]["extension"]
+
+        with open(destination, "rb") as input_stream, open(
+            destination + extension, "wb"
+        ) as output_stream, open_compressor(output_stream, name) as compressor:
+            shutil.copyfileobj(input_stream, compressor, 1024 * 1024)
+
+
+def write_sorted(source: str, destination: str) -> None:
+    """
+    Writes the output through our output writer - sorted and deduplicated.
+    """
+
+    OutputWriter(destination, HEADER, sort=True).write([source])
+
+
+def measure(writer: Callable[[str, str], None], source: str, destination: str) -> float:
+    """
+    Measures a single write.
+    """
+
+    start = time.perf_counter()
+    writer(source, destination)
+
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Provides the CLI of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the generation of clean.list."
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="The number of timed runs."
+    )
+    parser.add_argument(
+        "--subjects",
+        type=int,
+        default=2_000_000,
+        help="The number of subjects of the ACTIVE list.",
+    )
+    parser.add_argument(
+        "--legacy-repeat",
+        type=int,
+        default=1,
+        help="The number of timed runs of the line by line writer. " "0 skips it.",
+    )
+    parser.add_argument(
+        "--compressed-repeat",
+        type=int,
+        default=1,
+        help="The number of timed runs of the compressed writers. 0 skips them.",
+    )
+    parser.add_argument("-o", "--output", help="Where to write the JSON report.")
+
+    arguments = parser.parse_args(argv)
+
+    writers: Dict[str, Callable[[str, str], None]] = {
+        "line-by-line": write_line_by_line,
+        "blocks": write_in_blocks,
+        "all-formats": write_all_formats,
+        "sorted": write_sorted,
+        "compressed": write_compressed,
+        "compressed-after": write_compressed_after,
+    }
+    repeats = {
+        "line-by-line": arguments.legacy_repeat,
+        "blocks": arguments.repeat,
+        "all-formats": arguments.repeat,
+        "sorted": arguments.repeat,
+        "compressed": arguments.compressed_repeat,
+        "compressed-after": arguments.compressed_repeat,
+    }
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "subjects": arguments.subjects,
+        },
+        "writers": {},
+    }
+
+    root = tempfile.mkdtemp(prefix="dead-hosts-benchmark-")
+
+    try:
+        source = os.path.join(root, "list")
+        create_active_list(source, arguments.subjects)
+
+        outputs = {}
+
+        for name, writer in writers.items():
+            if not repeats[name]:
+                continue
+
+            outputs[name] = os.path.join(root, f"{name}.list")
+            runs = [
+                measure(writer, source, outputs[name]) for _ in range(repeats[name])
+            ]
+
+            report["writers"][name] = {
+                "median_seconds": statistics.median(runs),
+                "lines_per_second": arguments.subjects / statistics.median(runs),
+                "runs": runs,
+            }
+
+            print(
+                f"{name:<18}median {statistics.median(runs):>8.3f} s"
+                f" | {arguments.subjects / statistics.median(runs):>12,.0f} lines/s"
+            )
+
+        if "line-by-line" in outputs:
+            with open(outputs["line-by-line"], "rb") as first, open(
+                outputs["blocks"], "rb"
+            ) as second:
+                report["identical"] = first.read() == second.read()
+
+            print(f"Identical outputs: {report['identical']}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file_stream:
+            json.dump(report, file_stream, indent=4)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the startup benchmark of every CLI mode of the launcher.
+
+Usage:
+::
+
+    python benchmarks/startup.py --output report.json
+    python benchmarks/startup.py --baseline baseline.json --max-regression 0.2
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+# pylint: disable=consider-using-with
+
+import argparse
+import http.server
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+MODES: Dict[str, List[str]] = {
+    "version": ["--version"],
+    "unauthorized": [],
+    "save": ["--save"],
+    "end": ["--end"],
+    "update": ["--update"],
+    "authorize": ["--authorize"],
+}
+
+# Executed by the spawned interpreter. It redirects every remote resource the
+# updaters may fetch to our local stand-in server before handing over to the
+# real CLI.
+BOOTSTRAP = """
+import os
+import sys
+
+import dead_hosts.launcher.defaults.links as links
+
+for name in dir(links):
+    value = getattr(links, name)
+
+    if isinstance(value, dict) and "link" in value:
+        value["link"] = (
+            os.environ["BENCHMARK_STANDIN_URL"] + "/" + value["link"].rsplit("/", 1)[-1]
+        )
+
+from dead_hosts.launcher.cli import tool
+
+tool()
+"""
+
+STANDIN_CONTENT: Dict[str, bytes] = {
+    ".yml": b"name: Stand-in\non:\n  workflow_dispatch: {}\njobs: {}\n",
+    ".yaml": b"cli_testing:\n  max_workers: 1\n",
+    ".txt": b"PyFunceble-dev\n",
+}
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves a small, static document for every requested path.
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answers a GET request.
+        """
+
+        extension = os.path.splitext(self.path)[-1]
+        content = STANDIN_CONTENT.get(extension, b"Stand-in document.\n")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def start_standin_server() -> Tuple[http.server.ThreadingHTTPServer, str]:
+    """
+    Starts the local stand-in server and provides its base URL.
+    """
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def create_workspace(destination: str, active_subjects: int) -> str:
+    """
+    Creates a synthetic workspace: a git repository with an administration
+    file that is not due for a test and a PyFunceble ACTIVE output.
+    """
+
+    os.makedirs(destination, exist_ok=True)
+
+    subprocess.run(["git", "init", "-q", destination], check=True)
+    subprocess.run(
+        [
+            "git",
+            "-C",
+            destination,
+            "remote",
+            "add",
+            "origin",
+            "https://github.com/example-owner/example-list.git",
+        ],
+        check=True,
+    )
+
+    recent = datetime.utcnow() - timedelta(hours=1)
+
+    with open(
+        os.path.join(destination, "info.json"), "w", encoding="utf-8"
+    ) as file_stream:
+        json.dump(
+            {
+                "currently_under_test": False,
+                "custom_pyfunceble_config": {},
+                "days_until_next_test": 2.0,
+                "finish_datetime": recent.isoformat(),
+                "finish_timestamp": recent.timestamp(),
+                "live_update": True,
+                "name": "example-list",
+                "own_management": False,
+                "ping": [],
+                "ping_enabled": False,
+                "platform_optout": True,
+                "raw_link": None,
+            },
+            file_stream,
+            indent=4,
+        )
+
+    with open(
+        os.path.join(destination, "README.md"), "w", encoding="utf-8"
+    ) as file_stream:
+        file_stream.write("# example-list\n\n# About PyFunceble\n\nStand-in.\n")
+
+    active_dir = os.path.join(destination, "output", "origin.list", "domains", "ACTIVE")
+    os.makedirs(active_dir, exist_ok=True)
+
+    with open(os.path.join(active_dir, "list"), "w", encoding="utf-8") as stream:
+        stream.write("# Generated by PyFunceble.\n")
+        stream.writelines(f"example-{x}.org\n" for x in range(active_subjects))
+
+    return destination
+
+
+def spawn(
+    arguments: List[str],
+    workspace: str,
+    environment: Dict[str, str],
+    importtime: bool = False,
+) -> dict:
+    """
+    Spawns the launcher once and measures it.
+    """
+
+    command = [sys.executable]
+
+    if importtime:
+        command.extend(["-X", "importtime"])
+
+    command.extend(["-c", BOOTSTRAP, *arguments])
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        cwd=workspace,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE if importtime else subprocess.DEVNULL,
+    )
+
+    stderr = b""
+
+    if importtime:
+        # Drain stderr before reaping so a verbose child can't block on us.
+        stderr = process.stderr.read()
+        process.stderr.close()
+
+    _, status, usage = os.wait4(process.pid, 0)
+    wall_time = time.perf_counter() - start
+
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        "returncode": process.returncode,
+        "wall_ms": wall_time * 1000,
+        "max_rss_kb": usage.ru_maxrss,
+        "stderr": stderr.decode("utf-8", errors="replace"),
+    }
+
+
+def parse_importtime(stderr: str, top: int) -> dict:
+    """
+    Parses the output of :code:`-X importtime` into a module breakdown.
+    """
+
+    modules = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+
+    packages: Dict[str, int] = {}
+
+    for module in modules:
+        package = module["module"].split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + module["self_us"]
+
+    return {
+        "total_us": sum(x["self_us"] for x in modules),
+        "modules_count": len(modules),
+        "top_modules": sorted(modules, key=lambda x: -x["cumulative_us"])[:top],
+        "packages": dict(sorted(packages.items(), key=lambda x: -x[1])[:top]),
+    }
+
+
+def benchmark_mode(  # pylint: disable=too-many-arguments
+    name: str,
+    arguments: List[str],
+    root: str,
+    environment: Dict[str, str],
+    *,
+    repeat: int,
+    active_subjects: int,
+    top: int,
+) -> dict:
+    """
+    Benchmarks a single mode. Every run gets a fresh workspace so that the
+    state written by a run can't influence the next one.
+    """
+
+    runs = []
+
+    for index in range(repeat + 1):
+        workspace = create_workspace(
+            os.path.join(root, f"{name}-{index}"), active_subjects
+        )
+        runs.append(
+            spawn(arguments, workspace, environment, importtime=index == repeat)
+        )
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    # The last run is only here for the import breakdown: -X importtime
+    # distorts the wall time.
+    profiled = runs.pop()
+    wall_times = [x["wall_ms"] for x in runs]
+
+    return {
+        "arguments": arguments,
+        "returncodes": sorted({x["returncode"] for x in runs}),
+        "wall_ms": {
+            "min": min(wall_times),
+            "median": statistics.median(wall_times),
+            "max": max(wall_times),
+            "runs": wall_times,
+        },
+        "max_rss_kb": max(x["max_rss_kb"] for x in runs),
+        "importtime": parse_importtime(profiled["stderr"], top),
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    Prints the comparison of the given report against the given baseline.
+
+    :return:
+        :py:class:`True` when no mode regressed more than allowed.
+    """
+
+    succeeded = True
+
+    print(f"{'mode':<14}{'baseline':>12}{'current':>12}{'delta':>10}")
+
+    for name, data in report["modes"].items():
+        if name not in baseline.get("modes", {}):
+            print(f"{name:<14}{'-':>12}{data['wall_ms']['median']:>10.1f}ms")
+            continue
+
+        previous = baseline["modes"][name]["wall_ms"]["median"]
+        current = data["wall_ms"]["median"]
+        delta = (current - previous) / previous if previous else 0.0
+
+        marker = ""
+
+        if delta > max_regression:
+            marker = "  <- regression"
+            succeeded = False
+
+        print(
+            f"{name:<14}{previous:>10.1f}ms{current:>10.1f}ms"
+            f"{delta * 100:>9.1f}%{marker}"
+        )
+
+    return succeeded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Provides the CLI of the benchmark.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the startup of every CLI mode of the launcher."
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        action="append",
+        choices=list(MODES),
+        help="The mode(s) to benchmark. Default: all.",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="The number of timed runs."
+    )
+    parser.add_argument(
+        "--active-subjects",
+        type=int,
+        default=10_000,
+        help="The number of subjects in the synthetic ACTIVE output.",
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="The size of the import breakdowns."
+    )
+    parser.add_argument("-o", "--output", help="Where to write the JSON report.")
+    parser.add_argument("-b", "--baseline", help="A report to compare against.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="The tolerated relative regression of the median wall time.",
+    )
+
+    arguments = parser.parse_args(argv)
+
+    server, standin_url = start_standin_server()
+
+    environment = {
+        x: y
+        for x, y in os.environ.items()
+        if not x.startswith(("GITHUB_", "PLATFORM_", "DEV_PLATFORM_"))
+        and x not in ("GIT_EMAIL", "INFRASTRUCTURE_DEBUG", "PYFUNCEBLE_CONFIG_DIR")
+    }
+    environment["BENCHMARK_STANDIN_URL"] = standin_url
+    environment["PLATFORM_API_URL"] = standin_url
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": sys.version,
+            "platform": platform.platform(),
+            "repeat": arguments.repeat,
+            "active_subjects": arguments.active_subjects,
+        },
+        "modes": {},
+    }
+
+    root = tempfile.mkdtemp(prefix="dead-hosts-benchmark-")
+
+    try:
+        for name in arguments.mode or list(MODES):
+            report["modes"][name] = benchmark_mode(
+                name,
+                MODES[name],
+                root,
+                environment,
+                repeat=arguments.repeat,
+                active_subjects=arguments.active_subjects,
+                top=arguments.top,
+            )
+
+            data = report["modes"][name]
+
+            print(
+                f"{name:<14}median {data['wall_ms']['median']:>8.1f} ms"
+                f" | max RSS {data['max_rss_kb']:>8} KiB"
+                f" | imports {data['importtime']['total_us'] / 1000:>8.1f} ms"
+            )
+    finally:
+        server.shutdown()
+        shutil.rmtree(root, ignore_errors=True)
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as file_stream:
+            json.dump(report, file_stream, indent=4)
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r", encoding="utf-8") as file_stream:
+            baseline = json.load(file_stream)
+
+        if not compare(report, baseline, arguments.max_regression):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
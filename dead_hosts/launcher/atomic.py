@@ -0,0 +1,123 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides a way to replace files atomically.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import contextlib
+import os
+import tempfile
+from typing import IO, Generator, Optional
+
+
+def get_default_mode() -> int:
+    """
+    Provides the mode a newly created file would get - according to the
+    current umask.
+    """
+
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def atomic_open(
+    path: str,
+    mode: str = "w",
+    *,
+    encoding: Optional[str] = "utf-8",
+    buffering: int = -1,
+    fsync: bool = True,
+) -> Generator[IO, None, None]:
+    """
+    Opens a temporary file next to the given path and - once the block
+    exited without error - atomically replaces the given path with it.
+
+    That way, readers (and a killed job) never see a partially written file.
+
+    :param path:
+        The file to replace.
+    :param mode:
+        The mode to open the temporary file with. Only write modes make sense.
+    :param encoding:
+        The encoding to use in text mode.
+    :param buffering:
+        The buffering policy, as understood by :py:func:`open`.
+    :param fsync:
+        Flushes the content to the disk before the replacement.
+    """
+
+    directory = os.path.dirname(os.path.abspath(path))
+
+    file_descriptor, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+
+    try:
+        with open(
+            file_descriptor,
+            mode,
+            encoding=None if "b" in mode else encoding,
+            buffering=buffering,
+        ) as file_stream:
+            yield file_stream
+
+            file_stream.flush()
+
+            if fsync:
+                os.fsync(file_stream.fileno())
+
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(temp_path, get_default_mode())
+
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+
+        raise
+
+
+def write_atomically(path: str, content: str, *, encoding: str = "utf-8") -> None:
+    """
+    Atomically replaces the content of the given path.
+    """
+
+    with atomic_open(path, "w", encoding=encoding) as file_stream:
+        file_stream.write(content)
@@ -36,21 +36,35 @@ License:
     SOFTWARE.
 """
 
+import logging
+import re
+import statistics
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional, Union
 
-from PyFunceble.helpers.regex import RegexHelper
-
+import dead_hosts.launcher.defaults.envs
 import dead_hosts.launcher.defaults.markers
-from dead_hosts.launcher.command import Command
-from dead_hosts.launcher.info_manager import InfoManager
+import dead_hosts.launcher.defaults.scheduling
+import dead_hosts.launcher.repository
+
+if TYPE_CHECKING:  # pragma: no cover
+    from dead_hosts.launcher.info_manager import InfoManager
+    from dead_hosts.launcher.info_reader import InfoReader
 
 
 class Authorization:
     """
     Provides the authorization logic.
+
+    .. note::
+        This interface is part of the fast path of the launcher. Therefore,
+        it should stay cheap to import.
+
+    :param info_manager:
+        The info manager (or read-only reader) to work with.
     """
 
-    def __init__(self, info_manager: InfoManager) -> None:
+    def __init__(self, info_manager: Union["InfoManager", "InfoReader"]) -> None:
         self.info_manager = info_manager
 
     @property
@@ -60,7 +74,88 @@ class Authorization:
         """
 
         return self.info_manager.finish_datetime + timedelta(
-            days=self.info_manager.days_until_next_test
+            days=self.days_until_next_test
+        )
+
+    @property
+    def days_until_next_test(self) -> float:
+        """
+        Provides the number of days between two tests - according to the
+        scheduling mode.
+        """
+
+        if self.is_adaptive_scheduling_enabled():
+            adaptive_days = self.get_adaptive_days_until_next_test()
+
+            if adaptive_days is not None:
+                return adaptive_days
+
+        return self.info_manager.days_until_next_test
+
+    def is_adaptive_scheduling_enabled(self) -> bool:
+        """
+        Checks if the adaptive scheduling is enabled.
+        """
+
+        return (
+            self.info_manager.content.get("scheduling_mode")
+            == dead_hosts.launcher.defaults.scheduling.ADAPTIVE_MODE
+        )
+
+    @staticmethod
+    def get_runner_share() -> Optional[float]:
+        """
+        Provides the runner-hours per day this workspace may consume. That's
+        the fleet-wide runner budget, equally shared between the workspaces
+        of the fleet.
+        """
+
+        try:
+            budget = float(dead_hosts.launcher.defaults.envs.RUNNER_BUDGET or 0)
+            fleet_size = float(dead_hosts.launcher.defaults.envs.FLEET_SIZE or 1)
+        except ValueError:
+            logging.critical("Invalid runner budget or fleet size. Ignoring them.")
+            return None
+
+        if budget <= 0 or fleet_size <= 0:
+            return None
+
+        return budget / fleet_size
+
+    def get_adaptive_days_until_next_test(self) -> Optional[float]:
+        """
+        Provides the number of days until the next test, computed from the
+        measured cycle history.
+
+        The interval is chosen so that - on average - the workspace doesn't
+        consume more than its share of the runner budget: a cycle that kept
+        the runners busy for :code:`H` hours is followed by :code:`H / share`
+        days of rest. Small lists are therefore tested more often than huge
+        ones.
+
+        :return:
+            :py:class:`None` when there is nothing to compute from.
+        """
+
+        share = self.get_runner_share()
+        history = self.info_manager.content.get("cycle_history") or []
+
+        busy_hours = [
+            float(x.get("busy_seconds") or 0) / 3600
+            for x in history
+            if isinstance(x, dict)
+        ]
+        busy_hours = [x for x in busy_hours if x > 0]
+
+        if not share or not busy_hours:
+            return None
+
+        return min(
+            max(
+                statistics.mean(busy_hours) / share,
+                dead_hosts.launcher.defaults.scheduling.ADAPTIVE_MIN_DAYS,
+            ),
+            dead_hosts.launcher.defaults.scheduling.ADAPTIVE_MAX_DAYS,
         )
 
     @staticmethod
@@ -69,8 +164,12 @@ class Authorization:
         Checks if the launch flag per commit message is given.
         """
 
-        return RegexHelper(dead_hosts.launcher.defaults.markers.LAUNCH_TEST).match(
-            Command("git log -1").execute(), return_match=False
+        return (
+            re.search(
+                dead_hosts.launcher.defaults.markers.LAUNCH_TEST,
+                dead_hosts.launcher.repository.get_head_commit_message(),
+            )
+            is not None
         )
 
     def are_we_suppoed_to_always_update_input(self) -> bool:
@@ -105,10 +204,7 @@ class Authorization:
         if self.is_launch_flag_given_by_commit_message():
             return True
 
-        if (
-            not self.info_manager.days_until_next_test
-            or self.info_manager.days_until_next_test < 0
-        ):
+        if not self.days_until_next_test or self.days_until_next_test < 0:
             return True
 
         if datetime.utcnow() > self.next_authorization_time:
@@ -119,6 +215,86 @@ class Authorization:
 
         return False
 
+    def is_skip_authorized(self, input_fingerprint: Optional[str]) -> bool:
+        """
+        Provides the skip authorization.
+
+        If this authorization is given, the cycle we are about to start can
+        be postponed: its input is identical to the one of the last finished
+        cycle, and the result of that cycle is still fresh enough.
+        """
+
+        if self.info_manager.content.get("skip_unchanged_input") is not True:
+            return False
+
+        if not input_fingerprint or self.info_manager.currently_under_test:
+            return False
+
+        if self.is_launch_flag_given_by_commit_message():
+            return False
+
+        if not self.info_manager.content.get("cycle_history"):
+            return False
+
+        last_cycle = self.info_manager.content["cycle_history"][-1]
+
+        if last_cycle.get("input_fingerprint") != input_fingerprint:
+            return False
+
+        return self.is_fresh(last_cycle.get("finish_timestamp", 0))
+
+    def is_incremental_authorized(self, snapshot_exists: bool) -> bool:
+        """
+        Provides the incremental authorization.
+
+        If this authorization is given, the cycle we are about to start only
+        tests the subjects added since the previous cycle: the results of the
+        other subjects are carried forward - as long as the last full test is
+        fresh enough.
+        """
+
+        if self.info_manager.content.get("incremental_testing") is not True:
+            return False
+
+        if not snapshot_exists or self.info_manager.currently_under_test:
+            return False
+
+        if self.is_launch_flag_given_by_commit_message():
+            return False
+
+        # The snapshot has to be the input of the last finished cycle.
+        if not self.info_manager.content.get("cycle_history") or (
+            self.info_manager.content["cycle_history"][-1].get("start_timestamp")
+            != self.info_manager.content.get("snapshot_start_timestamp")
+        ):
+            return False
+
+        return self.is_fresh(
+            self.info_manager.content.get("last_full_test_timestamp") or 0
+        )
+
+    def is_fresh(self, timestamp: float) -> bool:
+        """
+        Checks if a result produced at the given timestamp can still be
+        reused.
+        """
+
+        try:
+            freshness_days = float(
+                self.info_manager.content.get(
+                    "input_freshness_days",
+                    dead_hosts.launcher.defaults.scheduling.INPUT_FRESHNESS_DAYS,
+                )
+            )
+        except (TypeError, ValueError):
+            freshness_days = (
+                dead_hosts.launcher.defaults.scheduling.INPUT_FRESHNESS_DAYS
+            )
+
+        return datetime.utcnow() < datetime.fromtimestamp(timestamp) + timedelta(
+            days=freshness_days
+        )
+
     def is_platform_authorized(self) -> bool:
         """
         Provides the platform authorization.
@@ -38,12 +38,61 @@ License:
 
 import argparse
 import logging
+import os
+import sys
+from datetime import datetime
 
 import colorama
-from PyFunceble.helpers.environment_variable import EnvironmentVariableHelper
 
 from dead_hosts.launcher.__about__ import __version__
-from dead_hosts.launcher.orchestration import Orchestration
+from dead_hosts.launcher.authorization import Authorization
+from dead_hosts.launcher.fleet.cli import add_fleet_parser
+from dead_hosts.launcher.info_reader import InfoReader
+
+
+def is_run_authorized(arguments: argparse.Namespace) -> bool:
+    """
+    Checks - as cheaply as possible - whether the given arguments may lead
+    to any work.
+
+    .. note::
+        This mirrors the authorization checks of
+        :class:`~dead_hosts.launcher.orchestration.Orchestration` but reads
+        the administration file in read-only mode and without importing
+        PyFunceble. That way, scheduled runs which are not due exit without
+        any import or write.
+    """
+
+    if any(
+        [
+            arguments.end,
+            arguments.save,
+            arguments.authorize,
+            arguments.update,
+            arguments.matrix,
+            arguments.shard_index is not None,
+        ]
+    ):
+        return True
+
+    if os.environ.get("PLATFORM_WORKER"):
+        return True
+
+    authorization_handler = Authorization(InfoReader())
+
+    if (
+        authorization_handler.is_platform_authorized()
+        or authorization_handler.is_test_authorized()
+    ):
+        return True
+
+    logging.info(
+        "Not authorized to run a test until %r (current time) > %r",
+        datetime.now(),
+        authorization_handler.next_authorization_time,
+    )
+
+    return False
 
 
 def tool() -> None:
@@ -84,6 +133,29 @@ def tool() -> None:
         default=False,
     )
 
+    parser.add_argument(
+        "--shard-results",
+        help="With --end, the directory holding the results of the shards "
+        "tested by --shard-index.",
+        type=str,
+        default=None,
+    )
+
+    parser.add_argument(
+        "--matrix",
+        help="Prepare a test sharded over GitHub Actions jobs and print the "
+        "matrix of the jobs.",
+        action="store_true",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--shard-index",
+        help="Test the given shard of the test prepared by --matrix.",
+        type=int,
+        default=None,
+    )
+
     parser.add_argument(
         "--authorize",
         help="Try to authorize the next job.",
@@ -106,9 +178,13 @@ def tool() -> None:
         version="%(prog)s " + __version__,
     )
 
+    command_sub = parser.add_subparsers(dest="command")
+
+    add_fleet_parser(command_sub)
+
     arguments = parser.parse_args()
 
-    if arguments.debug or EnvironmentVariableHelper("INFRASTRUCTURE_DEBUG").exists():
+    if arguments.debug or "INFRASTRUCTURE_DEBUG" in os.environ:
         debug_level = logging.DEBUG
     else:
         debug_level = logging.INFO
@@ -119,9 +195,24 @@ def tool() -> None:
 
     logging.info("Launcher version: %s", __version__)
 
+    if arguments.command == "fleet":
+        # pylint: disable=import-outside-toplevel
+        from dead_hosts.launcher.fleet.cli import run_fleet
+
+        sys.exit(run_fleet(arguments))
+
+    if not is_run_authorized(arguments):
+        sys.exit(0)
+
+    # pylint: disable=import-outside-toplevel
+    from dead_hosts.launcher.orchestration import Orchestration
+
     Orchestration(
         end=arguments.end,
         save=arguments.save,
         authorize=arguments.authorize,
         update=arguments.update,
+        matrix=arguments.matrix,
+        shard_index=arguments.shard_index,
+        shard_results=arguments.shard_results,
     )
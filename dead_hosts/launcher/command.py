@@ -36,43 +36,524 @@ License:
     SOFTWARE.
 """
 
+import collections
+import fcntl
 import os
+import resource
+import selectors
+import signal
 import subprocess
-from typing import Generator
+import sys
+import time
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from PyFunceble.helpers.command import CommandHelper
 
 
+def get_usage(usage: resource.struct_rusage, wall_seconds: float) -> dict:
+    """
+    Provides the interesting parts of the given resource usage.
+
+    .. note::
+        The maximum resident set size is given in KiB under Linux.
+    """
+
+    return {
+        "wall_seconds": wall_seconds,
+        "user_cpu_seconds": usage.ru_utime,
+        "system_cpu_seconds": usage.ru_stime,
+        "max_rss_kib": usage.ru_maxrss,
+        "voluntary_context_switches": usage.ru_nvcsw,
+        "involuntary_context_switches": usage.ru_nivcsw,
+    }
+
+
+class CommandError(RuntimeError):
+    """
+    Raised when a command exited with a non-zero exit code.
+
+    :param message:
+        The message of the exception.
+    :param returncode:
+        The exit code of the command.
+    :param context:
+        The last lines the command printed.
+    :param usage:
+        The resources the command consumed - if known.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        returncode: Optional[int] = None,
+        context: Optional[List[str]] = None,
+        usage: Optional[dict] = None,
+    ) -> None:
+        self.returncode = returncode
+        self.context = context or []
+        self.usage = usage
+
+        super().__init__(message)
+
+
+class CommandTimeoutError(CommandError):
+    """
+    Raised when a command didn't finish in time.
+    """
+
+
 class Command(CommandHelper):
     """
     Improves PyFunceble's helper for our needs.
+
+    When the command is given as a :py:class:`list`, it is executed as is -
+    without going through a shell.
+
+    :param command:
+        The command to execute.
+    :param timeout:
+        The (wall-clock) number of seconds the command may run.
+    :param termination_grace_period:
+        The number of seconds a command has to exit after being asked to.
+        Once elapsed, it is killed.
+    :param context_size:
+        The number of trailing lines to keep for the error reports.
+    :param env:
+        The environment of the command. Ours is used when not given.
+
+    Once a command finished, :code:`usage` holds what it consumed - with the
+    descendants it waited for.
     """
 
+    READ_SIZE: int = 1024 * 1024
+    TAIL_SIZE: int = 64 * 1024
+    COALESCE_DELAY: float = 0.01
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        command: Optional[Union[str, List[str]]] = None,
+        *,
+        encoding: Optional[str] = None,
+        timeout: Optional[float] = None,
+        termination_grace_period: float = 10.0,
+        context_size: int = 50,
+        env: Optional[dict] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.env = env
+        self.termination_grace_period = termination_grace_period
+        self.context: Deque[str] = collections.deque(maxlen=context_size)
+        self.tail: bytearray = bytearray()
+        self.subscribers: List[Callable[[str], Any]] = []
+        self.usage: Optional[dict] = None
+        self.started_at: float = time.monotonic()
+
+        super().__init__(command, encoding=encoding)
+
+    @property
+    def command(self) -> Optional[Union[str, List[str]]]:
+        """
+        Provides the command to execute.
+        """
+
+        return self._command
+
+    @command.setter
+    def command(self, value: Union[str, List[str]]) -> None:
+        """
+        Sets the command to execute.
+
+        :raise TypeError:
+            When the value is not a :py:class:`list` or :py:class:`str`
+        """
+
+        if not isinstance(value, (str, list)):
+            raise TypeError(f"<value> should be {str} or {list}, {type(value)} given.")
+
+        self._command = list(value) if isinstance(value, list) else value
+
+    @property
+    def shell(self) -> bool:
+        """
+        Checks if the command has to go through a shell.
+        """
+
+        return isinstance(self.command, str)
+
+    def reap(self, process: subprocess.Popen, *, block: bool = True) -> bool:
+        """
+        Collects the exit status - and the resource usage - of the given
+        process.
+
+        :param block:
+            Waits for the process to exit.
+
+        :return:
+            :py:class:`True` when the process is gone.
+        """
+
+        if process.returncode is not None:
+            return True
+
+        try:
+            pid, status, usage = os.wait4(process.pid, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            # Someone else collected it. The usage is lost.
+            process.wait()
+            return True
+
+        if not pid:
+            return False
+
+        process.returncode = os.waitstatus_to_exitcode(status)
+        self.usage = get_usage(usage, time.monotonic() - self.started_at)
+        self.usage["returncode"] = process.returncode
+
+        return True
+
+    def terminate(self, process: subprocess.Popen) -> None:
+        """
+        Asks the given process to exit, and kills it if it doesn't within the
+        grace period.
+        """
+
+        if self.reap(process, block=False):
+            return
+
+        os.kill(process.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.termination_grace_period
+
+        while time.monotonic() < deadline:
+            if self.reap(process, block=False):
+                return
+
+            time.sleep(0.05)
+
+        os.kill(process.pid, signal.SIGKILL)
+        self.reap(process)
+
+    def get_deadline(self) -> Optional[float]:
+        """
+        Provides the (monotonic) time the command has to be finished by - if
+        any.
+        """
+
+        return self.started_at + self.timeout if self.timeout else None
+
+    def get_timeout_error(self, process: subprocess.Popen) -> CommandTimeoutError:
+        """
+        Terminates the given process and provides the error to raise for it.
+        """
+
+        self.terminate(process)
+
+        if self.usage:
+            self.usage["timed_out"] = True
+
+        return CommandTimeoutError(
+            self.get_error_message(f"Command timed out after {self.timeout}s."),
+            returncode=process.returncode,
+            context=self.get_context(),
+            usage=self.usage,
+        )
+
+    def wait(self, process: subprocess.Popen) -> None:
+        """
+        Waits for the given process - whose output reached its end - to exit.
+
+        :raise CommandTimeoutError:
+            When the command didn't exit in time.
+        """
+
+        deadline = self.get_deadline()
+
+        if deadline is None:
+            self.reap(process)
+            return
+
+        while not self.reap(process, block=False):
+            if time.monotonic() >= deadline:
+                raise self.get_timeout_error(process)
+
+            time.sleep(0.05)
+
+    def subscribe(self, callback: Callable[[str], Any]) -> "Command":
+        """
+        Registers a callback which gets every (stripped) line of the output.
+
+        .. note::
+            The output is only split into lines when something subscribed
+            to it.
+        """
+
+        self.subscribers.append(callback)
+
+        return self
+
+    def get_context(self) -> List[str]:
+        """
+        Provides the trailing lines of the output.
+        """
+
+        if self.tail:
+            # The tail may start in the middle of a character.
+            lines = (
+                bytes(self.tail).decode(self.encoding, errors="replace").splitlines()
+            )
+            return lines[-self.context.maxlen :] if self.context.maxlen else lines
+
+        return [x.rstrip() for x in self.context]
+
+    def get_error_message(self, header: str) -> str:
+        """
+        Provides an error message with the trailing lines of the output.
+        """
+
+        return header + "\n" + "\n".join(self.get_context())
+
+    def spawn(self, *, merge_output: bool = False) -> subprocess.Popen:
+        """
+        Starts the command.
+
+        :param merge_output:
+            Sends the standard error to the standard output pipe.
+        """
+
+        self.context.clear()
+        self.tail.clear()
+        self.usage = None
+        self.started_at = time.monotonic()
+
+        return subprocess.Popen(
+            self.command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if merge_output else subprocess.PIPE,
+            shell=self.shell,  # nosec: B602 # Only when given as a string.
+            env=self.env if self.env is not None else os.environ,
+        )
+
+    def iter_chunks(
+        self, process: subprocess.Popen
+    ) -> Generator[Tuple[Any, bytes], None, None]:
+        """
+        Pumps the pipes of the given process without blocking and in large
+        blocks. An empty block is given once a pipe reached its end.
+
+        :raise CommandTimeoutError:
+            When the command didn't finish in time.
+        """
+
+        deadline = self.get_deadline()
+
+        with selectors.DefaultSelector() as selector:
+            for stream in (process.stdout, process.stderr):
+                if stream is not None:
+                    self.grow_pipe(stream.fileno())
+                    os.set_blocking(stream.fileno(), False)
+                    selector.register(stream, selectors.EVENT_READ)
+
+            while selector.get_map():
+                remaining = None
+
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        raise self.get_timeout_error(process)
+
+                for key, _ in selector.select(timeout=remaining):
+                    try:
+                        chunk = os.read(key.fileobj.fileno(), self.READ_SIZE)
+                    except BlockingIOError:
+                        continue
+
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                    elif len(chunk) < self.READ_SIZE:
+                        # Unbuffered children write line by line. Letting the
+                        # pipe fill for a moment saves a wake-up per line.
+                        time.sleep(self.COALESCE_DELAY)
+
+                    yield key.fileobj, chunk
+
+    def grow_pipe(self, file_descriptor: int) -> None:
+        """
+        Tries to let the given pipe hold a whole block (Linux only). Less
+        wake-ups are needed, and the child is less often blocked on us.
+        """
+
+        if not hasattr(fcntl, "F_SETPIPE_SZ"):
+            return
+
+        try:
+            fcntl.fcntl(file_descriptor, fcntl.F_SETPIPE_SZ, self.READ_SIZE)
+        except OSError:
+            pass
+
+    @staticmethod
+    def split_lines(stream, chunk: bytes, buffers: dict) -> List[bytes]:
+        """
+        Provides the complete lines of the given block. The incomplete
+        trailing line is kept in the buffers until the next block - or the
+        end of the stream.
+        """
+
+        if not chunk:
+            return [buffers.pop(stream)] if buffers.get(stream) else []
+
+        lines = (buffers.get(stream, b"") + chunk).splitlines(True)
+
+        if lines[-1].endswith((b"\n", b"\r")):
+            buffers[stream] = b""
+        else:
+            buffers[stream] = lines.pop()
+
+        return lines
+
+    def check(self, process: subprocess.Popen) -> None:
+        """
+        Checks the exit code of the given (finished) process.
+
+        :raise CommandError:
+            When the exit code is not equal to 0.
+        """
+
+        self.reap(process)
+
+        if process.returncode != 0:
+            raise CommandError(
+                self.get_error_message(
+                    f"Something went wrong (exit code: {process.returncode})."
+                ),
+                returncode=process.returncode,
+                context=self.get_context(),
+                usage=self.usage,
+            )
+
+    def execute(self, *, raise_on_error: bool = False) -> str:
+        """
+        Overwrites the execute method - which would run our command through
+        a shell, without its arguments, timeout and environment. The command
+        goes through :py:meth:`run` instead.
+
+        :param raise_on_error:
+            Raises on error if set to :py:class:`True`.
+
+        :return:
+            The output of the command - or an empty string on error.
+
+        :raise CommandError:
+            When the exit code is not equal to 0 and :code:`raise_on_error`
+            is set.
+        :raise CommandTimeoutError:
+            When the command didn't finish in time.
+        """
+
+        try:
+            return "".join(self.run(rstrip=False))
+        except CommandTimeoutError:
+            raise
+        except CommandError:
+            if raise_on_error:
+                raise
+            return ""
+
     def run(self, rstrip: bool = True) -> Generator[str, None, None]:
         """
         Overwrites the run method. In our implementation we check the status
         code and raise an exception if it not equal to zero.
+
+        Both standard outputs are pumped without blocking and in large
+        blocks. Complete lines are yielded as soon as they are available.
+
+        :raise CommandError:
+            When the exit code is not equal to 0.
+        :raise CommandTimeoutError:
+            When the command didn't finish in time.
         """
-        with subprocess.Popen(
-            self.command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            shell=True,
-            env=os.environ,
-        ) as process:
-            while True:
-                # Note: we use rstrip() because we are paranoid :-)
-                current_line = process.stdout.readline()
-
-                if not current_line and process.poll() is not None:
-                    break
-
-                if rstrip:
-                    yield self._decode_output(current_line.rstrip())
-                else:
-                    yield self._decode_output(current_line)
-
-            if process.returncode != 0:
-                raise RuntimeError(
-                    "Something went wrong.\n" + self._decode_output(current_line)
-                )
+
+        with self.spawn() as process:
+            buffers = {}
+            finished = False
+
+            try:
+                for stream, chunk in self.iter_chunks(process):
+                    for line in self.split_lines(stream, chunk, buffers):
+                        decoded = self._decode_output(line)
+                        self.context.append(decoded)
+
+                        # Note: we use rstrip() because we are paranoid :-)
+                        yield decoded.rstrip() if rstrip else decoded
+
+                finished = True
+            finally:
+                if not finished:
+                    # Covers early exits of the consumer and the timeouts.
+                    self.terminate(process)
+
+            self.wait(process)
+            self.check(process)
+
+    def run_to_stdout(self, output: Optional[IO[bytes]] = None) -> None:
+        """
+        Runs the command and copies its output to our standard output - or
+        the given binary stream.
+
+        The output is copied as is - in blocks - without decoding it. Only the
+        last bytes are kept for the error reports. The lines are only decoded
+        when something subscribed to them.
+
+        :raise CommandError:
+            When the exit code is not equal to 0.
+        :raise CommandTimeoutError:
+            When the command didn't finish in time.
+        """
+
+        if output is None:
+            # Anything written through the text layer has to come first.
+            sys.stdout.flush()
+            output = getattr(sys.stdout, "buffer", None)
+
+        with self.spawn(merge_output=True) as process:
+            buffers = {}
+            finished = False
+
+            try:
+                for stream, chunk in self.iter_chunks(process):
+                    if chunk:
+                        if output is not None:
+                            output.write(chunk)
+                            output.flush()
+                        else:
+                            sys.stdout.write(self._decode_output(chunk))
+
+                        self.tail.extend(chunk)
+                        del self.tail[: -self.TAIL_SIZE]
+
+                    if self.subscribers:
+                        for line in self.split_lines(stream, chunk, buffers):
+                            decoded = self._decode_output(line).rstrip()
+
+                            for subscriber in self.subscribers:
+                                subscriber(decoded)
+
+                finished = True
+            finally:
+                if not finished:
+                    # Covers the errors of the subscribers and the timeouts.
+                    self.terminate(process)
+
+            self.wait(process)
+            self.check(process)
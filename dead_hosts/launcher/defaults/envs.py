@@ -39,23 +39,48 @@ License:
 import os
 from typing import List, Optional
 
-from PyFunceble.helpers.environment_variable import EnvironmentVariableHelper
-
-env_var = EnvironmentVariableHelper()
+# Note: We read the environment directly (instead of going through PyFunceble's
+# helper) because this module is imported by every launcher run - including
+# the ones that exit without ever needing PyFunceble.
 
 DEFAULT_EMAIL: str = "dead-hosts@outlook.com"
 
 UNDER_CI_ENVS: List[str] = ["GITHUB_ACTIONS"]
-UNDER_CI: bool = any(env_var.set_name(x).exists() for x in UNDER_CI_ENVS)
+UNDER_CI: bool = any(x in os.environ for x in UNDER_CI_ENVS)
 
-WORKSPACE_DIR: Optional[str] = env_var.set_name("GITHUB_WORKSPACE").get_value(
-    default=os.getcwd()
-)
+WORKSPACE_DIR: Optional[str] = os.environ.get("GITHUB_WORKSPACE", os.getcwd())
+
+GITHUB_TOKEN: Optional[str] = os.environ.get("GITHUB_TOKEN", None)
+GIT_EMAIL: Optional[str] = os.environ.get("GIT_EMAIL", None)
+GIT_NAME: str = os.environ.get("GIT_NAME", "dead-hostsbot")
+GIT_BRANCH: str = os.environ.get("GIT_BRANCH", "master")
+GIT_DISTRIBUTION_BRANCH: str = os.environ.get("GIT_DISTRIBUTION_BRANCH", GIT_BRANCH)
 
-GITHUB_TOKEN: Optional[str] = env_var.set_name("GITHUB_TOKEN").get_value(default=None)
-GIT_EMAIL: Optional[str] = env_var.set_name("GIT_EMAIL").get_value(default=None)
-GIT_NAME: str = env_var.set_name("GIT_NAME").get_value(default="dead-hostsbot")
-GIT_BRANCH: str = env_var.set_name("GIT_BRANCH").get_value(default="master")
-GIT_DISTRIBUTION_BRANCH: str = env_var.set_name("GIT_DISTRIBUTION_BRANCH").get_value(
-    default=GIT_BRANCH
+FLEET_DATABASE: str = os.environ.get(
+    "DEAD_HOSTS_FLEET_DATABASE",
+    os.path.join(os.path.expanduser("~"), ".cache", "dead-hosts", "fleet.sqlite"),
 )
+FLEET_LEASE: Optional[str] = os.environ.get("DEAD_HOSTS_FLEET_LEASE", None)
+
+# The runner-hours per day the whole fleet can spend, and the number of
+# workspaces sharing them. Used by the adaptive scheduling.
+RUNNER_BUDGET: Optional[str] = os.environ.get("DEAD_HOSTS_RUNNER_BUDGET", None)
+FLEET_SIZE: Optional[str] = os.environ.get("DEAD_HOSTS_FLEET_SIZE", None)
+
+# The wall-clock number of seconds a test run may take before being stopped.
+TEST_TIMEOUT: Optional[str] = os.environ.get("DEAD_HOSTS_TEST_TIMEOUT", None)
+
+# Overwrites the `pyfunceble_engine` index of the administration file.
+PYFUNCEBLE_ENGINE: Optional[str] = os.environ.get("DEAD_HOSTS_PYFUNCEBLE_ENGINE", None)
+
+# Overwrites the `progress_tracking` index of the administration file.
+PROGRESS_TRACKING: Optional[str] = os.environ.get("DEAD_HOSTS_PROGRESS_TRACKING", None)
+
+# Overwrites the `shards` index of the administration file.
+SHARDS: Optional[str] = os.environ.get("DEAD_HOSTS_SHARDS", None)
+
+# Overwrites the `matrix_shards` index of the administration file.
+MATRIX_SHARDS: Optional[str] = os.environ.get("DEAD_HOSTS_MATRIX_SHARDS", None)
+
+# The file GitHub Actions reads the outputs of a step from.
+GITHUB_OUTPUT: Optional[str] = os.environ.get("GITHUB_OUTPUT", None)
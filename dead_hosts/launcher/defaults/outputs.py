@@ -0,0 +1,94 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the default formats of our outputs.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from typing import Dict
+
+# The formats we can write our output into - on top of `clean.list`.
+#
+# - filename: the file to write, next to `clean.list`.
+# - comment: what starts a comment in the format.
+# - header: the lines to write before our own header. `{serial}` is replaced
+#   with the (UNIX) time of the generation.
+# - template: what every subject is written as. `{subject}` is replaced with
+#   the subject.
+FORMATS: Dict[str, dict] = {
+    "hosts": {
+        "filename": "clean.hosts",
+        "comment": "#",
+        "header": [],
+        "template": "0.0.0.0 {subject}",
+    },
+    "adblock": {
+        "filename": "clean.adblock",
+        "comment": "!",
+        "header": ["[Adblock Plus 2.0]"],
+        "template": "||{subject}^",
+    },
+    "dnsmasq": {
+        "filename": "clean.dnsmasq.conf",
+        "comment": "#",
+        "header": [],
+        "template": "address=/{subject}/#",
+    },
+    "unbound": {
+        "filename": "clean.unbound.conf",
+        "comment": "#",
+        "header": [],
+        "template": 'local-zone: "{subject}." always_nxdomain',
+    },
+    "rpz": {
+        "filename": "clean.rpz",
+        "comment": ";",
+        "header": [
+            "$TTL 300",
+            "@ IN SOA localhost. root.localhost. {serial} 43200 3600 86400 300",
+            "  IN NS localhost.",
+        ],
+        "template": "{subject} CNAME .\n*.{subject} CNAME .",
+    },
+}
+
+# The compressed versions we can write next to each output.
+#
+# - extension: what is appended to the name of the output.
+# - level: the compression level (or preset) to use.
+COMPRESSIONS: Dict[str, dict] = {
+    "gz": {"extension": ".gz", "level": 9},
+    "xz": {"extension": ".xz", "level": 6},
+    "zst": {"extension": ".zst", "level": 19},
+}
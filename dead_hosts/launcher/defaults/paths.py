@@ -39,9 +39,9 @@ License:
 import os
 import urllib.parse
 from datetime import datetime
-from typing import List
+from typing import Any, List
 
-from dead_hosts.launcher.command import Command
+import dead_hosts.launcher.repository
 
 CURRENT_DIRECTORY: str = os.getcwd()
 
@@ -53,28 +53,46 @@ GHA_WORKFLOW_LOCAL_HASHES_FILENAME: str = "hs.json"
 INFO_FILENAME: str = "info.json"
 ORIGIN_FILENAME: str = "origin.list"
 INPUT_FILENAME: str = "domains.list"
+NORMALIZED_FILENAME: str = "subjects.list"
+SNAPSHOT_FILENAME: str = "snapshot.list"
+PENDING_SNAPSHOT_FILENAME: str = "snapshot.pending.list"
+DELTA_FILENAME: str = "added.list"
+SHARDS_DIRNAME: str = "shards"
+SHARD_FILENAME: str = "shard.list"
+SHARD_LOG_FILENAME: str = "pyfunceble.log"
+SHARD_USAGE_FILENAME: str = "usage.json"
 OUTPUT_FILENAME: str = "clean.list"
+DELTAS_DIRNAME: str = "deltas"
+DELTAS_MANIFEST_FILENAME: str = "manifest.json"
+RUN_HISTORY_FILENAME: str = "run_history.jsonl"
+PROGRESS_FILENAME: str = "progress.json"
 README_FILENAME: str = "README.md"
 
 EXAMPLE_INFO_FILENAME: str = "info.example.json"
 
-REMOTE_URL: str = Command("git remote get-url origin").execute().strip()
-PARSED_REMOTE_URL: str = urllib.parse.urlparse(REMOTE_URL)
-
-if not PARSED_REMOTE_URL.netloc:
-    REPO_BASE = PARSED_REMOTE_URL.path.split(":", 1)[-1]
-else:
-    REPO_BASE = PARSED_REMOTE_URL.path[1:]
-
-if REPO_BASE.endswith(".git"):
-    REPO_BASE = REPO_BASE[:-4]
-
-GIT_BASE_NAME: str = REPO_BASE.split("/", 1)[-1]
-GIT_REPO_OWNER: str = REPO_BASE.split("/", 1)[0]
-
 OUTPUT_FILE_HEADER: List[str] = [
     "# File generated by the Dead-Hosts project with the help of PyFunceble.",
     "# Dead-Hosts: https://github.com/dead-hosts",
     "# PyFunceble: https://pyfunceble.github.io",
     f"# Generation Time: {datetime.utcnow().isoformat()}",
 ]
+
+
+# The repository related constants are resolved on first access only. That way,
+# importing this module doesn't cost us any git lookup.
+LAZY_CONSTANTS: dict = {
+    "REMOTE_URL": dead_hosts.launcher.repository.get_remote_url,
+    "PARSED_REMOTE_URL": lambda: urllib.parse.urlparse(
+        dead_hosts.launcher.repository.get_remote_url()
+    ),
+    "REPO_BASE": dead_hosts.launcher.repository.get_repository_base,
+    "GIT_BASE_NAME": dead_hosts.launcher.repository.get_repository_name,
+    "GIT_REPO_OWNER": dead_hosts.launcher.repository.get_repository_owner,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in LAZY_CONSTANTS:
+        return LAZY_CONSTANTS[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -36,58 +36,111 @@ License:
     SOFTWARE.
 """
 
-from PyFunceble.cli.continuous_integration.github_actions import GitHubActions
+import functools
+from typing import Any, List
 
 import dead_hosts.launcher.defaults.envs
 import dead_hosts.launcher.defaults.paths
 
 # pylint: disable=line-too-long
 
-CONFIGURATION: dict = {
-    "cli_testing.ci.active": GitHubActions().guess_all_settings().authorized,
-    "cli_testing.ci.end_command": "hash dead_hosts_launcher && dead_hosts_launcher --end",
-    "cli_testing.ci.command": "hash dead_hosts_launcher && dead_hosts_launcher --save",
-    "cli_testing.ci.max_exec_minutes": 15,
-    "cli_testing.ci.branch": dead_hosts.launcher.defaults.envs.GIT_BRANCH,
-    "cli_testing.ci.distribution_branch": dead_hosts.launcher.defaults.envs.GIT_DISTRIBUTION_BRANCH,
-    "cli_testing.ci.commit_message": f"[Autosave][Dead-Hosts::"
-    f"{dead_hosts.launcher.defaults.paths.GIT_BASE_NAME}]",
-    "cli_testing.ci.end_commit_message": f"[Final/Result][Dead-Hosts::"
-    f"{dead_hosts.launcher.defaults.paths.GIT_BASE_NAME}]",
-    "cli_testing.display_mode.dots": True,
-    "cli_testing.display_mode.all": True,
-    "cli_testing.display_mode.less": False,
-    "cli_testing.file_generation.plain": True,
-    "cli_testing.file_generation.hosts": False,
-    "cli_testing.file_generation.unified_results": False,
-    "cli_testing.cooldown_time": 1.25,
-    "cli_testing.display_mode.execution_time": True,
-    "cli_testing.max_workers": 1,
-    "lookup.timeout": 5,
-    "share_logs": False,
-    "dns.server": ["8.8.8.8", "8.8.4.4"],
-    "dns.protocol": "UDP",
-    "cli_testing.preload_file": True,
-    "cli_testing.autocontinue": True,
-}
+# How PyFunceble is started: as a child process, or inside our own process.
+SUBPROCESS_ENGINE: str = "subprocess"
+IN_PROCESS_ENGINE: str = "in-process"
+ENGINES: List[str] = [SUBPROCESS_ENGINE, IN_PROCESS_ENGINE]
 
-PERSISTENT_CONFIG: dict = {
-    "cli_testing.autocontinue": True,
-    "cli_testing.ci.max_exec_minutes": 20,
-    "cli_testing.cooldown_time": 0.2,
-    "cli_testing.display_mode.execution_time": True,
-    "cli_testing.max_workers": 5,
-    "cli_testing.preload_file": False,
-    "platform.push": True,
-    "lookup.platform": True,
-    "cli_testing.chancy_tester": True,
-}
+# The number of seconds - out of the execution time of the continuous
+# integration - we keep to save (and commit) the results of PyFunceble.
+CI_TIMEOUT_MARGIN: float = 120.0
+
+
+@functools.lru_cache(maxsize=None)
+def get_configuration() -> dict:
+    """
+    Provides our default PyFunceble configuration.
+
+    .. note::
+        This is computed on first call only because guessing the CI settings
+        requires the whole PyFunceble CI stack.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from PyFunceble.cli.continuous_integration.github_actions import GitHubActions
+
+    return {
+        "cli_testing.ci.active": GitHubActions().guess_all_settings().authorized,
+        "cli_testing.ci.end_command": "hash dead_hosts_launcher && dead_hosts_launcher --end",
+        "cli_testing.ci.command": "hash dead_hosts_launcher && dead_hosts_launcher --save",
+        "cli_testing.ci.max_exec_minutes": 15,
+        "cli_testing.ci.branch": dead_hosts.launcher.defaults.envs.GIT_BRANCH,
+        "cli_testing.ci.distribution_branch": dead_hosts.launcher.defaults.envs.GIT_DISTRIBUTION_BRANCH,
+        "cli_testing.ci.commit_message": f"[Autosave][Dead-Hosts::"
+        f"{dead_hosts.launcher.defaults.paths.GIT_BASE_NAME}]",
+        "cli_testing.ci.end_commit_message": f"[Final/Result][Dead-Hosts::"
+        f"{dead_hosts.launcher.defaults.paths.GIT_BASE_NAME}]",
+        "cli_testing.display_mode.dots": True,
+        "cli_testing.display_mode.all": True,
+        "cli_testing.display_mode.less": False,
+        "cli_testing.file_generation.plain": True,
+        "cli_testing.file_generation.hosts": False,
+        "cli_testing.file_generation.unified_results": False,
+        "cli_testing.cooldown_time": 1.25,
+        "cli_testing.display_mode.execution_time": True,
+        "cli_testing.max_workers": 1,
+        "lookup.timeout": 5,
+        "share_logs": False,
+        "dns.server": ["8.8.8.8", "8.8.4.4"],
+        "dns.protocol": "UDP",
+        "cli_testing.preload_file": True,
+        "cli_testing.autocontinue": True,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_persistent_config() -> dict:
+    """
+    Provides the configuration we enforce when the platform is not in use.
+    """
 
-PLATFORM_PERSISTENT_CONFIG: dict = {
-    "cli_testing.ci.max_exec_minutes": 10,
-    "cli_testing.display_mode.execution_time": True,
-    "cli_testing.display_mode.dots": True,
-    "cli_testing.max_workers": 1,
-    "cli_testing.chancy_tester": False,
-    "platform.push": True,
+    return {
+        "cli_testing.autocontinue": True,
+        "cli_testing.ci.max_exec_minutes": 20,
+        "cli_testing.cooldown_time": 0.2,
+        "cli_testing.display_mode.execution_time": True,
+        "cli_testing.max_workers": 5,
+        "cli_testing.preload_file": False,
+        "platform.push": True,
+        "lookup.platform": True,
+        "cli_testing.chancy_tester": True,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_platform_persistent_config() -> dict:
+    """
+    Provides the configuration we enforce when the platform is in use.
+    """
+
+    return {
+        "cli_testing.ci.max_exec_minutes": 10,
+        "cli_testing.display_mode.execution_time": True,
+        "cli_testing.display_mode.dots": True,
+        "cli_testing.max_workers": 1,
+        "cli_testing.chancy_tester": False,
+        "platform.push": True,
+    }
+
+
+# Kept for backward compatibility, the tables are computed on first access.
+LAZY_CONSTANTS: dict = {
+    "CONFIGURATION": get_configuration,
+    "PERSISTENT_CONFIG": get_persistent_config,
+    "PLATFORM_PERSISTENT_CONFIG": get_platform_persistent_config,
 }
+
+
+def __getattr__(name: str) -> Any:
+    if name in LAZY_CONSTANTS:
+        return LAZY_CONSTANTS[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
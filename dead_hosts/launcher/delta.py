@@ -0,0 +1,321 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the delta of our output between two cycles.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from typing import IO, Iterable, Iterator, Optional
+
+import dead_hosts.launcher.defaults.paths
+from dead_hosts.launcher.atomic import atomic_open, write_atomically
+from dead_hosts.launcher.normalization import read_canonical
+from dead_hosts.launcher.output import NothingToWrite, iter_joined_lines
+from dead_hosts.launcher.sorting import DEFAULT_MEMORY_LIMIT, diff_sorted, sort_unique
+
+DELTA_FILE_REGEX = re.compile(r"^[0-9]+\.delta$")
+
+
+def iter_hashed(lines: Iterable[bytes], statistics: dict) -> Iterator[bytes]:
+    """
+    Provides the given lines as they are. Once they are all consumed, their
+    number and checksum are stored into the given statistics.
+    """
+
+    digest = hashlib.sha256()
+    count = 0
+
+    for line in lines:
+        digest.update(line + b"\n")
+        count += 1
+
+        yield line
+
+    statistics["subjects"] = count
+    statistics["subjects_sha256"] = digest.hexdigest()
+
+
+def get_file_sha256(path: str) -> str:
+    """
+    Provides the checksum of the given file.
+    """
+
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as file_stream:
+        for block in iter(lambda: file_stream.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+class DeltaPublisher:
+    """
+    Publishes what changed in our output between two cycles - so that our
+    consumers can patch their copy instead of downloading the whole output
+    again.
+
+    Every change gets a sequence number and a delta file -
+    :code:`<sequence>.delta` - holding the added subjects (prefixed with a
+    :code:`+`) and the removed ones (prefixed with a :code:`-`) in their
+    sorted order. The manifest lists the kept deltas with the checksums of
+    the (sorted and canonical) subjects they apply to and result in, as
+    well as the checksum of the subjects of the current output. The output
+    itself isn't hashed: its header changes with every generation.
+
+    A cycle goes through the following steps:
+
+        1. :py:meth:`stage` keeps the subjects of the output we are about
+           to replace.
+        2. :py:meth:`publish` writes the delta between them and the new
+           output, then updates the manifest.
+
+    :param output_path:
+        The output to publish the deltas of.
+    :param directory:
+        The directory to write the deltas and the manifest into.
+    :param history:
+        The number of deltas to keep.
+    :param memory_limit:
+        The memory (in bytes) a sorting may use before spilling to the disk.
+    """
+
+    def __init__(
+        self,
+        output_path: str,
+        directory: str,
+        *,
+        history: int = 24,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ) -> None:
+        self.output_path = output_path
+        self.directory = directory
+        self.history = history
+        self.memory_limit = memory_limit
+
+        self.manifest_path = os.path.join(
+            directory, dead_hosts.launcher.defaults.paths.DELTAS_MANIFEST_FILENAME
+        )
+        self.previous: Optional[IO] = None
+
+    def sort_canonical(self, path: str) -> Iterator[bytes]:
+        """
+        Provides the sorted and deduplicated canonical subjects of the given
+        file.
+        """
+
+        return sort_unique(
+            read_canonical(path),
+            memory_limit=self.memory_limit,
+            directory=os.path.dirname(os.path.abspath(self.output_path)),
+        )
+
+    def stage(self) -> "DeltaPublisher":
+        """
+        Keeps the sorted subjects of the output we are about to replace.
+        """
+
+        self.discard()
+
+        if not os.path.isfile(self.output_path):
+            return self
+
+        # pylint: disable=consider-using-with
+        self.previous = tempfile.TemporaryFile(
+            dir=os.path.dirname(os.path.abspath(self.output_path))
+        )
+
+        for block in iter_joined_lines(
+            self.sort_canonical(self.output_path), 1024 * 1024
+        ):
+            self.previous.write(block)
+
+        self.previous.seek(0)
+
+        return self
+
+    def discard(self) -> "DeltaPublisher":
+        """
+        Forgets the staged output.
+        """
+
+        if self.previous is not None:
+            self.previous.close()
+            self.previous = None
+
+        return self
+
+    def load_manifest(self) -> dict:
+        """
+        Provides the current manifest.
+        """
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file_stream:
+                return json.load(file_stream)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return {"sequence": 0, "list": None, "deltas": []}
+
+    def write_delta(self, path: str, statistics: dict) -> dict:
+        """
+        Writes the delta between the staged output and the current one into
+        the given file.
+
+        :raise NothingToWrite:
+            When both outputs hold the same subjects.
+
+        :return:
+            The statistics of the delta.
+        """
+
+        previous_statistics = {}
+        result = {"added": 0, "removed": 0}
+
+        with atomic_open(path, "wb", buffering=1024 * 1024) as file_stream:
+            for added, subject in diff_sorted(
+                iter_hashed((x[:-1] for x in self.previous), previous_statistics),
+                iter_hashed(self.sort_canonical(self.output_path), statistics),
+            ):
+                file_stream.write((b"+" if added else b"-") + subject + b"\n")
+                result["added" if added else "removed"] += 1
+
+            if not result["added"] and not result["removed"]:
+                raise NothingToWrite()
+
+        result["from_subjects_sha256"] = previous_statistics["subjects_sha256"]
+        result["to_subjects_sha256"] = statistics["subjects_sha256"]
+
+        return result
+
+    def publish(self) -> Optional[dict]:
+        """
+        Writes the delta between the staged output and the current one - if
+        they differ - and updates the manifest.
+
+        :return:
+            The manifest entry of the new delta - if any.
+        """
+
+        if not os.path.isfile(self.output_path):
+            self.discard()
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        manifest = self.load_manifest()
+        statistics = {}
+        entry = None
+
+        if self.previous is None:
+            # Nothing to compare with. We only describe the output.
+            for _ in iter_hashed(self.sort_canonical(self.output_path), statistics):
+                pass
+        else:
+            sequence = manifest["sequence"] + 1
+            filename = f"{sequence}.delta"
+
+            try:
+                entry = self.write_delta(
+                    os.path.join(self.directory, filename), statistics
+                )
+            except NothingToWrite:
+                logging.info("Output unchanged, no delta to publish.")
+            else:
+                entry.update(
+                    {
+                        "sequence": sequence,
+                        "file": filename,
+                        "sha256": get_file_sha256(
+                            os.path.join(self.directory, filename)
+                        ),
+                        "created_at": time.time(),
+                    }
+                )
+
+                manifest["sequence"] = sequence
+                manifest["deltas"].append(entry)
+
+                logging.info(
+                    "Published the delta %d: %d subject(s) added and %d removed.",
+                    sequence,
+                    entry["added"],
+                    entry["removed"],
+                )
+
+        self.discard()
+
+        manifest["deltas"] = manifest["deltas"][
+            max(len(manifest["deltas"]) - self.history, 0) :
+        ]
+        manifest["list"] = {
+            "file": os.path.basename(self.output_path),
+            "sequence": manifest["sequence"],
+            **statistics,
+        }
+
+        self.write_manifest(manifest)
+
+        return entry
+
+    def write_manifest(self, manifest: dict) -> "DeltaPublisher":
+        """
+        Writes the given manifest - if it changed - and removes the deltas
+        it doesn't list anymore.
+        """
+
+        serialized = json.dumps(manifest, indent=4, sort_keys=True) + "\n"
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file_stream:
+                changed = file_stream.read() != serialized
+        except FileNotFoundError:
+            changed = True
+
+        if changed:
+            write_atomically(self.manifest_path, serialized)
+
+        kept = {x["file"] for x in manifest["deltas"]}
+
+        for filename in os.listdir(self.directory):
+            if DELTA_FILE_REGEX.match(filename) and filename not in kept:
+                os.remove(os.path.join(self.directory, filename))
+
+        return self
@@ -0,0 +1,298 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the streaming download of the lists to test.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import bz2
+import logging
+import lzma
+import os
+import shutil
+import tempfile
+import urllib.parse
+import zipfile
+import zlib
+from typing import IO, Any, Iterable, Iterator, Optional
+
+import PyFunceble.helpers.exceptions
+import requests
+from PyFunceble.helpers.download import DownloadHelper
+
+from dead_hosts.launcher.atomic import atomic_open
+
+# The leading bytes of the compressed sources we understand.
+MAGIC_NUMBERS: dict = {
+    "gz": b"\x1f\x8b",
+    "xz": b"\xfd7zXZ\x00",
+    "bz2": b"BZh",
+    "zip": b"PK\x03\x04",
+}
+
+
+class StreamDecompressor:
+    """
+    Decompresses a (possibly multi-stream) gzip, xz or bzip2 source, block by
+    block.
+
+    :param compression:
+        The compression of the source.
+    """
+
+    def __init__(self, compression: str) -> None:
+        self.compression = compression
+        self.decompressor = self.new_decompressor()
+        self.finished = False
+
+    def new_decompressor(self) -> Any:
+        """
+        Provides a fresh decompressor.
+        """
+
+        if self.compression == "gz":
+            # 16 + MAX_WBITS: gzip header and trailer expected.
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        if self.compression == "xz":
+            return lzma.LZMADecompressor()
+
+        return bz2.BZ2Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Decompresses the given block.
+        """
+
+        result = []
+
+        while data:
+            result.append(self.decompressor.decompress(data))
+
+            if not self.decompressor.eof:
+                self.finished = False
+                break
+
+            # A stream ended. What follows - if anything - is another one.
+            self.finished = True
+            data = self.decompressor.unused_data
+
+            if data:
+                self.decompressor = self.new_decompressor()
+
+        return b"".join(result)
+
+
+class StreamingDownloader:
+    """
+    Downloads a (possibly compressed) list into a file - without ever holding
+    the whole list in memory.
+
+    The download goes into a temporary file next to the destination, which
+    replaces the destination only once the download completed.
+
+    :param url:
+        The URL to download.
+    :param destination:
+        The file to write into.
+    :param chunk_size:
+        The size of the blocks we read and write.
+    :param timeout:
+        The connect and read timeouts, as understood by :py:mod:`requests`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        destination: str,
+        *,
+        chunk_size: int = 1024 * 1024,
+        timeout: tuple = (30.0, 300.0),
+    ) -> None:
+        self.url = url
+        self.destination = destination
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+
+    def get_compression(self, first_block: bytes) -> Optional[str]:
+        """
+        Provides the compression of the source - from its leading bytes, or
+        from the extension of the URL.
+        """
+
+        for compression, magic_number in MAGIC_NUMBERS.items():
+            if first_block.startswith(magic_number):
+                return compression
+
+        extension = os.path.splitext(urllib.parse.urlsplit(self.url).path)[-1]
+
+        if extension[1:].lower() in MAGIC_NUMBERS:
+            logging.critical(
+                "%r looks compressed but does not start like a %r file. "
+                "Taking it as is.",
+                self.url,
+                extension,
+            )
+
+        return None
+
+    def start(self) -> int:
+        """
+        Starts the download.
+
+        :return:
+            The number of bytes written into the destination.
+
+        :raise UnableToDownload:
+            When the URL could not be downloaded completely.
+        """
+
+        try:
+            with DownloadHelper(self.url).session.get(
+                self.url,
+                stream=True,
+                timeout=self.timeout,
+                headers={"Accept-Encoding": "gzip, deflate"},
+            ) as response:
+                if response.status_code != 200:
+                    raise PyFunceble.helpers.exceptions.UnableToDownload(
+                        f"{response.url} (status code: {response.status_code})"
+                    )
+
+                # Takes care of the gzip/deflate transfer encodings.
+                written = self.write(response.iter_content(chunk_size=self.chunk_size))
+        except requests.exceptions.RequestException as exception:
+            raise PyFunceble.helpers.exceptions.UnableToDownload(
+                f"{self.url} (could not download completely)"
+            ) from exception
+
+        logging.info("Wrote %d bytes into %r.", written, self.destination)
+
+        return written
+
+    def write(self, blocks: Iterable[bytes]) -> int:
+        """
+        Writes the given blocks - decompressed if needed - into the
+        destination.
+        """
+
+        blocks = iter(blocks)
+        first_block = b""
+
+        for block in blocks:
+            if block:
+                first_block = block
+                break
+
+        compression = self.get_compression(first_block)
+
+        logging.info("Compression of %r: %r", self.url, compression)
+
+        with atomic_open(self.destination, "wb") as file_stream:
+            if compression == "zip":
+                return self.write_from_zip(first_block, blocks, file_stream)
+
+            if compression:
+                decompressor = StreamDecompressor(compression)
+                written = 0
+
+                for block in self.chain(first_block, blocks):
+                    data = decompressor.decompress(block)
+                    file_stream.write(data)
+                    written += len(data)
+
+                if not decompressor.finished:
+                    raise PyFunceble.helpers.exceptions.UnableToDownload(
+                        f"{self.url} (truncated {compression} stream)"
+                    )
+
+                return written
+
+            written = 0
+
+            for block in self.chain(first_block, blocks):
+                file_stream.write(block)
+                written += len(block)
+
+            return written
+
+    @staticmethod
+    def chain(first_block: bytes, blocks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Provides the given first block, then the others.
+        """
+
+        if first_block:
+            yield first_block
+
+        yield from blocks
+
+    def write_from_zip(
+        self, first_block: bytes, blocks: Iterator[bytes], file_stream: IO
+    ) -> int:
+        """
+        Writes the biggest member of the given ZIP archive.
+
+        .. note::
+            A ZIP archive can't be read before its end (the index is at the
+            end), so the archive is spooled into a temporary file first.
+        """
+
+        with tempfile.TemporaryFile(
+            dir=os.path.dirname(os.path.abspath(self.destination))
+        ) as spool:
+            for block in self.chain(first_block, blocks):
+                spool.write(block)
+
+            try:
+                with zipfile.ZipFile(spool) as archive:
+                    members = [x for x in archive.infolist() if not x.is_dir()]
+
+                    if not members:
+                        raise PyFunceble.helpers.exceptions.UnableToDownload(
+                            f"{self.url} (empty ZIP archive)"
+                        )
+
+                    member = max(members, key=lambda x: x.file_size)
+
+                    logging.info("Extracting %r from %r.", member.filename, self.url)
+
+                    with archive.open(member) as member_stream:
+                        shutil.copyfileobj(member_stream, file_stream, self.chunk_size)
+
+                    return member.file_size
+            except zipfile.BadZipFile as exception:
+                raise PyFunceble.helpers.exceptions.UnableToDownload(
+                    f"{self.url} (invalid ZIP archive)"
+                ) from exception
@@ -0,0 +1,221 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the engines we use to start PyFunceble.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import logging
+import resource
+import sys
+import time
+from typing import IO, Any, Callable, List, Optional
+
+import dead_hosts.launcher.defaults.pyfunceble
+from dead_hosts.launcher.command import Command, CommandError, get_usage
+
+
+class PyFuncebleEngine:
+    """
+    Starts PyFunceble - either as a child process or inside our own process.
+
+    The in-process engine saves the start of a second interpreter and the
+    second import of PyFunceble. It relies on the environment variables and
+    the configuration files we already prepared.
+
+    .. warning::
+        PyFunceble can only be started once per process. Every later start
+        (or any start with a timeout) goes through a child process.
+
+    :param mode:
+        The engine to use.
+    :param timeout:
+        The (wall-clock) number of seconds a run may take.
+    :param subscribers:
+        The callbacks which get every line of PyFunceble's output.
+    :param env:
+        The environment of PyFunceble. Ours is used when not given.
+    :param output:
+        The binary stream to copy PyFunceble's output to. Our standard output
+        is used when not given.
+
+    Once a run finished, :code:`usage` holds what it consumed.
+    """
+
+    in_process_used: bool = False
+
+    def __init__(
+        self,
+        mode: str = dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE,
+        *,
+        timeout: Optional[float] = None,
+        subscribers: Optional[List[Callable[[str], Any]]] = None,
+        env: Optional[dict] = None,
+        output: Optional[IO[bytes]] = None,
+    ) -> None:
+        self.mode = mode
+        self.timeout = timeout
+        self.subscribers = subscribers or []
+        self.env = env
+        self.output = output
+        self.usage: Optional[dict] = None
+
+    @property
+    def in_process(self) -> bool:
+        """
+        Checks if the next run can happen inside our own process.
+        """
+
+        if self.mode != dead_hosts.launcher.defaults.pyfunceble.IN_PROCESS_ENGINE:
+            return False
+
+        if self.timeout:
+            logging.info("Timeout given, PyFunceble will run as a child process.")
+            return False
+
+        if self.subscribers:
+            logging.info(
+                "Output subscribed to, PyFunceble will run as a child process."
+            )
+            return False
+
+        if self.env is not None or self.output is not None:
+            logging.info(
+                "Dedicated environment or output given, PyFunceble will run as "
+                "a child process."
+            )
+            return False
+
+        if PyFuncebleEngine.in_process_used:
+            logging.info("PyFunceble already ran, it will run as a child process.")
+            return False
+
+        return True
+
+    def run(self, *arguments: str) -> "PyFuncebleEngine":
+        """
+        Runs PyFunceble with the given arguments.
+
+        :raise CommandError:
+            When PyFunceble exited with a non-zero exit code.
+        """
+
+        if self.in_process:
+            try:
+                return self.run_in_process(list(arguments))
+            except ImportError as exception:
+                logging.critical(
+                    "Could not load PyFunceble's CLI (%s), "
+                    "falling back to a child process.",
+                    exception,
+                )
+
+        return self.run_as_subprocess(list(arguments))
+
+    def run_as_subprocess(self, arguments: List[str]) -> "PyFuncebleEngine":
+        """
+        Runs PyFunceble as a child process.
+        """
+
+        command = Command(
+            ["pyfunceble"] + arguments, timeout=self.timeout, env=self.env
+        )
+
+        for subscriber in self.subscribers:
+            command.subscribe(subscriber)
+
+        try:
+            command.run_to_stdout(self.output)
+        finally:
+            self.usage = command.usage
+
+            if self.usage:
+                self.usage["engine"] = (
+                    dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE
+                )
+
+        return self
+
+    @staticmethod
+    def get_own_usage() -> dict:
+        """
+        Provides what our process - and the children it waited for - consumed
+        so far.
+        """
+
+        own = get_usage(resource.getrusage(resource.RUSAGE_SELF), time.monotonic())
+        children = get_usage(resource.getrusage(resource.RUSAGE_CHILDREN), 0.0)
+
+        return {
+            x: max(y, children[x]) if x == "max_rss_kib" else y + children[x]
+            for x, y in own.items()
+        }
+
+    def run_in_process(self, arguments: List[str]) -> "PyFuncebleEngine":
+        """
+        Runs PyFunceble inside our own process.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from PyFunceble.cli.entry_points.pyfunceble.cli import tool
+
+        PyFuncebleEngine.in_process_used = True
+        original_argv = sys.argv
+        usage_before = self.get_own_usage()
+
+        sys.argv = ["pyfunceble"] + arguments
+
+        try:
+            tool()
+        except SystemExit as exception:
+            if exception.code not in (None, 0):
+                raise CommandError(
+                    f"PyFunceble exited with {exception.code!r}.",
+                    returncode=(
+                        exception.code if isinstance(exception.code, int) else 1
+                    ),
+                ) from exception
+        finally:
+            sys.argv = original_argv
+            sys.stdout.flush()
+
+            self.usage = {
+                x: y - usage_before[x] if x != "max_rss_kib" else y
+                for x, y in self.get_own_usage().items()
+            }
+            self.usage["engine"] = (
+                dead_hosts.launcher.defaults.pyfunceble.IN_PROCESS_ENGINE
+            )
+
+        return self
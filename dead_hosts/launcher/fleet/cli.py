@@ -0,0 +1,186 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the 'fleet' sub-command of our CLI.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import argparse
+import json
+from datetime import datetime
+from typing import List
+
+import dead_hosts.launcher.defaults.scheduling
+
+
+def add_fleet_parser(command_sub: argparse._SubParsersAction) -> None:
+    """
+    Adds the :code:`fleet` sub-command to the given sub-parsers.
+    """
+
+    # pylint: disable=protected-access
+
+    fleet_parser = command_sub.add_parser(
+        "fleet", help="Manage a fleet of workspaces from a single place."
+    )
+    fleet_parser.add_argument(
+        "--database",
+        help="The SQLite database of the fleet. "
+        "Default: $DEAD_HOSTS_FLEET_DATABASE or ~/.cache/dead-hosts/fleet.sqlite",
+        default=None,
+    )
+    fleet_parser.add_argument(
+        "--json",
+        help="Print the results as JSON.",
+        action="store_true",
+        default=False,
+    )
+
+    fleet_sub = fleet_parser.add_subparsers(dest="fleet_command", required=True)
+
+    index_parser = fleet_sub.add_parser(
+        "index", help="Build or incrementally refresh the index of the fleet."
+    )
+    index_parser.add_argument(
+        "roots",
+        nargs="*",
+        help="Workspaces - or directories of workspaces - to index. "
+        "When omitted, the already indexed workspaces are refreshed.",
+    )
+
+    for name, description in [
+        ("due", "List the workspaces due for a test, the most overdue first."),
+        ("testing", "List the workspaces currently under test."),
+        ("finished", "List the workspaces which finished last."),
+    ]:
+        query_parser = fleet_sub.add_parser(name, help=description)
+        query_parser.add_argument(
+            "-l", "--limit", type=int, default=None, help="Limit the output."
+        )
+
+    lease_parser = fleet_sub.add_parser(
+        "lease",
+        help="Lease the most overdue workspace(s). "
+        "Prints the path and the lease token of each leased workspace.",
+    )
+    lease_parser.add_argument(
+        "-c", "--count", type=int, default=1, help="The number of workspaces to lease."
+    )
+    lease_parser.add_argument(
+        "--owner", default=None, help="The owner of the lease. Default: host:pid"
+    )
+    lease_parser.add_argument(
+        "--ttl",
+        type=float,
+        default=dead_hosts.launcher.defaults.scheduling.LEASE_TTL,
+        help="The time to live (in seconds) of the lease.",
+    )
+
+    renew_parser = fleet_sub.add_parser("renew", help="Renew a lease.")
+    renew_parser.add_argument("token", help="The lease to renew.")
+    renew_parser.add_argument(
+        "--ttl",
+        type=float,
+        default=dead_hosts.launcher.defaults.scheduling.LEASE_TTL,
+        help="The time to live (in seconds) of the lease.",
+    )
+
+    release_parser = fleet_sub.add_parser("release", help="Release a lease.")
+    release_parser.add_argument("token", help="The lease to release.")
+
+
+def print_workspaces(workspaces: List[dict], as_json: bool = False) -> None:
+    """
+    Prints the given workspaces.
+    """
+
+    if as_json:
+        print(json.dumps(workspaces, indent=4))
+        return
+
+    for workspace in workspaces:
+        next_authorization = datetime.fromtimestamp(
+            workspace["next_authorization_timestamp"]
+        ).isoformat(timespec="seconds")
+
+        print(
+            f"{workspace['path']}\t{workspace['repo'] or workspace['name']}\t"
+            f"under_test={bool(workspace['currently_under_test'])}\t"
+            f"next_authorization={next_authorization}"
+        )
+
+
+def run_fleet(arguments: argparse.Namespace) -> int:
+    """
+    Runs the :code:`fleet` sub-command.
+
+    :return:
+        The exit code.
+    """
+
+    # Only the fleet needs SQLite: the parser alone doesn't import it.
+    # pylint: disable=import-outside-toplevel
+    from dead_hosts.launcher.fleet.queue import WorkQueue
+
+    with WorkQueue(arguments.database) as index:
+        if arguments.fleet_command == "index":
+            statistics = index.refresh(arguments.roots)
+
+            if arguments.json:
+                print(json.dumps(statistics, indent=4))
+        elif arguments.fleet_command == "due":
+            print_workspaces(index.get_due(arguments.limit), arguments.json)
+        elif arguments.fleet_command == "testing":
+            print_workspaces(index.get_under_test(arguments.limit), arguments.json)
+        elif arguments.fleet_command == "finished":
+            print_workspaces(index.get_finished(arguments.limit), arguments.json)
+        elif arguments.fleet_command == "lease":
+            leased = index.lease(
+                arguments.count, owner=arguments.owner, ttl=arguments.ttl
+            )
+
+            if arguments.json:
+                print(json.dumps(leased, indent=4))
+            else:
+                for workspace in leased:
+                    print(f"{workspace['path']}\t{workspace['token']}")
+
+            if not leased:
+                return 1
+        elif arguments.fleet_command == "renew":
+            return int(not index.renew(arguments.token, arguments.ttl))
+        elif arguments.fleet_command == "release":
+            return int(not index.release(arguments.token))
+
+    return 0
@@ -0,0 +1,362 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the index of the state of a fleet of workspaces.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+import dead_hosts.launcher.defaults.envs
+import dead_hosts.launcher.defaults.paths
+from dead_hosts.launcher.authorization import Authorization
+from dead_hosts.launcher.info_reader import InfoReader
+
+
+def utc_timestamp(value: Optional[datetime] = None) -> float:
+    """
+    Provides the timestamp of the given (or current) UTC datetime - the same
+    way the administration file stores them.
+    """
+
+    return (value or datetime.utcnow()).timestamp()
+
+
+class FleetIndex:
+    """
+    Provides a SQLite index of the administration files of many workspaces.
+
+    Rows are keyed by the workspace path and refreshed only when the
+    modification time (or size) of their administration file changed. That
+    way, answering "what is due?" doesn't require reading hundreds of files.
+
+    :param database:
+        The path to the SQLite database to work with.
+    """
+
+    # Bump this when the schema changes. The index is a cache: an outdated
+    # one is dropped and rebuilt by the next refresh.
+    SCHEMA_VERSION: int = 2
+
+    database: str
+    connection: sqlite3.Connection
+
+    def __init__(self, database: Optional[str] = None) -> None:
+        self.database = database or dead_hosts.launcher.defaults.envs.FLEET_DATABASE
+
+        if os.path.dirname(self.database):
+            os.makedirs(os.path.dirname(self.database), exist_ok=True)
+
+        self.connection = sqlite3.connect(self.database, timeout=30.0)
+        self.connection.row_factory = sqlite3.Row
+
+        self.create_schema()
+
+    def __enter__(self) -> "FleetIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+
+        self.connection.close()
+
+    def create_schema(self) -> "FleetIndex":
+        """
+        Creates - or recreates - the schema of the index.
+        """
+
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+
+        with self.connection:
+            if version != self.SCHEMA_VERSION:
+                logging.debug(
+                    "Fleet index schema version %r != %r, recreating.",
+                    version,
+                    self.SCHEMA_VERSION,
+                )
+                self.connection.execute("DROP TABLE IF EXISTS workspaces")
+
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS workspaces (
+                    path TEXT PRIMARY KEY,
+                    info_mtime_ns INTEGER NOT NULL,
+                    info_size INTEGER NOT NULL,
+                    name TEXT,
+                    repo TEXT,
+                    currently_under_test INTEGER NOT NULL,
+                    days_until_next_test REAL,
+                    start_timestamp REAL,
+                    finish_timestamp REAL NOT NULL,
+                    next_authorization_timestamp REAL NOT NULL,
+                    platform_optout INTEGER NOT NULL,
+                    raw_link TEXT,
+                    origin_size INTEGER NOT NULL DEFAULT 0,
+                    indexed_timestamp REAL NOT NULL
+                )
+                """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS workspaces_next_authorization "
+                "ON workspaces (next_authorization_timestamp)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS workspaces_finish "
+                "ON workspaces (finish_timestamp)"
+            )
+            self.connection.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+
+        return self
+
+    @staticmethod
+    def discover(roots: Iterable[str]) -> Iterator[str]:
+        """
+        Provides the workspaces found in the given roots.
+
+        A root is either a workspace itself (it holds an administration file)
+        or a directory whose direct children are workspaces.
+        """
+
+        info_filename = dead_hosts.launcher.defaults.paths.INFO_FILENAME
+
+        for root in roots:
+            root = os.path.abspath(root)
+
+            if os.path.isfile(os.path.join(root, info_filename)):
+                yield root
+                continue
+
+            try:
+                entries = sorted(os.scandir(root), key=lambda x: x.name)
+            except (FileNotFoundError, NotADirectoryError):
+                logging.info("Skipped %r: not a directory.", root)
+                continue
+
+            for entry in entries:
+                if entry.is_dir() and os.path.isfile(
+                    os.path.join(entry.path, info_filename)
+                ):
+                    yield entry.path
+
+    @staticmethod
+    def get_row(workspace: str, stat: os.stat_result) -> dict:
+        """
+        Provides the row representing the given workspace.
+        """
+
+        info = InfoReader(workspace)
+        authorization = Authorization(info)
+
+        start_datetime = info.content.get("start_datetime")
+
+        try:
+            origin_size = os.stat(
+                os.path.join(
+                    workspace, dead_hosts.launcher.defaults.paths.ORIGIN_FILENAME
+                )
+            ).st_size
+        except FileNotFoundError:
+            origin_size = 0
+
+        if isinstance(start_datetime, str) and start_datetime:
+            start_timestamp = utc_timestamp(datetime.fromisoformat(start_datetime))
+        else:
+            start_timestamp = None
+
+        return {
+            "path": workspace,
+            "info_mtime_ns": stat.st_mtime_ns,
+            "info_size": stat.st_size,
+            "name": info.content.get("name"),
+            "repo": info.content.get("repo"),
+            "currently_under_test": int(info.currently_under_test),
+            "days_until_next_test": authorization.days_until_next_test,
+            "start_timestamp": start_timestamp,
+            "finish_timestamp": utc_timestamp(info.finish_datetime),
+            "next_authorization_timestamp": utc_timestamp(
+                authorization.next_authorization_time
+            ),
+            "platform_optout": int(bool(info.platform_optout)),
+            "raw_link": info.content.get("raw_link"),
+            "origin_size": origin_size,
+            "indexed_timestamp": utc_timestamp(),
+        }
+
+    def refresh(self, roots: Optional[Iterable[str]] = None) -> dict:
+        """
+        Refreshes the index.
+
+        :param roots:
+            The roots to discover workspaces from. When not given, only the
+            already indexed workspaces are refreshed.
+
+        :return:
+            The number of updated, unchanged and removed workspaces.
+        """
+
+        known = {
+            x["path"]: (x["info_mtime_ns"], x["info_size"])
+            for x in self.connection.execute(
+                "SELECT path, info_mtime_ns, info_size FROM workspaces"
+            )
+        }
+
+        if roots:
+            workspaces = list(self.discover(roots))
+            roots = [os.path.abspath(x) for x in roots]
+        else:
+            workspaces = list(known)
+
+        statistics = {"updated": 0, "unchanged": 0, "removed": 0}
+        to_remove = []
+        to_upsert = []
+
+        for workspace in workspaces:
+            try:
+                stat = os.stat(
+                    os.path.join(
+                        workspace, dead_hosts.launcher.defaults.paths.INFO_FILENAME
+                    )
+                )
+            except FileNotFoundError:
+                to_remove.append(workspace)
+                continue
+
+            if known.get(workspace) == (stat.st_mtime_ns, stat.st_size):
+                statistics["unchanged"] += 1
+                continue
+
+            try:
+                to_upsert.append(self.get_row(workspace, stat))
+            except (ValueError, TypeError) as exception:
+                logging.critical(
+                    "Could not index %r: invalid administration file (%s).",
+                    workspace,
+                    exception,
+                )
+
+        if roots:
+            # Forget the workspaces that disappeared from the scanned roots.
+            seen = set(workspaces)
+
+            to_remove.extend(
+                x
+                for x in known
+                if x not in seen
+                and any(x == y or x.startswith(y + os.sep) for y in roots)
+            )
+
+        with self.connection:
+            if to_upsert:
+                columns = list(to_upsert[0])
+
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO workspaces ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(':' + x for x in columns)})",
+                    to_upsert,
+                )
+
+            self.connection.executemany(
+                "DELETE FROM workspaces WHERE path = ?", [(x,) for x in to_remove]
+            )
+
+        statistics["updated"] = len(to_upsert)
+        statistics["removed"] = len(to_remove)
+
+        logging.info(
+            "Fleet index refreshed: %d updated, %d unchanged, %d removed.",
+            statistics["updated"],
+            statistics["unchanged"],
+            statistics["removed"],
+        )
+
+        return statistics
+
+    def get_due(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Provides the workspaces that are due for a test, the most overdue
+        first. A workspace under test is always due.
+        """
+
+        now = utc_timestamp()
+
+        return [
+            dict(x)
+            for x in self.connection.execute(
+                "SELECT *, :now - next_authorization_timestamp AS overdue_seconds "
+                "FROM workspaces "
+                "WHERE currently_under_test = 1 "
+                "OR next_authorization_timestamp <= :now "
+                "ORDER BY currently_under_test DESC, overdue_seconds DESC "
+                "LIMIT :limit",
+                {"now": now, "limit": -1 if limit is None else limit},
+            )
+        ]
+
+    def get_under_test(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Provides the workspaces that are currently under test, the oldest
+        cycle first.
+        """
+
+        return [
+            dict(x)
+            for x in self.connection.execute(
+                "SELECT * FROM workspaces WHERE currently_under_test = 1 "
+                "ORDER BY start_timestamp ASC LIMIT :limit",
+                {"limit": -1 if limit is None else limit},
+            )
+        ]
+
+    def get_finished(self, limit: Optional[int] = None) -> List[dict]:
+        """
+        Provides the workspaces which finished a cycle, the latest first.
+        """
+
+        return [
+            dict(x)
+            for x in self.connection.execute(
+                "SELECT * FROM workspaces WHERE currently_under_test = 0 "
+                "ORDER BY finish_timestamp DESC LIMIT :limit",
+                {"limit": -1 if limit is None else limit},
+            )
+        ]
@@ -0,0 +1,288 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the leased work queue of a fleet of workspaces.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import contextlib
+import fcntl
+import logging
+import os
+import socket
+import threading
+import uuid
+from typing import Generator, List, Optional
+
+import dead_hosts.launcher.defaults.envs
+import dead_hosts.launcher.defaults.scheduling
+from dead_hosts.launcher.fleet.index import FleetIndex, utc_timestamp
+
+
+class WorkQueue(FleetIndex):
+    """
+    Provides a work queue on top of the fleet index.
+
+    Runners lease the due workspaces for a limited time (TTL). As long as a
+    lease is valid, no other runner can lease the same workspace. The
+    selection happens under an exclusive file lock, so two runners can never
+    pick the same workspace.
+
+    Workspaces are served by priority: the most overdue first - a cycle
+    under test being the most overdue of all - then the biggest list first.
+
+    :param database:
+        The path to the SQLite database to work with.
+    """
+
+    DEFAULT_TTL: float = dead_hosts.launcher.defaults.scheduling.LEASE_TTL
+
+    def create_schema(self) -> "WorkQueue":
+        super().create_schema()
+
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    path TEXT PRIMARY KEY,
+                    token TEXT NOT NULL UNIQUE,
+                    owner TEXT NOT NULL,
+                    acquired_timestamp REAL NOT NULL,
+                    expires_timestamp REAL NOT NULL
+                )
+                """)
+
+        return self
+
+    @contextlib.contextmanager
+    def locked(self) -> Generator[None, None, None]:
+        """
+        Holds the exclusive lock of the queue.
+        """
+
+        # The same database may be given through different (relative or
+        # linked) paths. They all have to lock the same file.
+        with open(
+            f"{os.path.realpath(self.database)}.lock", "a", encoding="utf-8"
+        ) as lock_stream:
+            fcntl.flock(lock_stream.fileno(), fcntl.LOCK_EX)
+
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_stream.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def get_default_owner() -> str:
+        """
+        Provides the default owner of a lease.
+        """
+
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def lease(
+        self,
+        count: int = 1,
+        *,
+        owner: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> List[dict]:
+        """
+        Leases up to the given number of due workspaces.
+
+        :return:
+            The leased workspaces, with their lease :code:`token`.
+        """
+
+        owner = owner or self.get_default_owner()
+        ttl = ttl or self.DEFAULT_TTL
+
+        leased = []
+
+        with self.locked(), self.connection:
+            # The selection and the leases are written in a single write
+            # transaction: nobody can lease in between - even without the
+            # file lock.
+            self.connection.execute("BEGIN IMMEDIATE")
+
+            now = utc_timestamp()
+
+            self.connection.execute(
+                "DELETE FROM leases WHERE expires_timestamp <= ?", (now,)
+            )
+
+            candidates = [
+                dict(x)
+                for x in self.connection.execute(
+                    "SELECT workspaces.*, "
+                    ":now - next_authorization_timestamp AS overdue_seconds "
+                    "FROM workspaces "
+                    "LEFT JOIN leases ON leases.path = workspaces.path "
+                    "WHERE leases.path IS NULL "
+                    "AND (currently_under_test = 1 "
+                    "OR next_authorization_timestamp <= :now) "
+                    "ORDER BY overdue_seconds DESC, origin_size DESC "
+                    "LIMIT :limit",
+                    {"now": now, "limit": count},
+                )
+            ]
+
+            for candidate in candidates:
+                candidate["token"] = uuid.uuid4().hex
+                candidate["owner"] = owner
+                candidate["expires_timestamp"] = now + ttl
+
+                # A workspace leased since the selection is left alone.
+                if not self.connection.execute(
+                    "INSERT OR IGNORE INTO leases (path, token, owner, "
+                    "acquired_timestamp, expires_timestamp) VALUES (?, ?, ?, ?, ?)",
+                    (
+                        candidate["path"],
+                        candidate["token"],
+                        owner,
+                        now,
+                        candidate["expires_timestamp"],
+                    ),
+                ).rowcount:
+                    continue
+
+                leased.append(candidate)
+
+                logging.info(
+                    "Leased %r to %r until %r.",
+                    candidate["path"],
+                    owner,
+                    candidate["expires_timestamp"],
+                )
+
+        return leased
+
+    def renew(self, token: str, ttl: Optional[float] = None) -> bool:
+        """
+        Extends the given lease.
+
+        :return:
+            :py:class:`False` when the lease expired or was released.
+        """
+
+        ttl = ttl or self.DEFAULT_TTL
+
+        with self.locked(), self.connection:
+            now = utc_timestamp()
+
+            renewed = self.connection.execute(
+                "UPDATE leases SET expires_timestamp = ? "
+                "WHERE token = ? AND expires_timestamp > ?",
+                (now + ttl, token, now),
+            ).rowcount
+
+        if not renewed:
+            logging.critical("Could not renew the lease %r: expired.", token)
+
+        return bool(renewed)
+
+    def release(self, token: str) -> bool:
+        """
+        Releases the given lease.
+        """
+
+        with self.locked(), self.connection:
+            released = self.connection.execute(
+                "DELETE FROM leases WHERE token = ?", (token,)
+            ).rowcount
+
+        if released:
+            logging.info("Released the lease %r.", token)
+
+        return bool(released)
+
+
+class LeaseKeeper:
+    """
+    Keeps the lease given through the :code:`DEAD_HOSTS_FLEET_LEASE`
+    environment variable alive, in the background, while a test runs.
+
+    It does nothing when we are not running under a lease.
+
+    :param token:
+        The lease to keep alive.
+    :param ttl:
+        The TTL to renew the lease for.
+    """
+
+    def __init__(
+        self, token: Optional[str] = None, ttl: Optional[float] = None
+    ) -> None:
+        self.token = token or dead_hosts.launcher.defaults.envs.FLEET_LEASE
+        self.ttl = ttl or WorkQueue.DEFAULT_TTL
+
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "LeaseKeeper":
+        if self.token:
+            self.thread = threading.Thread(
+                target=self.keep_alive, name="lease-keeper", daemon=True
+            )
+            self.thread.start()
+
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop_event.set()
+
+        if self.thread:
+            self.thread.join()
+
+    def keep_alive(self) -> None:
+        """
+        Renews the lease every third of its TTL, until told to stop.
+        """
+
+        # SQLite connections can't be shared between threads.
+        with WorkQueue() as queue:
+            while not self.stop_event.wait(self.ttl / 3):
+                if not queue.renew(self.token, self.ttl):
+                    break
+
+    @staticmethod
+    def release_current() -> bool:
+        """
+        Releases the lease we are running under - if any.
+        """
+
+        if not dead_hosts.launcher.defaults.envs.FLEET_LEASE:
+            return False
+
+        with WorkQueue() as queue:
+            return queue.release(dead_hosts.launcher.defaults.envs.FLEET_LEASE)
@@ -0,0 +1,226 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the incremental testing logic. In other words, the way we only test
+the subjects added since the previous cycle.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import logging
+import os
+from typing import Iterator, Optional
+
+import dead_hosts.launcher.defaults.paths
+from dead_hosts.launcher.atomic import atomic_open
+from dead_hosts.launcher.normalization import read_canonical
+from dead_hosts.launcher.output import OutputWriter, iter_joined_lines
+from dead_hosts.launcher.sorting import (
+    DEFAULT_MEMORY_LIMIT,
+    diff_sorted,
+    intersect_sorted,
+    read_sorted,
+    sort_unique,
+    union_sorted,
+)
+
+
+class IncrementalTest:
+    """
+    Keeps a sorted snapshot of the previously tested input and provides the
+    subjects to test - and the results to carry forward - from it.
+
+    A cycle goes through the following steps:
+
+        1. :py:meth:`stage` keeps a copy of the (normalized) input we are
+           about to test.
+        2. :py:meth:`prepare` writes the subjects added since the snapshot
+           into the delta file - the one PyFunceble tests.
+        3. :py:meth:`write_output` merges the still listed subjects of the
+           previous output with the new results.
+        4. :py:meth:`promote` makes the staged input the new snapshot.
+
+    :param workspace_dir:
+        The directory to work from.
+    :param memory_limit:
+        The memory (in bytes) a sorting may use before spilling to the disk.
+    """
+
+    def __init__(
+        self,
+        workspace_dir: Optional[str] = None,
+        *,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    ) -> None:
+        if workspace_dir is None:
+            workspace_dir = dead_hosts.launcher.defaults.paths.CURRENT_DIRECTORY
+
+        self.workspace_dir = workspace_dir
+        self.memory_limit = memory_limit
+
+        self.snapshot_path = os.path.join(
+            workspace_dir, dead_hosts.launcher.defaults.paths.SNAPSHOT_FILENAME
+        )
+        self.pending_snapshot_path = os.path.join(
+            workspace_dir, dead_hosts.launcher.defaults.paths.PENDING_SNAPSHOT_FILENAME
+        )
+        self.delta_path = os.path.join(
+            workspace_dir, dead_hosts.launcher.defaults.paths.DELTA_FILENAME
+        )
+
+    def sort_canonical(self, path: str) -> Iterator[bytes]:
+        """
+        Provides the sorted and deduplicated canonical subjects of the given
+        (unsorted) file.
+        """
+
+        return sort_unique(
+            read_canonical(path),
+            memory_limit=self.memory_limit,
+            directory=self.workspace_dir,
+        )
+
+    def stage(self, source: str) -> "IncrementalTest":
+        """
+        Keeps the canonical subjects of the input we are about to test -
+        sorted. They are the values our output holds, so that the output can
+        be matched against them.
+
+        :param source:
+            The (normalized) input.
+        """
+
+        with atomic_open(
+            self.pending_snapshot_path, "wb", buffering=1024 * 1024
+        ) as destination_stream:
+            for block in iter_joined_lines(self.sort_canonical(source), 1024 * 1024):
+                destination_stream.write(block)
+
+        return self
+
+    def prepare(self) -> dict:
+        """
+        Writes the subjects added since the snapshot into the delta file.
+
+        :return:
+            The statistics of the delta.
+        """
+
+        statistics = {"added": 0, "removed": 0}
+
+        with atomic_open(self.delta_path, "wb", buffering=1024 * 1024) as output:
+            for added, subject in diff_sorted(
+                read_sorted(self.snapshot_path),
+                read_sorted(self.pending_snapshot_path),
+            ):
+                if added:
+                    output.write(subject + b"\n")
+                    statistics["added"] += 1
+                else:
+                    statistics["removed"] += 1
+
+        logging.info(
+            "Incremental test: %d subject(s) added and %d removed since the "
+            "previous cycle.",
+            statistics["added"],
+            statistics["removed"],
+        )
+
+        return statistics
+
+    def discard(self) -> "IncrementalTest":
+        """
+        Removes the delta file. That way, the whole input gets tested.
+        """
+
+        if os.path.isfile(self.delta_path):
+            os.remove(self.delta_path)
+
+        return self
+
+    def write_output(self, tested_output: str, writer: OutputWriter) -> int:
+        """
+        Writes the output of an incremental cycle: the subjects of the
+        previous output that are still listed, and the ones which were
+        found active during the cycle.
+
+        :param tested_output:
+            What PyFunceble found active during the cycle.
+        :param writer:
+            The writer of the outputs. Its destination is the output of the
+            previous cycle - which is replaced.
+
+        :return:
+            The number of written subjects.
+        """
+
+        previous_output = writer.destination
+        sources = []
+
+        if os.path.isfile(tested_output):
+            sources.append(self.sort_canonical(tested_output))
+
+        if os.path.isfile(previous_output):
+            sources.append(
+                intersect_sorted(
+                    self.sort_canonical(previous_output),
+                    read_sorted(self.pending_snapshot_path),
+                )
+            )
+
+        written = writer.write_blocks(
+            iter_joined_lines(union_sorted(*sources), writer.block_size)
+        )
+
+        logging.info(
+            "Incremental test: wrote %d subject(s) into %r.", written, previous_output
+        )
+
+        return written
+
+    def promote(self) -> "IncrementalTest":
+        """
+        Makes the staged input the new snapshot.
+        """
+
+        if os.path.isfile(self.pending_snapshot_path):
+            os.replace(self.pending_snapshot_path, self.snapshot_path)
+
+        return self
+
+    def snapshot_exists(self) -> bool:
+        """
+        Checks if a snapshot of the previously tested input exists.
+        """
+
+        return os.path.isfile(self.snapshot_path)
@@ -36,19 +36,22 @@ License:
     SOFTWARE.
 """
 
-import copy
+import json
 import logging
 import os
 import tempfile
 import uuid
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional
 
 from PyFunceble.helpers.dict import DictHelper
 from PyFunceble.helpers.file import FileHelper
 
 import dead_hosts.launcher.defaults.envs
 import dead_hosts.launcher.defaults.paths
+import dead_hosts.launcher.defaults.pyfunceble
+import dead_hosts.launcher.defaults.scheduling
+from dead_hosts.launcher.atomic import write_atomically
 
 
 class InfoManager:
@@ -73,11 +76,16 @@ class InfoManager:
         dead_hosts.launcher.defaults.paths.PYFUNCEBLE_CONFIG_DIRECTORY
     )
 
+    # The serialized state we last read or wrote. It let us skip the
+    # writes that wouldn't change anything.
+    stored_state: Optional[str] = None
+
     def __init__(self) -> None:
         self.info_file_instance = FileHelper(self.INFO_FILE)
 
         if self.info_file_instance.exists():
-            self.content = DictHelper().from_json_file(self.info_file_instance.path)
+            self.stored_state = self.info_file_instance.read()
+            self.content = DictHelper().from_json(self.stored_state)
         else:
             self.content = {}
 
@@ -121,9 +129,9 @@ class InfoManager:
     def __del__(self):
         self.store()
 
-    def store(self) -> "InfoManager":
+    def serialize(self) -> str:
         """
-        Stores the current state.
+        Provides the JSON representation of the current state.
         """
 
         local_copy = {}
@@ -136,9 +144,38 @@ class InfoManager:
             elif isinstance(value, uuid.UUID):
                 local_copy[index] = str(value)
             else:
-                local_copy[index] = copy.deepcopy(value)
+                # No copy needed: the value is only read by the encoder.
+                local_copy[index] = value
+
+        return json.dumps(local_copy, ensure_ascii=False, indent=4, sort_keys=True)
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Checks if the current state differs from the stored one.
+        """
+
+        return self.serialize() != self.stored_state
+
+    def store(self) -> "InfoManager":
+        """
+        Stores the current state - if it changed.
+
+        The file is replaced atomically so that a killed job can't leave a
+        truncated administration file behind.
+        """
+
+        serialized = self.serialize()
+
+        if serialized == self.stored_state:
+            logging.debug("Administration file unchanged, not storing it.")
+            return self
+
+        write_atomically(self.info_file_instance.path, serialized)
+        self.stored_state = serialized
+
+        logging.debug("Administration file stored.")
 
-        DictHelper(local_copy).to_json_file(self.info_file_instance.path)
         return self
 
     def clean(self) -> "InfoManager":
@@ -209,6 +246,33 @@ class InfoManager:
             "platform_remote_source_id": None,
             "platform_optout": dead_hosts.launcher.defaults.paths.GIT_REPO_OWNER
             != "dead-hosts",
+            "scheduling_mode": dead_hosts.launcher.defaults.scheduling.STATIC_MODE,
+            "cycle_history": [],
+            "current_cycle_parts": 0,
+            "current_cycle_busy_seconds": 0.0,
+            "pyfunceble_engine": (
+                dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE
+            ),
+            "progress_tracking": False,
+            "input_fingerprint": None,
+            "normalize_input": False,
+            "tested_filename": dead_hosts.launcher.defaults.paths.ORIGIN_FILENAME,
+            "skip_unchanged_input": False,
+            "input_freshness_days": (
+                dead_hosts.launcher.defaults.scheduling.INPUT_FRESHNESS_DAYS
+            ),
+            "incremental_testing": False,
+            "last_full_test_timestamp": 0.0,
+            "snapshot_start_timestamp": None,
+            "sort_output": False,
+            "output_formats": [],
+            "output_compressions": [],
+            "publish_deltas": False,
+            "delta_history": 24,
+            "shards": 1,
+            "current_cycle_shards": 1,
+            "matrix_shards": 4,
+            "current_cycle_matrix_shards": 0,
         }
 
         for index, value in indexes.items():
@@ -301,7 +365,57 @@ class InfoManager:
                 dict,
             )
 
-        for index in ["currently_under_test", "ping_enabled"]:
+        if "cycle_history" in self.content and not isinstance(
+            self.content["cycle_history"], list
+        ):
+            self.content["cycle_history"] = []
+
+            logging.debug(
+                "Updated the `cycle_history` index of the administration file, "
+                "it should be a %r.",
+                list,
+            )
+
+        if (
+            "pyfunceble_engine" in self.content
+            and self.content["pyfunceble_engine"]
+            not in dead_hosts.launcher.defaults.pyfunceble.ENGINES
+        ):
+            self.content["pyfunceble_engine"] = (
+                dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE
+            )
+
+            logging.debug(
+                "Updated the `pyfunceble_engine` index of the administration "
+                "file, it should be one of %r.",
+                dead_hosts.launcher.defaults.pyfunceble.ENGINES,
+            )
+
+        for index in ["output_formats", "output_compressions"]:
+            if index in self.content and not isinstance(self.content[index], list):
+                self.content[index] = [
+                    x.strip()
+                    for x in str(self.content[index] or "").split(",")
+                    if x.strip()
+                ]
+
+                logging.debug(
+                    "Updated the %r index of the administration file, "
+                    "it should be a %r.",
+                    index,
+                    list,
+                )
+
+        for index in [
+            "currently_under_test",
+            "ping_enabled",
+            "progress_tracking",
+            "skip_unchanged_input",
+            "normalize_input",
+            "incremental_testing",
+            "sort_output",
+            "publish_deltas",
+        ]:
             if index in self.content and not isinstance(self.content[index], bool):
                 self.content[index] = bool(int(self.content[index]))
 
@@ -314,6 +428,7 @@ class InfoManager:
 
         for index in [
             "days_until_next_test",
+            "last_full_test_timestamp",
             "finish_timestamp",
             "last_download_datetime"
             "last_download_timestamp"
@@ -331,6 +446,17 @@ class InfoManager:
                     float,
                 )
 
+        for index in ["delta_history"]:
+            if index in self.content and not isinstance(self.content[index], int):
+                self.content[index] = int(self.content[index])
+
+                logging.debug(
+                    "Updated the %r index of the administration file, "
+                    "it should be a %r.",
+                    index,
+                    int,
+                )
+
         for index in [
             "finish_timestamp",
             "last_download_timestamp",
@@ -353,8 +479,8 @@ class InfoManager:
         for index in [
             "finish_datetime",
             "last_download_datetime",
-            "lastest_part_finish_datetime",
-            "lastest_part_start_datetime",
+            "latest_part_finish_datetime",
+            "latest_part_start_datetime",
             "start_datetime",
         ]:
             if index in self.content:
@@ -429,6 +555,42 @@ class InfoManager:
                     file.path,
                 )
 
+    def record_cycle(self, **kwargs) -> "InfoManager":
+        """
+        Appends the given cycle to the history of cycles - and forgets the
+        oldest ones.
+        """
+
+        self.content["cycle_history"] = (self.content.get("cycle_history") or []) + [
+            kwargs
+        ]
+        self.content["cycle_history"] = self.content["cycle_history"][
+            -dead_hosts.launcher.defaults.scheduling.CYCLE_HISTORY_SIZE :
+        ]
+
+        return self
+
+    def is_input_normalized(self) -> bool:
+        """
+        Checks if PyFunceble tests the normalized input - instead of the
+        origin file.
+        """
+
+        return (
+            self.content.get("normalize_input") is True
+            or self.content.get("incremental_testing") is True
+        )
+
+    def is_adblock_input(self) -> bool:
+        """
+        Checks if the input is an adblock filter list - which PyFunceble is
+        configured to decode.
+        """
+
+        config = self.content.get("custom_pyfunceble_config") or {}
+
+        return bool(config.get("cli_decoding.adblock") or config.get("adblock"))
+
     def get_ping_for_commit(self) -> str:
         """
         Provides the string to append in order to mention the users to ping.
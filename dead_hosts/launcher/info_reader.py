@@ -0,0 +1,160 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides a read-only, lightweight view of the 'info.json' file.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import dead_hosts.launcher.defaults.envs
+import dead_hosts.launcher.defaults.paths
+import dead_hosts.launcher.repository
+
+
+class InfoReader:
+    """
+    Provides a read-only view of the :code:`info.json` file.
+
+    Contrary to the :class:`~dead_hosts.launcher.info_manager.InfoManager`,
+    this interface never writes, migrates or cleans anything. It only
+    normalizes the indexes needed to decide whether a run is authorized, the
+    same way the manager would.
+
+    :param workspace_dir:
+        The workspace to read from.
+    """
+
+    WORKSPACE_DIR: str = dead_hosts.launcher.defaults.envs.WORKSPACE_DIR
+
+    # Whether we read the workspace we are running in - or any other one.
+    foreign: bool = False
+
+    def __init__(self, workspace_dir: Optional[str] = None) -> None:
+        if workspace_dir is not None:
+            self.WORKSPACE_DIR = workspace_dir  # pylint: disable=invalid-name
+            self.foreign = True
+
+        self.info_file = os.path.join(
+            self.WORKSPACE_DIR, dead_hosts.launcher.defaults.paths.INFO_FILENAME
+        )
+
+        try:
+            with open(self.info_file, "r", encoding="utf-8") as file_stream:
+                self.content = json.load(file_stream)
+        except FileNotFoundError:
+            self.content = {}
+
+        if not isinstance(self.content, dict):
+            self.content = {}
+
+        logging.debug("Administration file path (read-only): %r", self.info_file)
+
+        self.normalize()
+
+    def __getattr__(self, index: str) -> Any:
+        if index in self.content:
+            return self.content[index]
+
+        raise AttributeError(index)
+
+    def __getitem__(self, index: str) -> Any:
+        if index in self.content:
+            return self.content[index]
+
+        raise AttributeError(index)
+
+    def normalize(self) -> "InfoReader":
+        """
+        Normalizes the indexes needed by the authorization logic.
+        """
+
+        if "currently_under_test" in self.content and not isinstance(
+            self.content["currently_under_test"], bool
+        ):
+            self.content["currently_under_test"] = bool(
+                int(self.content["currently_under_test"])
+            )
+
+        if "days_until_next_test" in self.content:
+            self.content["days_until_next_test"] = float(
+                self.content["days_until_next_test"]
+            )
+
+        if "finish_datetime" in self.content:
+            if self.content["finish_datetime"]:
+                self.content["finish_datetime"] = datetime.fromisoformat(
+                    self.content["finish_datetime"]
+                )
+            else:
+                self.content["finish_datetime"] = datetime.fromtimestamp(0)
+
+        indexes = {
+            "currently_under_test": False,
+            "days_until_next_test": 2,
+            "finish_datetime": datetime.utcnow() - timedelta(days=15),
+            "live_update": True,
+        }
+
+        for index, value in indexes.items():
+            if index not in self.content:
+                self.content[index] = value
+
+        if "platform_optout" not in self.content:
+            self.content["platform_optout"] = self.repository_owner != "dead-hosts"
+
+        return self
+
+    @property
+    def repository_owner(self) -> Optional[str]:
+        """
+        Provides the owner of the repository of the workspace.
+        """
+
+        if not self.foreign:
+            return dead_hosts.launcher.defaults.paths.GIT_REPO_OWNER
+
+        repository_base = (
+            self.content.get("repo")
+            or dead_hosts.launcher.repository.read_repository_base_of(
+                self.WORKSPACE_DIR
+            )
+            or ""
+        )
+
+        return repository_base.split("/", 1)[0] or None
@@ -0,0 +1,235 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the normalization of the input we test.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import ipaddress
+import logging
+import os
+import re
+from typing import Callable, Iterator, List
+
+from dead_hosts.launcher.atomic import atomic_open
+from dead_hosts.launcher.sorting import DEFAULT_MEMORY_LIMIT, sort_unique
+
+# What makes a line need more than a strip.
+FIELD_SEPARATOR_OR_COMMENT_REGEX = re.compile(rb"[\s#\\]")
+
+# How nslookup displays a space (RFC 6763).
+NSLOOKUP_SPACE = rb"\032"
+
+
+def is_ip(field: bytes) -> bool:
+    """
+    Checks if the given field is an IP (v4 or v6).
+    """
+
+    try:
+        ipaddress.ip_address(field.decode("ascii"))
+    except (ValueError, UnicodeDecodeError):
+        return False
+
+    return True
+
+
+def canonicalize_subject(subject: bytes) -> bytes:
+    """
+    Provides the canonical form of the given subject. Unless it is a URL, it
+    is lowercased and its trailing dots are dropped.
+    """
+
+    if b"://" in subject:
+        return subject
+
+    return subject.lower().rstrip(b".")
+
+
+def canonicalize(line: bytes) -> List[bytes]:
+    """
+    Provides the canonical form of the subjects of the given line - the
+    ones PyFunceble extracts from it.
+
+    Comments are dropped. The IP of a hosts line is dropped: only the
+    subjects following it are kept.
+    """
+
+    line = line.strip()
+
+    if not line or line.startswith((b"#", b"!")):
+        return []
+
+    if (
+        line.islower()
+        and not line.endswith(b".")
+        and not FIELD_SEPARATOR_OR_COMMENT_REGEX.search(line)
+    ):
+        # Already canonical - the usual case of a PyFunceble output.
+        return [line]
+
+    fields = line.split(b"#", 1)[0].replace(NSLOOKUP_SPACE, b" ").split()
+
+    if len(fields) > 1 and is_ip(fields[0]):
+        # A hosts line.
+        del fields[0]
+
+    return [x for x in map(canonicalize_subject, fields) if x]
+
+
+def canonicalize_adblock(line: bytes) -> List[bytes]:
+    """
+    Provides the canonical form of the subjects PyFunceble decodes from the
+    given adblock filter.
+    """
+
+    # PyFunceble is heavy to import, and we only need it for adblock inputs.
+    # pylint: disable=import-outside-toplevel
+    from PyFunceble.converter.adblock_input_line2subject import (
+        AdblockInputLine2Subject,
+    )
+
+    line = line.strip()
+
+    if not line:
+        return []
+
+    decoded = AdblockInputLine2Subject(
+        line.decode("utf-8", errors="replace")
+    ).get_converted()
+
+    return [
+        x
+        for x in (canonicalize_subject(y.encode("utf-8")) for y in sorted(decoded))
+        if x
+    ]
+
+
+def read_canonical(
+    path: str, *, extractor: Callable[[bytes], List[bytes]] = canonicalize
+) -> Iterator[bytes]:
+    """
+    Provides the canonical subjects of the given file - in their original
+    order.
+
+    :param extractor:
+        Provides the canonical subjects of a line.
+    """
+
+    with open(path, "rb") as file_stream:
+        for line in file_stream:
+            yield from extractor(line)
+
+
+class InputNormalizer:
+    """
+    Writes the canonical and deduplicated subjects of a file into another
+    one. The subjects are sorted on the way.
+
+    :param source:
+        The file to read.
+    :param destination:
+        The file to write.
+    :param memory_limit:
+        The memory (in bytes) the deduplication may use before spilling to
+        the disk.
+    :param adblock:
+        Decodes the source as an adblock filter list.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        destination: str,
+        *,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        adblock: bool = False,
+    ) -> None:
+        self.source = source
+        self.destination = destination
+        self.memory_limit = memory_limit
+        self.extractor = canonicalize_adblock if adblock else canonicalize
+
+        self.subjects: int = 0
+        self.unique_subjects: int = 0
+
+    def read_subjects(self) -> Iterator[bytes]:
+        """
+        Provides the canonical subjects of the source.
+        """
+
+        for subject in read_canonical(self.source, extractor=self.extractor):
+            self.subjects += 1
+            yield subject
+
+    def start(self) -> dict:
+        """
+        Starts the normalization.
+
+        :return:
+            The statistics of the normalization.
+        """
+
+        self.subjects = self.unique_subjects = 0
+
+        with atomic_open(self.destination, "wb", buffering=1024 * 1024) as output:
+            for subject in sort_unique(
+                self.read_subjects(),
+                memory_limit=self.memory_limit,
+                directory=os.path.dirname(os.path.abspath(self.destination)),
+            ):
+                output.write(subject + b"\n")
+                self.unique_subjects += 1
+
+        statistics = {
+            "subjects": self.subjects,
+            "unique_subjects": self.unique_subjects,
+            "duplicates": self.subjects - self.unique_subjects,
+            "reduction_ratio": (
+                (self.subjects - self.unique_subjects) / self.subjects
+                if self.subjects
+                else 0.0
+            ),
+        }
+
+        logging.info(
+            "Normalized %r into %r: %d subjects, %d unique (%.1f%% less).",
+            self.source,
+            self.destination,
+            statistics["subjects"],
+            statistics["unique_subjects"],
+            statistics["reduction_ratio"] * 100,
+        )
+
+        return statistics
@@ -37,31 +37,54 @@ License:
     SOFTWARE.
 """
 
+import hashlib
+import json
 import logging
 import os
 import sys
 import tempfile
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 import PyFunceble
 import PyFunceble.facility
+import PyFunceble.storage
 import requests
 from PyFunceble.cli.continuous_integration.exceptions import (
     ContinuousIntegrationException,
     StopExecution,
 )
 from PyFunceble.cli.continuous_integration.github_actions import GitHubActions
-from PyFunceble.helpers.download import DownloadHelper
 from PyFunceble.helpers.environment_variable import EnvironmentVariableHelper
 from PyFunceble.helpers.file import FileHelper
 
 import dead_hosts.launcher.defaults.envs
 import dead_hosts.launcher.defaults.paths
+import dead_hosts.launcher.defaults.pyfunceble
+from dead_hosts.launcher.atomic import write_atomically
 from dead_hosts.launcher.authorization import Authorization
-from dead_hosts.launcher.command import Command
+from dead_hosts.launcher.command import CommandTimeoutError
+from dead_hosts.launcher.delta import DeltaPublisher
+from dead_hosts.launcher.download import StreamingDownloader
+from dead_hosts.launcher.engine import PyFuncebleEngine
+from dead_hosts.launcher.fleet.queue import LeaseKeeper
+from dead_hosts.launcher.incremental import IncrementalTest
 from dead_hosts.launcher.info_manager import InfoManager
+from dead_hosts.launcher.normalization import InputNormalizer
+from dead_hosts.launcher.output import (
+    OutputWriter,
+    get_compressions,
+    get_format_destinations,
+)
 from dead_hosts.launcher.platform import PlatformOrchestration
+from dead_hosts.launcher.progress import ProgressTracker
+from dead_hosts.launcher.run_history import RunHistory
+from dead_hosts.launcher.sharding import (
+    ShardSupervisor,
+    find_active_lists,
+    find_usage_records,
+    merge_active_lists,
+)
 from dead_hosts.launcher.updater.all import execute_all_updater
 from dead_hosts.launcher.updater.pyfunceble_config import PyFuncebleConfigUpdater
 
@@ -75,7 +98,9 @@ class Orchestration:
     authorization_handler: Optional[Authorization] = None
 
     origin_file: Optional[FileHelper] = None
+    normalized_file: Optional[FileHelper] = None
     output_file: Optional[FileHelper] = None
+    incremental_test: Optional[IncrementalTest] = None
 
     def __init__(
         self,
@@ -83,7 +108,12 @@ class Orchestration:
         end: bool = False,
         authorize: bool = False,
         update: bool = False,
+        *,
+        matrix: bool = False,
+        shard_index: Optional[int] = None,
+        shard_results: Optional[str] = None,
     ) -> None:
+        # pylint: disable=too-many-arguments
         self.info_manager = InfoManager()
 
         git_name = EnvironmentVariableHelper("GIT_NAME")
@@ -112,6 +142,13 @@ class Orchestration:
             )
         )
 
+        self.normalized_file = FileHelper(
+            os.path.join(
+                self.info_manager.WORKSPACE_DIR,
+                dead_hosts.launcher.defaults.paths.NORMALIZED_FILENAME,
+            )
+        )
+
         self.output_file = FileHelper(
             os.path.join(
                 self.info_manager.WORKSPACE_DIR,
@@ -119,6 +156,8 @@ class Orchestration:
             )
         )
 
+        self.incremental_test = IncrementalTest(self.info_manager.WORKSPACE_DIR)
+
         if not authorize:
             logging.info("Origin file: %r", self.origin_file.path)
             logging.info("Output file: %r", self.output_file.path)
@@ -130,26 +169,52 @@ class Orchestration:
         elif update:
             execute_all_updater(self.info_manager)
         elif end:
-            self.run_end()
+            self.run_end(shard_results)
+        elif matrix:
+            self.run_matrix()
+        elif shard_index is not None:
+            self.run_matrix_shard(shard_index)
         else:
-            logging.info("Checking authorization to run.")
+            self.run_authorized()
 
-            if EnvironmentVariableHelper("PLATFORM_WORKER").get_value():
-                self.run_platform_worker()
-            elif self.authorization_handler.is_platform_authorized():
-                self.run_platform_sync()
-            elif self.authorization_handler.is_test_authorized():
-                PyFunceble.facility.ConfigLoader.start()
-                self.fetch_file_to_test()
+    def run_authorized(self):
+        """
+        Runs whatever we are authorized to run.
+        """
 
-                self.run_test()
-            else:
-                logging.info(
-                    "Not authorized to run a test until %r (current time) > %r",
-                    datetime.now(),
-                    self.authorization_handler.next_authorization_time,
-                )
-                sys.exit(0)
+        logging.info("Checking authorization to run.")
+
+        if EnvironmentVariableHelper("PLATFORM_WORKER").get_value():
+            self.run_platform_worker()
+        elif self.authorization_handler.is_platform_authorized():
+            self.run_platform_sync()
+        elif self.authorization_handler.is_test_authorized():
+            self.run_authorized_test()
+        else:
+            logging.info(
+                "Not authorized to run a test until %r (current time) > %r",
+                datetime.now(),
+                self.authorization_handler.next_authorization_time,
+            )
+            sys.exit(0)
+
+    def run_authorized_test(self):
+        """
+        Runs the test we are authorized to run - unless its input did not
+        change.
+        """
+
+        PyFunceble.facility.ConfigLoader.start()
+        self.fetch_file_to_test()
+
+        if self.authorization_handler.is_skip_authorized(
+            self.info_manager["input_fingerprint"]
+        ):
+            self.run_postpone()
+        else:
+            self.normalize_file_to_test()
+            self.prepare_incremental_test()
+            self.run_test()
 
     def fetch_file_to_test(self) -> "Orchestration":
         """
@@ -161,9 +226,9 @@ class Orchestration:
             logging.info("Raw Link: %r", self.info_manager.raw_link)
 
             if self.info_manager.raw_link:
-                DownloadHelper(self.info_manager.raw_link).download_text(
-                    destination=self.origin_file.path
-                )
+                StreamingDownloader(
+                    self.info_manager.raw_link, self.origin_file.path
+                ).start()
 
                 logging.info(
                     "Could get the new version of the list. Updating the download time."
@@ -202,10 +267,101 @@ class Orchestration:
                     "last_download_datetime"
                 ].timestamp()
 
+            self.info_manager["input_fingerprint"] = self.get_input_fingerprint()
+
             logging.info("Updated %r.", self.origin_file.path)
+            logging.info(
+                "Input fingerprint: %r", self.info_manager["input_fingerprint"]
+            )
+
+        return self
+
+    def normalize_file_to_test(self) -> "Orchestration":
+        """
+        Writes the canonical and deduplicated subjects of the origin file into
+        the file PyFunceble tests - if enabled.
+        """
+
+        if not self.info_manager.is_input_normalized():
+            return self
+
+        if (
+            not self.authorization_handler.is_refresh_authorized()
+            and self.normalized_file.exists()
+        ):
+            return self
+
+        self.info_manager["input_statistics"] = InputNormalizer(
+            self.origin_file.path,
+            self.normalized_file.path,
+            adblock=self.info_manager.is_adblock_input(),
+        ).start()
+
+        return self
+
+    def prepare_incremental_test(self) -> "Orchestration":
+        """
+        Writes the subjects added since the previous cycle into the file
+        PyFunceble tests - if enabled and authorized.
+        """
+
+        if (
+            self.info_manager["incremental_testing"] is not True
+            or self.info_manager.currently_under_test
+        ):
+            return self
+
+        self.incremental_test.stage(self.normalized_file.path)
+
+        if self.authorization_handler.is_incremental_authorized(
+            self.incremental_test.snapshot_exists()
+        ):
+            self.info_manager["incremental_statistics"] = (
+                self.incremental_test.prepare()
+            )
+        else:
+            logging.info("Incremental test not authorized. Testing the whole input.")
+
+            self.incremental_test.discard()
+            self.info_manager["incremental_statistics"] = None
 
         return self
 
+    def get_tested_filename(self) -> str:
+        """
+        Provides the name of the file PyFunceble should test during the cycle
+        we are about to start.
+        """
+
+        if self.info_manager["incremental_testing"] is True and os.path.isfile(
+            self.incremental_test.delta_path
+        ):
+            return dead_hosts.launcher.defaults.paths.DELTA_FILENAME
+
+        if self.info_manager.is_input_normalized() and self.normalized_file.exists():
+            return dead_hosts.launcher.defaults.paths.NORMALIZED_FILENAME
+
+        return dead_hosts.launcher.defaults.paths.ORIGIN_FILENAME
+
+    def get_tested_file(self) -> FileHelper:
+        """
+        Provides the file PyFunceble tests during the current cycle.
+        """
+
+        if (
+            self.info_manager["tested_filename"]
+            == dead_hosts.launcher.defaults.paths.DELTA_FILENAME
+        ):
+            return FileHelper(self.incremental_test.delta_path)
+
+        if (
+            self.info_manager["tested_filename"]
+            == dead_hosts.launcher.defaults.paths.NORMALIZED_FILENAME
+        ):
+            return self.normalized_file
+
+        return self.origin_file
+
     def run_platform_worker(self):
         """
         Run a test of the input list.
@@ -220,28 +376,56 @@ class Orchestration:
 
         EnvironmentVariableHelper("PYFUNCEBLE_BYPASS_BYPASS").set_value("True")
 
-        Command("pyfunceble platform").run_to_stdout()
+        # The time PyFunceble may run depends on the configuration.
+        PyFunceble.facility.ConfigLoader.start()
 
-        if not dead_hosts.launcher.defaults.envs.GITHUB_TOKEN:
-            self.run_end()
+        engine = self.get_pyfunceble_engine()
+        finished = False
 
-    def run_test(self):
+        try:
+            engine.run("platform")
+
+            finished = True
+        except CommandTimeoutError as exception:
+            logging.info("PyFunceble did not finish in time: %s", exception)
+        finally:
+            self.record_usage(engine, "platform")
+
+        self.finish_part(finished)
+
+    def start_cycle(self) -> "Orchestration":
         """
-        Run a test of the input list.
+        Updates the indexes of the administration file for a new cycle.
         """
 
-        if not self.info_manager.currently_under_test:
-            self.info_manager["currently_under_test"] = True
+        self.info_manager["currently_under_test"] = True
 
-            self.info_manager["start_datetime"] = datetime.utcnow()
-            self.info_manager["start_timestamp"] = self.info_manager[
-                "start_datetime"
-            ].timestamp()
+        self.info_manager["start_datetime"] = datetime.utcnow()
+        self.info_manager["start_timestamp"] = self.info_manager[
+            "start_datetime"
+        ].timestamp()
 
-            self.info_manager["finish_datetime"] = datetime.fromtimestamp(0)
-            self.info_manager["finish_timestamp"] = self.info_manager[
-                "finish_datetime"
-            ].timestamp()
+        self.info_manager["finish_datetime"] = datetime.fromtimestamp(0)
+        self.info_manager["finish_timestamp"] = self.info_manager[
+            "finish_datetime"
+        ].timestamp()
+
+        self.info_manager["current_cycle_parts"] = 0
+        self.info_manager["current_cycle_busy_seconds"] = 0.0
+
+        self.info_manager["tested_filename"] = self.get_tested_filename()
+        self.info_manager["current_cycle_shards"] = 1
+        self.info_manager["current_cycle_matrix_shards"] = 0
+
+        return self
+
+    def start_part(self) -> "Orchestration":
+        """
+        Updates the indexes of the administration file for a new part of the
+        current cycle.
+        """
+
+        self.info_manager["current_cycle_parts"] += 1
 
         self.info_manager["latest_part_start_datetime"] = datetime.utcnow()
         self.info_manager["latest_part_start_timestamp"] = self.info_manager[
@@ -254,13 +438,306 @@ class Orchestration:
         ].timestamp()
 
         logging.info("Updated all timestamps.")
+
+        return self
+
+    def run_test(self):
+        """
+        Run a test of the input list.
+        """
+
+        if not self.info_manager.currently_under_test:
+            self.start_cycle()
+            self.info_manager["current_cycle_shards"] = self.get_shard_count()
+
+            if self.info_manager["current_cycle_shards"] > 1:
+                self.get_shard_supervisor().split(self.get_tested_file().path)
+
+        self.start_part()
+
         logging.info("Starting PyFunceble %r ...", PyFunceble.__version__)
 
-        Command(f"pyfunceble -f {self.origin_file.path}").run_to_stdout()
+        progress_tracker = self.get_progress_tracker()
+
+        if self.info_manager["current_cycle_shards"] > 1:
+            self.run_sharded_test(progress_tracker)
+            return
+
+        engine = self.get_pyfunceble_engine(progress_tracker)
+        finished = False
+
+        try:
+            with LeaseKeeper():
+                engine.run("-f", self.get_tested_file().path)
+
+            finished = True
+        except CommandTimeoutError as exception:
+            logging.info("PyFunceble did not finish in time: %s", exception)
+        finally:
+            if progress_tracker:
+                progress_tracker.write(finished=True)
+
+            self.record_usage(engine, "test")
+
+        self.finish_part(finished)
+
+    def finish_part(self, finished: bool) -> "Orchestration":
+        """
+        Runs the end (or autosave) logic of the part which just ran - and
+        commits it under GitHub Actions.
+
+        PyFunceble never commits by itself: that way, what it consumed is
+        recorded before the commit.
+        """
 
         self.write_trigger()
-        if not dead_hosts.launcher.defaults.envs.GITHUB_TOKEN:
+
+        if dead_hosts.launcher.defaults.envs.GITHUB_TOKEN:
+            self.commit_test(finished)
+        elif finished:
             self.run_end()
+        else:
+            self.run_autosave()
+
+        return self
+
+    def run_sharded_test(self, progress_tracker: Optional[ProgressTracker] = None):
+        """
+        Run a test of the input list - with one PyFunceble process per shard.
+
+        As the shards don't commit anything, we take care of the autosave and
+        end logic ourselves.
+        """
+
+        supervisor = self.get_shard_supervisor(progress_tracker)
+        finished = False
+
+        try:
+            with LeaseKeeper():
+                finished = supervisor.start()
+        finally:
+            if progress_tracker:
+                progress_tracker.write(finished=True)
+
+            self.record_usage(supervisor, "test")
+
+        self.finish_part(finished)
+
+    def commit_test(self, finished: bool) -> "Orchestration":
+        """
+        Commits the state of a test. Just like PyFunceble would, the end (or
+        autosave) command is executed before committing.
+        """
+
+        try:
+            ci_engine = GitHubActions()
+            ci_engine.init()
+        except ContinuousIntegrationException as exception:
+            logging.critical("Could not initialize the CI engine: %s", exception)
+            return self
+
+        self.info_manager.store()
+
+        try:
+            if finished:
+                ci_engine.apply_end_commit()
+            else:
+                ci_engine.apply_commit()
+        except (StopExecution, ContinuousIntegrationException):
+            pass
+
+        return self
+
+    def run_matrix(self):
+        """
+        Prepares a test whose shards are tested by a matrix of GitHub Actions
+        jobs - and provides that matrix.
+
+        The matrix is written to the standard output and - under GitHub
+        Actions - as the :code:`matrix` output of the step. The
+        :code:`authorized` output tells whether there is anything to test.
+        """
+
+        authorized = self.authorization_handler.is_test_authorized()
+
+        if authorized:
+            PyFunceble.facility.ConfigLoader.start()
+            self.fetch_file_to_test()
+
+            if self.authorization_handler.is_skip_authorized(
+                self.info_manager["input_fingerprint"]
+            ):
+                self.run_postpone()
+                authorized = False
+
+        if authorized:
+            self.normalize_file_to_test()
+            self.prepare_incremental_test()
+
+            if not self.info_manager.currently_under_test:
+                self.start_cycle()
+                self.info_manager["current_cycle_matrix_shards"] = (
+                    self.get_matrix_shard_count()
+                )
+
+            self.start_part()
+            self.write_trigger()
+
+            try:
+                ci_engine = GitHubActions(
+                    commit_message="[Dead-Hosts::Infrastructure][Matrix]"
+                )
+                ci_engine.init()
+
+                self.info_manager.store()
+                ci_engine.apply_commit()
+            except (StopExecution, ContinuousIntegrationException):
+                pass
+
+        matrix = {
+            "include": [
+                {"shard_index": x}
+                for x in range(
+                    self.info_manager["current_cycle_matrix_shards"]
+                    if authorized
+                    else 0
+                )
+            ]
+        }
+
+        self.write_matrix(matrix, authorized)
+
+    def write_matrix(self, matrix: dict, authorized: bool) -> "Orchestration":
+        """
+        Writes the given matrix to the standard output and - under GitHub
+        Actions - to the outputs of the current step.
+        """
+
+        serialized = json.dumps(matrix, separators=(",", ":"))
+
+        print(serialized)
+
+        if dead_hosts.launcher.defaults.envs.GITHUB_OUTPUT:
+            with open(
+                dead_hosts.launcher.defaults.envs.GITHUB_OUTPUT, "a", encoding="utf-8"
+            ) as file_stream:
+                file_stream.write(f"matrix={serialized}\n")
+                file_stream.write(f"authorized={str(authorized).lower()}\n")
+
+        return self
+
+    def run_matrix_shard(self, index: int):
+        """
+        Tests the given shard of the test prepared by :py:meth:`run_matrix`.
+
+        Nothing is committed: the ACTIVE list of the shard - under
+        :code:`shards/<index>/output` - has to be collected by the workflow
+        and given to the end logic.
+        """
+
+        shards = self.info_manager["current_cycle_matrix_shards"]
+
+        if not self.info_manager.currently_under_test or not 0 <= index < shards:
+            logging.critical(
+                "Shard %r does not belong to the current test (%r shards).",
+                index,
+                shards,
+            )
+            sys.exit(1)
+
+        # Just like a normal test: the configuration directory is only
+        # populated by PyFunceble itself on the platform.
+        PyFunceble.facility.ConfigLoader.start()
+
+        supervisor = ShardSupervisor(
+            self.info_manager.WORKSPACE_DIR,
+            shards=shards,
+            config_dir=self.info_manager.pyfunceble_config_dir,
+            timeout=self.get_ci_timeout(),
+        )
+        supervisor.split_by_hash(self.get_tested_file().path, index)
+
+        logging.info("Starting PyFunceble %r ...", PyFunceble.__version__)
+
+        sys.stdout.flush()
+
+        try:
+            usage = supervisor.run_shard(
+                index, getattr(sys.stdout, "buffer", None)
+            ).usage
+        except CommandTimeoutError as exception:
+            # What a killed shard consumed is recorded all the same.
+            self.write_shard_usage(supervisor, index, exception.usage)
+            raise
+
+        self.write_shard_usage(supervisor, index, usage)
+
+    def write_shard_usage(
+        self, supervisor: ShardSupervisor, index: int, usage: Optional[dict]
+    ) -> "Orchestration":
+        """
+        Writes what the given shard of a matrix consumed next to its output.
+        """
+
+        if not usage:
+            return self
+
+        logging.info(
+            "Shard %d consumed %.1fs wall, %.1fs CPU and %d KiB max RSS.",
+            index,
+            usage["wall_seconds"],
+            usage["user_cpu_seconds"] + usage["system_cpu_seconds"],
+            usage["max_rss_kib"],
+        )
+
+        # The run history of the jobs isn't committed: the end logic
+        # collects the record along with the output.
+        write_atomically(
+            supervisor.get_usage_path(index),
+            json.dumps(
+                {**self.get_usage_record(usage, "shard"), "shard_index": index},
+                sort_keys=True,
+            ),
+        )
+
+        return self
+
+    def run_postpone(self):
+        """
+        Postpones the cycle we were about to start: its input did not change
+        since the last finished cycle.
+        """
+
+        logging.info(
+            "Input unchanged since the last finished cycle. Postponing the test."
+        )
+
+        ci_engine = None
+
+        try:
+            ci_engine = GitHubActions(
+                commit_message="[Dead-Hosts::Infrastructure][Postponed]"
+            )
+            ci_engine.init()
+        except ContinuousIntegrationException:
+            # Not under CI: the postponement is only stored.
+            ci_engine = None
+
+        self.info_manager["finish_datetime"] = datetime.utcnow()
+        self.info_manager["finish_timestamp"] = self.info_manager[
+            "finish_datetime"
+        ].timestamp()
+
+        self.info_manager.store()
+        self.write_trigger()
+
+        if ci_engine is not None:
+            try:
+                ci_engine.apply_commit()
+            except (StopExecution, ContinuousIntegrationException):
+                pass
+
+        LeaseKeeper.release_current()
 
     def run_autosave(self):
         """
@@ -275,15 +752,25 @@ class Orchestration:
             "latest_part_finish_datetime"
         ].timestamp()
 
+        self.record_part_duration()
+
         self.write_trigger()
 
         logging.info("Updated all timestamps.")
 
-    def run_end(self):
+        LeaseKeeper.release_current()
+
+    def run_end(self, shard_results: Optional[str] = None):
         """
         Run the end logic.
+
+        :param shard_results:
+            The directory holding the results of the shards tested by a
+            matrix of GitHub Actions jobs.
         """
 
+        was_under_test = self.info_manager.currently_under_test
+
         self.info_manager["currently_under_test"] = False
 
         self.info_manager["latest_part_finish_datetime"] = datetime.utcnow()
@@ -298,13 +785,49 @@ class Orchestration:
             "finish_datetime"
         ].timestamp()
 
+        self.record_part_duration()
+
+        if shard_results:
+            self.record_shard_usage(shard_results)
+
+        if was_under_test:
+            run_history = RunHistory(self.info_manager.WORKSPACE_DIR)
+            usage = run_history.summarize(
+                self.info_manager["start_datetime"].timestamp()
+            )
+
+            logging.info(
+                "Resources consumed by the %d recorded part(s): %.1fs wall, "
+                "%.1fs CPU (%.2f cores on average), %d KiB max RSS, "
+                "%d/%d (in)voluntary context switches.",
+                usage["parts"],
+                usage["wall_seconds"],
+                usage["cpu_seconds"],
+                usage["cpu_utilization"],
+                usage["max_rss_kib"],
+                usage["voluntary_context_switches"],
+                usage["involuntary_context_switches"],
+            )
+
+            self.info_manager.record_cycle(
+                start_timestamp=self.info_manager["start_datetime"].timestamp(),
+                finish_timestamp=self.info_manager["finish_timestamp"],
+                parts=self.info_manager["current_cycle_parts"],
+                busy_seconds=self.info_manager["current_cycle_busy_seconds"],
+                subjects=self.count_subjects(),
+                usage=usage,
+                input_fingerprint=self.info_manager["input_fingerprint"],
+            )
+
+            run_history.trim()
+
         logging.info("Updated all timestamps and indexes that needed to be updated.")
 
         pyfunceble_active_list = FileHelper(
             os.path.join(
                 self.info_manager.WORKSPACE_DIR,
                 "output",
-                dead_hosts.launcher.defaults.paths.ORIGIN_FILENAME,
+                os.path.basename(self.get_tested_file().path),
                 "domains",
                 "ACTIVE",
                 "list",
@@ -313,31 +836,352 @@ class Orchestration:
 
         logging.info("PyFunceble ACTIVE list output: %s", pyfunceble_active_list.path)
 
-        if pyfunceble_active_list.exists():
-            logging.info(
-                "%s exists, getting and formatting its content.",
-                pyfunceble_active_list.path,
+        if shard_results:
+            merge_active_lists(
+                find_active_lists(shard_results), pyfunceble_active_list.path
             )
+        elif was_under_test and self.info_manager["current_cycle_shards"] > 1:
+            self.get_shard_supervisor().merge(pyfunceble_active_list.path)
 
-            self.output_file.write(
-                "\n".join(dead_hosts.launcher.defaults.paths.OUTPUT_FILE_HEADER)
-                + "\n\n",
-                overwrite=True,
-            )
+        is_incremental_cycle = (
+            self.info_manager["tested_filename"]
+            == dead_hosts.launcher.defaults.paths.DELTA_FILENAME
+        )
+
+        if was_under_test and not is_incremental_cycle:
+            self.info_manager["last_full_test_timestamp"] = self.info_manager[
+                "finish_timestamp"
+            ]
+
+        delta_publisher = self.get_delta_publisher()
+
+        if delta_publisher:
+            delta_publisher.stage()
+
+        try:
+            if is_incremental_cycle:
+                self.incremental_test.write_output(
+                    pyfunceble_active_list.path, self.get_output_writer()
+                )
+            elif pyfunceble_active_list.exists():
+                logging.info(
+                    "%s exists, getting and formatting its content.",
+                    pyfunceble_active_list.path,
+                )
 
-            with pyfunceble_active_list.open("r", encoding="utf-8") as file_stream:
-                for line in file_stream:
-                    if line.startswith("#"):
-                        continue
+                self.get_output_writer().write([pyfunceble_active_list.path])
 
-                    self.output_file.write(line)
+                logging.info("Updated of the content of %r", self.output_file.path)
 
-            self.output_file.write("\n")
+            if delta_publisher:
+                delta_publisher.publish()
+        finally:
+            if delta_publisher:
+                # Don't keep the staged output around when the writer failed.
+                delta_publisher.discard()
 
-            logging.info("Updated of the content of %r", self.output_file.path)
+        if was_under_test and os.path.isfile(
+            self.incremental_test.pending_snapshot_path
+        ):
+            self.incremental_test.promote()
+            self.info_manager["snapshot_start_timestamp"] = self.info_manager[
+                "start_datetime"
+            ].timestamp()
 
         self.write_trigger()
 
+        LeaseKeeper.release_current()
+
+    def record_usage(
+        self, engine: Union[PyFuncebleEngine, ShardSupervisor], command: str
+    ) -> "Orchestration":
+        """
+        Appends what the given engine (or shards) consumed to the run history.
+        """
+
+        if not engine.usage:
+            return self
+
+        RunHistory(self.info_manager.WORKSPACE_DIR).append(
+            self.get_usage_record(engine.usage, command)
+        )
+
+        return self
+
+    def record_shard_usage(self, shard_results: str) -> "Orchestration":
+        """
+        Appends what the shards tested by a matrix of GitHub Actions jobs
+        consumed to the run history.
+
+        :param shard_results:
+            The directory holding the results of the shards.
+        """
+
+        run_history = RunHistory(self.info_manager.WORKSPACE_DIR)
+
+        for record in find_usage_records(shard_results):
+            run_history.append(record)
+
+        return self
+
+    def get_usage_record(self, usage: dict, command: str) -> dict:
+        """
+        Provides the run history record of the given usage.
+        """
+
+        return {
+            "command": command,
+            "cycle_start": self.info_manager["start_datetime"].timestamp(),
+            "part": self.info_manager["current_cycle_parts"],
+            "recorded_at": datetime.utcnow().timestamp(),
+            **usage,
+        }
+
+    def record_part_duration(self) -> "Orchestration":
+        """
+        Adds the duration of the latest part to the busy time of the
+        current cycle.
+        """
+
+        part_duration = (
+            self.info_manager["latest_part_finish_datetime"]
+            - self.info_manager["latest_part_start_datetime"]
+        ).total_seconds()
+
+        if part_duration > 0:
+            self.info_manager["current_cycle_busy_seconds"] += part_duration
+
+        return self
+
+    def get_pyfunceble_engine(
+        self, progress_tracker: Optional[ProgressTracker] = None
+    ) -> PyFuncebleEngine:
+        """
+        Provides the engine to start PyFunceble with.
+
+        Under GitHub Actions, we commit the results ourselves. PyFunceble's
+        continuous integration is therefore disabled - through the absence of
+        :code:`GITHUB_ACTIONS` - and it stops before our execution time ends.
+        """
+
+        mode = dead_hosts.launcher.defaults.envs.PYFUNCEBLE_ENGINE or (
+            self.info_manager.content.get(
+                "pyfunceble_engine",
+                dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE,
+            )
+        )
+        subscribers = [progress_tracker] if progress_tracker else None
+
+        if dead_hosts.launcher.defaults.envs.GITHUB_TOKEN:
+            return PyFuncebleEngine(
+                mode,
+                timeout=self.get_ci_timeout(),
+                subscribers=subscribers,
+                env={x: y for x, y in os.environ.items() if x != "GITHUB_ACTIONS"},
+            )
+
+        return PyFuncebleEngine(
+            mode, timeout=self.get_test_timeout(), subscribers=subscribers
+        )
+
+    def get_shard_count(self) -> int:
+        """
+        Provides the number of shards (and PyFunceble processes) to test the
+        input with.
+        """
+
+        try:
+            shards = int(
+                dead_hosts.launcher.defaults.envs.SHARDS
+                or self.info_manager.content.get("shards", 1)
+            )
+        except (TypeError, ValueError):
+            return 1
+
+        return max(shards, 1)
+
+    def get_output_writer(self) -> OutputWriter:
+        """
+        Provides the writer of our outputs.
+        """
+
+        return OutputWriter(
+            self.output_file.path,
+            dead_hosts.launcher.defaults.paths.OUTPUT_FILE_HEADER,
+            sort=self.info_manager["sort_output"] is True,
+            formats=get_format_destinations(
+                self.info_manager.WORKSPACE_DIR, self.info_manager["output_formats"]
+            ),
+            compressions=get_compressions(self.info_manager["output_compressions"]),
+        )
+
+    def get_matrix_shard_count(self) -> int:
+        """
+        Provides the number of shards (and GitHub Actions jobs) to test the
+        input with.
+        """
+
+        try:
+            shards = int(
+                dead_hosts.launcher.defaults.envs.MATRIX_SHARDS
+                or self.info_manager.content.get("matrix_shards", 1)
+            )
+        except (TypeError, ValueError):
+            return 1
+
+        return max(shards, 1)
+
+    def get_delta_publisher(self) -> Optional[DeltaPublisher]:
+        """
+        Provides the publisher of the deltas of our output - if enabled.
+        """
+
+        if not self.info_manager["publish_deltas"]:
+            return None
+
+        return DeltaPublisher(
+            self.output_file.path,
+            os.path.join(
+                self.info_manager.WORKSPACE_DIR,
+                dead_hosts.launcher.defaults.paths.DELTAS_DIRNAME,
+            ),
+            history=self.info_manager["delta_history"],
+        )
+
+    def get_shard_supervisor(
+        self, progress_tracker: Optional[ProgressTracker] = None
+    ) -> ShardSupervisor:
+        """
+        Provides the supervisor of the shards of the current cycle.
+        """
+
+        return ShardSupervisor(
+            self.info_manager.WORKSPACE_DIR,
+            shards=self.info_manager["current_cycle_shards"],
+            config_dir=self.info_manager.pyfunceble_config_dir,
+            timeout=self.get_ci_timeout(),
+            subscribers=[progress_tracker] if progress_tracker else None,
+        )
+
+    def get_progress_tracker(self) -> Optional[ProgressTracker]:
+        """
+        Provides the tracker of the progress of the current part - if
+        enabled.
+        """
+
+        if dead_hosts.launcher.defaults.envs.PROGRESS_TRACKING is not None:
+            enabled = dead_hosts.launcher.defaults.envs.PROGRESS_TRACKING.lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        else:
+            enabled = self.info_manager.content.get("progress_tracking") is True
+
+        if not enabled:
+            return None
+
+        return ProgressTracker(
+            os.path.join(
+                self.info_manager.WORKSPACE_DIR,
+                dead_hosts.launcher.defaults.paths.PROGRESS_FILENAME,
+            ),
+            # Only the first part tests the whole file.
+            total=(
+                self.count_subjects()
+                if self.info_manager["current_cycle_parts"] == 1
+                else None
+            ),
+        )
+
+    @staticmethod
+    def get_test_timeout() -> Optional[float]:
+        """
+        Provides the wall-clock number of seconds a test run may take.
+        """
+
+        try:
+            timeout = float(dead_hosts.launcher.defaults.envs.TEST_TIMEOUT)
+        except (TypeError, ValueError):
+            return None
+
+        return timeout if timeout > 0 else None
+
+    def get_ci_timeout(self) -> Optional[float]:
+        """
+        Provides the wall-clock number of seconds PyFunceble may run when we -
+        instead of PyFunceble - take care of the continuous integration.
+
+        Unless a test timeout is given, PyFunceble therefore stops before the
+        execution time of our continuous integration ends - so that we can
+        save its results.
+        """
+
+        timeout = self.get_test_timeout()
+
+        if timeout is not None or not PyFunceble.storage.CONFIGURATION:
+            return timeout
+
+        ci_config = PyFunceble.storage.CONFIGURATION.get("cli_testing", {}).get(
+            "ci", {}
+        )
+
+        if not ci_config.get("active"):
+            return None
+
+        try:
+            max_exec_seconds = float(ci_config.get("max_exec_minutes")) * 60
+        except (TypeError, ValueError):
+            return None
+
+        return max(
+            max_exec_seconds
+            - dead_hosts.launcher.defaults.pyfunceble.CI_TIMEOUT_MARGIN,
+            max_exec_seconds / 2,
+        )
+
+    def get_input_fingerprint(self) -> Optional[str]:
+        """
+        Provides the fingerprint (SHA256) of the subjects of the file we test.
+
+        Blank lines, comments and surrounding whitespaces don't influence it.
+        """
+
+        if not self.origin_file.exists():
+            return None
+
+        fingerprint = hashlib.sha256()
+
+        with self.origin_file.open("rb") as file_stream:
+            for line in file_stream:
+                line = line.strip()
+
+                if line and not line.startswith(b"#"):
+                    fingerprint.update(line + b"\n")
+
+        return fingerprint.hexdigest()
+
+    def count_subjects(self) -> int:
+        """
+        Provides the number of subjects of the file we test.
+        """
+
+        tested_file = self.get_tested_file()
+
+        if not tested_file.exists():
+            return 0
+
+        count = 0
+
+        with tested_file.open("rb") as file_stream:
+            for line in file_stream:
+                line = line.strip()
+
+                if line and not line.startswith(b"#"):
+                    count += 1
+
+        return count
+
     def _fetch_workflows(self, token, repo):
         headers = {
             "Accept": "application/vnd.github+json",
@@ -0,0 +1,653 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the writer of our output files.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import functools
+import gzip
+import hashlib
+import itertools
+import logging
+import lzma
+import os
+import queue
+import re
+import threading
+import time
+from contextlib import ExitStack
+from typing import IO, Dict, Iterable, Iterator, List, Optional
+
+import dead_hosts.launcher.defaults.outputs
+from dead_hosts.launcher.atomic import atomic_open
+from dead_hosts.launcher.normalization import read_canonical
+from dead_hosts.launcher.sorting import DEFAULT_MEMORY_LIMIT, sort_unique
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+COMMENT_LINE_REGEX = re.compile(rb"^#[^\n]*(?:\n|\Z)", re.MULTILINE)
+SUBJECT_LINE_REGEX = re.compile(rb"^[^\S\n]*(\S+)", re.MULTILINE)
+
+
+def iter_line_blocks(path: str, block_size: int) -> Iterator[bytes]:
+    """
+    Provides the content of the given file in blocks of (about) the given
+    size. A block always ends at the end of a line - except the last one if
+    the file doesn't end with a new line.
+    """
+
+    remainder = b""
+
+    with open(path, "rb") as file_stream:
+        while True:
+            block = file_stream.read(block_size)
+
+            if not block:
+                break
+
+            block = remainder + block
+            end = block.rfind(b"\n") + 1
+
+            if not end:
+                remainder = block
+                continue
+
+            remainder = block[end:]
+            yield block[:end]
+
+    if remainder:
+        yield remainder
+
+
+def iter_joined_lines(lines: Iterable[bytes], block_size: int) -> Iterator[bytes]:
+    """
+    Provides the given lines - joined in blocks of (about) the given size.
+    """
+
+    block: List[bytes] = []
+    size = 0
+
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+
+        if size >= block_size:
+            yield b"\n".join(block) + b"\n"
+
+            block.clear()
+            size = 0
+
+    if block:
+        yield b"\n".join(block) + b"\n"
+
+
+def strip_comment_lines(block: bytes) -> bytes:
+    """
+    Removes the comment lines of the given block.
+    """
+
+    if b"#" not in block:
+        return block
+
+    return COMMENT_LINE_REGEX.sub(b"", block)
+
+
+def get_subjects(block: bytes) -> List[bytes]:
+    """
+    Provides the subject - the first field - of every non-blank line of the
+    given block.
+    """
+
+    if (
+        block.endswith(b"\n")
+        and not block.startswith(b"\n")
+        and b"\n\n" not in block
+        and not any(x in block for x in (b" ", b"\t", b"\r"))
+    ):
+        # One subject per line - the usual case - we don't need to look into
+        # the lines.
+        return block[:-1].split(b"\n")
+
+    return SUBJECT_LINE_REGEX.findall(block)
+
+
+def format_subjects(subjects: List[bytes], template: str) -> bytes:
+    """
+    Writes every given subject with the given template - one line (or more)
+    per subject.
+    """
+
+    if not subjects:
+        return b""
+
+    parts = template.encode("utf-8").split(b"{subject}")
+
+    if len(parts) == 2:
+        return (
+            parts[0] + (parts[1] + b"\n" + parts[0]).join(subjects) + parts[1] + b"\n"
+        )
+
+    line = b"%s".join(x.replace(b"%", b"%%") for x in parts) + b"\n"
+
+    return b"".join([line % ((x,) * (len(parts) - 1)) for x in subjects])
+
+
+def get_body_digest(path: str, header_size: int) -> Optional[bytes]:
+    """
+    Provides the SHA256 of the given file - without its header of the given
+    number of lines.
+
+    :return:
+        :py:data:`None` when the file doesn't exist.
+    """
+
+    digest = hashlib.sha256()
+
+    try:
+        with open(path, "rb") as file_stream:
+            for _ in range(header_size):
+                file_stream.readline()
+
+            for block in iter(functools.partial(file_stream.read, 1024 * 1024), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+
+    return digest.digest()
+
+
+def get_format_destinations(directory: str, formats: Iterable[str]) -> Dict[str, str]:
+    """
+    Provides the file of each of the given formats. Unknown formats are
+    ignored.
+    """
+
+    result = {}
+
+    for name in formats:
+        if name not in dead_hosts.launcher.defaults.outputs.FORMATS:
+            logging.critical("Unknown output format: %r. Ignored.", name)
+            continue
+
+        result[name] = os.path.join(
+            directory, dead_hosts.launcher.defaults.outputs.FORMATS[name]["filename"]
+        )
+
+    return result
+
+
+def get_compressions(compressions: Iterable[str]) -> List[str]:
+    """
+    Provides the given compressions - without the unknown or unavailable
+    ones.
+    """
+
+    result = []
+
+    for name in compressions:
+        if name not in dead_hosts.launcher.defaults.outputs.COMPRESSIONS:
+            logging.critical("Unknown output compression: %r. Ignored.", name)
+            continue
+
+        if name == "zst" and zstandard is None:
+            logging.critical(
+                "The zstandard package is not installed, %r outputs not written.",
+                name,
+            )
+            continue
+
+        result.append(name)
+
+    return result
+
+
+def open_compressor(stream: IO, compression: str) -> IO:
+    """
+    Provides a file object which writes the given compression into the given
+    stream.
+
+    The archives only depend on their content: the same content always gives
+    the same archive.
+    """
+
+    level = dead_hosts.launcher.defaults.outputs.COMPRESSIONS[compression]["level"]
+
+    if compression == "gz":
+        # Neither the name of the (temporary) file nor the time in the header.
+        return gzip.GzipFile(
+            filename="", mode="wb", compresslevel=level, fileobj=stream, mtime=0
+        )
+
+    if compression == "xz":
+        return lzma.LZMAFile(stream, "wb", preset=level)
+
+    return zstandard.ZstdCompressor(level=level).stream_writer(stream, closefd=False)
+
+
+class CompressingWriter:
+    """
+    Compresses what is written into it into the given stream - in a thread
+    of its own. That way, the compression of each output happens alongside
+    the writing of the others instead of after it.
+
+    :param stream:
+        The stream to write the archive into. It is left open.
+    :param compression:
+        The compression to use.
+    :param queue_size:
+        The number of blocks which may wait for their compression.
+    """
+
+    def __init__(self, stream: IO, compression: str, *, queue_size: int = 4) -> None:
+        self.compressor = open_compressor(stream, compression)
+        self.blocks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_size)
+        self.error: Optional[Exception] = None
+
+        self.thread = threading.Thread(target=self.compress, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "CompressingWriter":
+        return self
+
+    def __exit__(self, exception_type, *_) -> None:
+        self.blocks.put(None)
+        self.thread.join()
+
+        if exception_type is None and self.error is not None:
+            raise self.error
+
+    def compress(self) -> None:
+        """
+        Compresses the written blocks until the writer is closed.
+        """
+
+        for block in iter(self.blocks.get, None):
+            if self.error is not None:
+                # We still consume the blocks, so that the writes never block.
+                continue
+
+            try:
+                self.compressor.write(block)
+            except Exception as exception:  # pylint: disable=broad-except
+                self.error = exception
+
+        try:
+            self.compressor.close()
+        except Exception as exception:  # pylint: disable=broad-except
+            self.error = self.error or exception
+
+    def write(self, block: bytes) -> int:
+        """
+        Hands the given block over to the compression.
+        """
+
+        if self.error is not None:
+            raise self.error
+
+        self.blocks.put(block)
+
+        return len(block)
+
+
+class NothingToWrite(Exception):
+    """
+    Raised to abort a write which would produce an output without any line.
+    """
+
+
+class OutputUnchanged(Exception):
+    """
+    Raised to abort a write which would only change the header of the
+    outputs.
+    """
+
+
+class OutputWriter:
+    """
+    Writes an output file - like :code:`clean.list` - and its other formats
+    from the given source files in a single pass.
+
+    The sources are read and filtered in large blocks. Each block is written
+    through a single buffered handle per output into a temporary file - next
+    to the output - which replaces the output once all of them are complete.
+
+    When all the outputs exist and only their header - the generation time
+    or the serial - would change, none of them is replaced. That way, the
+    outputs (and their archives) only change along with their subjects.
+
+    :param destination:
+        The file to write.
+    :param header:
+        The lines to write at the top of the file.
+    :param block_size:
+        The size of the blocks to read.
+    :param sort:
+        Writes the canonical form of the lines - sorted and deduplicated -
+        instead of copying them. That way, two consecutive outputs only
+        differ by the subjects which really changed.
+    :param memory_limit:
+        The memory (in bytes) the sorting may use before spilling to the
+        disk.
+    :param formats:
+        The other formats to write - and their file.
+    :param compressions:
+        The compressed versions to write next to each output.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        destination: str,
+        header: Optional[List[str]] = None,
+        *,
+        block_size: int = 1024 * 1024,
+        sort: bool = False,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        formats: Optional[Dict[str, str]] = None,
+        compressions: Optional[List[str]] = None,
+    ) -> None:
+        self.destination = destination
+        self.header = header or []
+        self.block_size = block_size
+        self.sort = sort
+        self.memory_limit = memory_limit
+        self.formats = formats or {}
+        self.compressions = compressions or []
+
+    def get_header(self, format_name: Optional[str] = None) -> bytes:
+        """
+        Provides the header of the given format - or of the main output.
+        """
+
+        if not format_name:
+            return (
+                "\n".join(self.header).encode("utf-8") + b"\n\n" if self.header else b""
+            )
+
+        settings = dead_hosts.launcher.defaults.outputs.FORMATS[format_name]
+
+        lines = [x.format(serial=int(time.time())) for x in settings["header"]] + [
+            settings["comment"] + x.lstrip("#") for x in self.header
+        ]
+
+        return "\n".join(lines).encode("utf-8") + b"\n\n" if lines else b""
+
+    def iter_blocks(self, sources: Iterable[str]) -> Iterator[bytes]:
+        """
+        Provides the non-comment lines of the given sources - in blocks.
+
+        The blocks are given as they are read: the last line of a source which
+        doesn't end with a new line is only terminated when another line
+        follows it.
+        """
+
+        unterminated = b""
+
+        for source in sources:
+            for block in iter_line_blocks(source, self.block_size):
+                block = strip_comment_lines(block)
+
+                if not block:
+                    continue
+
+                if unterminated:
+                    # The last line of the previous source.
+                    yield unterminated + b"\n"
+                    unterminated = b""
+
+                if block.endswith(b"\n"):
+                    yield block
+                else:
+                    unterminated = block
+
+        if unterminated:
+            yield unterminated
+
+    def iter_sorted_blocks(self, sources: Iterable[str]) -> Iterator[bytes]:
+        """
+        Provides the canonical subjects of the given sources - sorted,
+        deduplicated and in blocks.
+        """
+
+        return iter_joined_lines(
+            sort_unique(
+                itertools.chain.from_iterable(read_canonical(x) for x in sources),
+                memory_limit=self.memory_limit,
+                directory=os.path.dirname(os.path.abspath(self.destination)),
+            ),
+            self.block_size,
+        )
+
+    def write(
+        self,
+        sources: Iterable[str],
+        *,
+        keep_empty: bool = True,
+        trailing_new_line: bool = True,
+    ) -> int:
+        """
+        Writes the non-comment lines of the given sources into the outputs.
+
+        :param keep_empty:
+            When :py:data:`False`, the outputs are only replaced if at least
+            one line was written.
+        :param trailing_new_line:
+            When :py:data:`False`, the outputs end with their last line -
+            instead of an empty one.
+
+        :return:
+            The number of written lines.
+        """
+
+        return self.write_blocks(
+            (
+                self.iter_sorted_blocks(sources)
+                if self.sort
+                else self.iter_blocks(sources)
+            ),
+            keep_empty=keep_empty,
+            trailing_new_line=trailing_new_line,
+        )
+
+    def open_output(
+        self, stack: ExitStack, destination: str, format_name: Optional[str] = None
+    ) -> List[IO]:
+        """
+        Opens the given output - and its compressed versions - and writes
+        their header.
+
+        The outputs are closed (and replaced) along with the given stack.
+        """
+
+        outputs = [
+            stack.enter_context(
+                atomic_open(destination, "wb", buffering=self.block_size)
+            )
+        ]
+
+        for name in self.compressions:
+            extension = dead_hosts.launcher.defaults.outputs.COMPRESSIONS[name][
+                "extension"
+            ]
+
+            outputs.append(
+                stack.enter_context(
+                    CompressingWriter(
+                        stack.enter_context(
+                            atomic_open(
+                                destination + extension,
+                                "wb",
+                                buffering=self.block_size,
+                            )
+                        ),
+                        name,
+                    )
+                )
+            )
+
+        header = self.get_header(format_name)
+
+        for output in outputs:
+            output.write(header)
+
+        return outputs
+
+    def is_unchanged(self, digests: Dict[Optional[str], "hashlib._Hash"]) -> bool:
+        """
+        Checks if the outputs - and their compressed versions - exist and
+        already hold the content of the given digests.
+
+        :param digests:
+            The digest of the content (without header) of each format - or of
+            the main output.
+        """
+
+        for format_name, digest in digests.items():
+            destination = self.formats[format_name] if format_name else self.destination
+
+            if not all(
+                os.path.isfile(
+                    destination
+                    + dead_hosts.launcher.defaults.outputs.COMPRESSIONS[x]["extension"]
+                )
+                for x in self.compressions
+            ):
+                return False
+
+            if (
+                get_body_digest(destination, self.get_header(format_name).count(b"\n"))
+                != digest.digest()
+            ):
+                return False
+
+        return True
+
+    def write_blocks(
+        self,
+        blocks: Iterable[bytes],
+        *,
+        keep_empty: bool = True,
+        trailing_new_line: bool = True,
+    ) -> int:
+        """
+        Writes the given blocks of lines into the outputs.
+
+        :param keep_empty:
+            When :py:data:`False`, the outputs are only replaced if at least
+            one line was written.
+        :param trailing_new_line:
+            When :py:data:`False`, the outputs end with their last line -
+            instead of an empty one.
+
+        :return:
+            The number of written lines.
+        """
+
+        written = 0
+
+        try:
+            with ExitStack() as stack:
+                outputs = self.open_output(stack, self.destination)
+
+                format_outputs = {
+                    x: self.open_output(stack, y, x) for x, y in self.formats.items()
+                }
+
+                digests = {
+                    x: hashlib.sha256() for x in itertools.chain([None], format_outputs)
+                }
+
+                for block in blocks:
+                    for output in outputs:
+                        output.write(block)
+
+                    digests[None].update(block)
+                    # The last line may not be terminated.
+                    written += block.count(b"\n") + (not block.endswith(b"\n"))
+
+                    if not format_outputs:
+                        continue
+
+                    subjects = get_subjects(block)
+
+                    for name, streams in format_outputs.items():
+                        formatted = format_subjects(
+                            subjects,
+                            dead_hosts.launcher.defaults.outputs.FORMATS[name][
+                                "template"
+                            ],
+                        )
+
+                        for output in streams:
+                            output.write(formatted)
+
+                        digests[name].update(formatted)
+
+                if not written and not keep_empty:
+                    raise NothingToWrite()
+
+                if trailing_new_line:
+                    for output in outputs:
+                        output.write(b"\n")
+
+                    digests[None].update(b"\n")
+
+                if self.is_unchanged(digests):
+                    raise OutputUnchanged()
+        except NothingToWrite:
+            logging.info("Nothing to write, %r not replaced.", self.destination)
+            return 0
+        except OutputUnchanged:
+            logging.info(
+                "Subjects unchanged, %r not replaced.",
+                [self.destination] + list(self.formats.values()),
+            )
+            return written
+
+        logging.info(
+            "Wrote %d line(s) into %r.",
+            written,
+            [self.destination] + list(self.formats.values()),
+        )
+
+        if self.compressions:
+            logging.info(
+                "Compressed them as %r.",
+                self.compressions,
+            )
+
+        return written
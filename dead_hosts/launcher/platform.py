@@ -44,10 +44,14 @@ from typing import Optional
 
 import requests
 from PyFunceble.helpers.environment_variable import EnvironmentVariableHelper
-from PyFunceble.helpers.file import FileHelper
 
 import dead_hosts.launcher.defaults.paths
 from dead_hosts.launcher.info_manager import InfoManager
+from dead_hosts.launcher.output import (
+    OutputWriter,
+    get_compressions,
+    get_format_destinations,
+)
 
 
 class PlatformOrchestration:
@@ -972,44 +976,25 @@ class PlatformOrchestration:
 
         logging.info("Starting to merge the downloaded files.")
 
-        # pylint: disable=consider-using-with
-        temp_output_file = tempfile.NamedTemporaryFile(
-            mode="w", delete=False, suffix="_output"
-        )
-
-        output_file = FileHelper(
+        # Unlike the end of a test, the merge never ended with an empty line.
+        OutputWriter(
             os.path.join(
                 self.info_manager.WORKSPACE_DIR,
                 dead_hosts.launcher.defaults.paths.OUTPUT_FILENAME,
-            )
-        )
-
-        temp_output_file.write(
-            "\n".join(dead_hosts.launcher.defaults.paths.OUTPUT_FILE_HEADER) + "\n\n"
-        )
-
-        written = False
-
-        for file in files:
-            file = FileHelper(file)
-
-            with file.open("r", encoding="utf-8") as file_stream:
-                for line in file_stream:
-                    if line.startswith("#"):
-                        continue
-
-                    temp_output_file.write(line)
-                    written = True
-
-        temp_output_file.seek(0)
+            ),
+            dead_hosts.launcher.defaults.paths.OUTPUT_FILE_HEADER,
+            sort=self.info_manager.content.get("sort_output") is True,
+            formats=get_format_destinations(
+                self.info_manager.WORKSPACE_DIR,
+                self.info_manager.content.get("output_formats") or [],
+            ),
+            compressions=get_compressions(
+                self.info_manager.content.get("output_compressions") or []
+            ),
+        ).write(files, keep_empty=False, trailing_new_line=False)
 
         logging.info("Finished to merge the downloaded files.")
 
-        if written:
-            logging.info("Moving the merged file to its final destination.")
-            FileHelper(temp_output_file.name).move(output_file.path)
-            logging.info("Moved the merged file to its final destination.")
-
         logging.info("Cleaning up temporary files.")
         for file in files:
             os.remove(file)
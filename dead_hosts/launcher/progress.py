@@ -0,0 +1,181 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the live progress tracking of a PyFunceble run.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import collections
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from dead_hosts.launcher.atomic import atomic_open
+
+
+class ProgressTracker:
+    """
+    Follows the (stdout) lines of a PyFunceble run, counts the tested
+    subjects and periodically writes the counters into a small JSON file.
+
+    An instance is meant to be subscribed to a
+    :class:`~dead_hosts.launcher.command.Command`.
+
+    :param path:
+        The file to write the progress into.
+    :param total:
+        The number of subjects we expect to test, if known.
+    :param interval:
+        The minimum number of seconds between two writes.
+    :param window:
+        The number of seconds the moving rate is computed over.
+    """
+
+    STATUSES: List[str] = [
+        "ACTIVE",
+        "INACTIVE",
+        "INVALID",
+        "VALID",
+        "SANE",
+        "MALICIOUS",
+    ]
+
+    # The subject, then its status - after some optional colors and dots.
+    LINE_REGEX = re.compile(
+        r"^(?:\x1b\[[0-9;]*m|[.S])*\S+\s+(" + "|".join(STATUSES) + r")(?:\s|\x1b|$)"
+    )
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        total: Optional[int] = None,
+        interval: float = 5.0,
+        window: float = 60.0,
+    ) -> None:
+        self.path = path
+        self.total = total
+        self.interval = interval
+        self.window = window
+
+        self.tested: int = 0
+        self.statuses: Dict[str, int] = {x: 0 for x in self.STATUSES}
+
+        # The number of subjects tested per second, for the last seconds.
+        self.buckets: Deque[List[int]] = collections.deque()
+
+        self.started_at = time.monotonic()
+        self.started_datetime = datetime.utcnow()
+        self.written_at: float = 0.0
+
+    def __call__(self, line: str) -> None:
+        matched = self.LINE_REGEX.match(line)
+
+        if matched:
+            self.tested += 1
+            self.statuses[matched.group(1)] += 1
+
+            second = int(time.monotonic())
+
+            if self.buckets and self.buckets[-1][0] == second:
+                self.buckets[-1][1] += 1
+            else:
+                self.buckets.append([second, 1])
+
+        if time.monotonic() - self.written_at >= self.interval:
+            self.write()
+
+    def get_window_rate(self) -> float:
+        """
+        Provides the number of subjects tested per second, over the moving
+        window.
+        """
+
+        now = time.monotonic()
+
+        while self.buckets and self.buckets[0][0] < now - self.window:
+            self.buckets.popleft()
+
+        elapsed = min(self.window, now - self.started_at)
+
+        if elapsed <= 0:
+            return 0.0
+
+        return sum(x[1] for x in self.buckets) / elapsed
+
+    def get_progress(self, *, finished: bool = False) -> dict:
+        """
+        Provides the current progress.
+        """
+
+        elapsed = time.monotonic() - self.started_at
+        window_rate = self.get_window_rate()
+
+        progress = {
+            "started_at": self.started_datetime.timestamp(),
+            "updated_at": datetime.utcnow().timestamp(),
+            "elapsed_seconds": elapsed,
+            "tested": self.tested,
+            "statuses": self.statuses,
+            "subjects_per_second": self.tested / elapsed if elapsed > 0 else 0.0,
+            "window_seconds": self.window,
+            "window_subjects_per_second": window_rate,
+            "total": self.total,
+            "eta_seconds": None,
+            "finished": finished,
+        }
+
+        if self.total is not None and window_rate > 0 and not finished:
+            progress["eta_seconds"] = max(self.total - self.tested, 0) / window_rate
+
+        return progress
+
+    def write(self, *, finished: bool = False) -> "ProgressTracker":
+        """
+        Writes the current progress.
+        """
+
+        self.written_at = time.monotonic()
+
+        try:
+            # Not worth a sync: the next write is only a few seconds away.
+            with atomic_open(self.path, "w", fsync=False) as file_stream:
+                json.dump(self.get_progress(finished=finished), file_stream, indent=4)
+        except OSError as exception:
+            logging.critical("Could not write %r: %s", self.path, exception)
+
+        return self
@@ -0,0 +1,619 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the identity of the repository we are working with.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import binascii
+import configparser
+import functools
+import glob
+import json
+import logging
+import os
+import struct
+import subprocess
+import urllib.parse
+import zlib
+from typing import Optional, Tuple
+
+# The types of the objects of a pack file.
+PACK_OBJECT_TYPES = {1: b"commit", 2: b"tree", 3: b"blob", 4: b"tag"}
+PACK_OFS_DELTA = 6
+PACK_REF_DELTA = 7
+
+
+def find_git_dir(start: Optional[str] = None) -> Optional[str]:
+    """
+    Provides the path to the git directory of the repository containing the
+    given (or current) directory - the same way git would discover it.
+
+    :param start:
+        The directory to start the lookup from.
+    """
+
+    current = os.path.abspath(start or os.getcwd())
+
+    while True:
+        candidate = os.path.join(current, ".git")
+
+        if os.path.isdir(candidate):
+            return candidate
+
+        if os.path.isfile(candidate):
+            # Worktrees and submodules: the .git file points to the real location.
+            with open(candidate, "r", encoding="utf-8") as file_stream:
+                content = file_stream.read().strip()
+
+            if content.startswith("gitdir:"):
+                git_dir = content[len("gitdir:") :].strip()
+
+                return os.path.normpath(os.path.join(current, git_dir))
+
+        parent = os.path.dirname(current)
+
+        if parent == current:
+            return None
+
+        current = parent
+
+
+def get_common_dir(git_dir: str) -> str:
+    """
+    Provides the directory holding the shared data (config, objects, refs) of
+    the given git directory.
+    """
+
+    commondir_file = os.path.join(git_dir, "commondir")
+
+    if os.path.isfile(commondir_file):
+        with open(commondir_file, "r", encoding="utf-8") as file_stream:
+            return os.path.normpath(os.path.join(git_dir, file_stream.read().strip()))
+
+    return git_dir
+
+
+def parse_config_value(value: str) -> str:
+    """
+    Provides the given raw value of the git configuration - the way git reads
+    it: without its inline comment (:code:`;` or :code:`#` outside of double
+    quotes), its double quotes and its surrounding whitespaces.
+    """
+
+    result = []
+    quoted = False
+    escaped = False
+
+    for char in value:
+        if escaped:
+            result.append({"n": "\n", "t": "\t", "b": "\b"}.get(char, char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif char in ";#" and not quoted:
+            break
+        else:
+            result.append(char)
+
+    return "".join(result).strip()
+
+
+def read_remote_url_from_config(git_dir: str, remote: str = "origin") -> Optional[str]:
+    """
+    Reads the URL of the given remote from the git configuration file.
+
+    :return:
+        :py:class:`None` when the configuration can't be trusted to give the
+        same answer as git - e.g. when URL rewriting or includes are involved.
+    """
+
+    config_file = os.path.join(get_common_dir(git_dir), "config")
+
+    if not os.path.isfile(config_file):
+        return None
+
+    # Strict: git uses the first of several values (or sections) - which the
+    # parser wouldn't tell us. We let git answer those.
+    parser = configparser.ConfigParser(strict=True, interpolation=None)
+
+    try:
+        parser.read(config_file, encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+
+    for section in parser.sections():
+        lowered = section.lower()
+
+        if lowered.startswith("url ") or lowered.startswith("include"):
+            return None
+
+    section = f'remote "{remote}"'
+
+    if not parser.has_option(section, "url"):
+        return None
+
+    return parse_config_value(parser.get(section, "url")) or None
+
+
+def run_git(*args: str) -> str:
+    """
+    Runs git with the given arguments and provides its output.
+
+    .. note::
+        Like :meth:`PyFunceble.helpers.command.CommandHelper.execute`, an empty
+        string is given back when git fails. We don't go through it because
+        importing PyFunceble is way more expensive than the git call itself.
+    """
+
+    try:
+        process = subprocess.run(
+            ["git", *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=os.environ,
+            check=False,
+        )
+    except OSError:
+        return ""
+
+    if process.returncode != 0:
+        return ""
+
+    return process.stdout.decode("utf-8", errors="replace")
+
+
+def read_remote_url_from_git(remote: str = "origin") -> str:
+    """
+    Reads the URL of the given remote by asking git.
+    """
+
+    return run_git("remote", "get-url", remote).strip()
+
+
+def read_last_commit_from_git() -> str:
+    """
+    Reads the last commit (:code:`git log -1`) by asking git.
+    """
+
+    return run_git("log", "-1")
+
+
+def parse_repository_base(url: str) -> str:
+    """
+    Provides the :code:`owner/name` part of the given remote URL.
+    """
+
+    parsed_url = urllib.parse.urlparse(url)
+
+    if not parsed_url.netloc:
+        base = parsed_url.path.split(":", 1)[-1]
+    else:
+        base = parsed_url.path[1:]
+
+    if base.endswith(".git"):
+        base = base[:-4]
+
+    return base
+
+
+def read_repository_base_of(directory: str) -> Optional[str]:
+    """
+    Provides the :code:`owner/name` of the repository containing the given
+    directory - from its git configuration file only.
+    """
+
+    git_dir = find_git_dir(directory)
+    remote_url = read_remote_url_from_config(git_dir) if git_dir else None
+
+    if remote_url is None:
+        return None
+
+    return parse_repository_base(remote_url)
+
+
+@functools.lru_cache(maxsize=None)
+def get_remote_url() -> str:
+    """
+    Provides the URL of the :code:`origin` remote.
+
+    The git configuration file is read directly; git is only spawned when the
+    configuration file can't give us a trustworthy answer.
+    """
+
+    git_dir = find_git_dir()
+    remote_url = read_remote_url_from_config(git_dir) if git_dir else None
+
+    if remote_url is None:
+        logging.debug("Could not read the remote URL from config, asking git.")
+        remote_url = read_remote_url_from_git()
+
+    return remote_url
+
+
+@functools.lru_cache(maxsize=None)
+def get_repository_base() -> str:
+    """
+    Provides the :code:`owner/name` of the repository we are working with.
+    """
+
+    if os.environ.get("GITHUB_ACTIONS") and "/" in os.environ.get(
+        "GITHUB_REPOSITORY", ""
+    ):
+        return os.environ["GITHUB_REPOSITORY"]
+
+    return parse_repository_base(get_remote_url())
+
+
+def get_repository_name() -> str:
+    """
+    Provides the name of the repository we are working with.
+    """
+
+    return get_repository_base().split("/", 1)[-1]
+
+
+def get_repository_owner() -> str:
+    """
+    Provides the owner of the repository we are working with.
+    """
+
+    return get_repository_base().split("/", 1)[0]
+
+
+def resolve_ref(git_dir: str, ref: str, depth: int = 0) -> Optional[str]:
+    """
+    Resolves the given reference (e.g. :code:`HEAD`) into an object ID.
+    """
+
+    if depth > 5:
+        return None
+
+    common_dir = get_common_dir(git_dir)
+
+    for directory in (git_dir, common_dir):
+        ref_file = os.path.join(directory, ref)
+
+        if os.path.isfile(ref_file):
+            with open(ref_file, "r", encoding="utf-8") as file_stream:
+                content = file_stream.read().strip()
+
+            if content.startswith("ref:"):
+                return resolve_ref(git_dir, content[len("ref:") :].strip(), depth + 1)
+
+            return content or None
+
+    packed_refs = os.path.join(common_dir, "packed-refs")
+
+    if os.path.isfile(packed_refs):
+        with open(packed_refs, "r", encoding="utf-8") as file_stream:
+            for line in file_stream:
+                if line.startswith(("#", "^")):
+                    continue
+
+                object_id, _, name = line.strip().partition(" ")
+
+                if name == ref:
+                    return object_id
+
+    return None
+
+
+def read_loose_object(common_dir: str, object_id: str) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Reads the given object from the loose objects.
+
+    :return:
+        The type and the content of the object.
+    """
+
+    object_file = os.path.join(common_dir, "objects", object_id[:2], object_id[2:])
+
+    if not os.path.isfile(object_file):
+        return None
+
+    with open(object_file, "rb") as file_stream:
+        data = zlib.decompress(file_stream.read())
+
+    header, _, content = data.partition(b"\0")
+
+    return header.split(b" ", 1)[0], content
+
+
+def find_in_pack_index(index_file: str, object_id: bytes) -> Optional[int]:
+    """
+    Provides the offset of the given object in the pack described by the
+    given (version 2) index file.
+    """
+
+    with open(index_file, "rb") as file_stream:
+        index = file_stream.read()
+
+    if index[:8] != b"\377tOc\x00\x00\x00\x02":
+        raise ValueError(f"Unsupported pack index: {index_file}")
+
+    fanout = struct.unpack_from(">256I", index, 8)
+    total = fanout[255]
+
+    low = fanout[object_id[0] - 1] if object_id[0] else 0
+    high = fanout[object_id[0]]
+
+    names_start = 8 + 256 * 4
+
+    while low < high:
+        middle = (low + high) // 2
+        candidate = index[names_start + middle * 20 : names_start + middle * 20 + 20]
+
+        if candidate == object_id:
+            break
+
+        if candidate < object_id:
+            low = middle + 1
+        else:
+            high = middle
+    else:
+        return None
+
+    offsets_start = names_start + total * 20 + total * 4
+    offset = struct.unpack_from(">I", index, offsets_start + middle * 4)[0]
+
+    if offset & 0x80000000:
+        large_offsets_start = offsets_start + total * 4
+        offset = struct.unpack_from(
+            ">Q", index, large_offsets_start + (offset & 0x7FFFFFFF) * 8
+        )[0]
+
+    return offset
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Applies the given git delta to the given base.
+    """
+
+    def read_size(position: int) -> Tuple[int, int]:
+        size = shift = 0
+
+        while True:
+            byte = delta[position]
+            position += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+
+            if not byte & 0x80:
+                return size, position
+
+    _, position = read_size(0)
+    result_size, position = read_size(position)
+
+    result = bytearray()
+
+    while position < len(delta):
+        operation = delta[position]
+        position += 1
+
+        if operation & 0x80:
+            offset = size = 0
+
+            for bit in range(4):
+                if operation & (1 << bit):
+                    offset |= delta[position] << (bit * 8)
+                    position += 1
+
+            for bit in range(3):
+                if operation & (1 << (4 + bit)):
+                    size |= delta[position] << (bit * 8)
+                    position += 1
+
+            result += base[offset : offset + (size or 0x10000)]
+        elif operation:
+            result += delta[position : position + operation]
+            position += operation
+        else:
+            raise ValueError("Invalid delta operation.")
+
+    if len(result) != result_size:
+        raise ValueError("Invalid delta result size.")
+
+    return bytes(result)
+
+
+def read_packed_object_at(
+    common_dir: str, pack_file: str, offset: int, depth: int = 0
+) -> Tuple[bytes, bytes]:
+    """
+    Reads the object at the given offset of the given pack file - resolving
+    deltas on the way.
+    """
+
+    if depth > 50:
+        raise ValueError("Delta chain too long.")
+
+    with open(pack_file, "rb") as file_stream:
+        file_stream.seek(offset)
+
+        byte = file_stream.read(1)[0]
+        object_type = (byte >> 4) & 0x07
+
+        while byte & 0x80:
+            byte = file_stream.read(1)[0]
+
+        base_offset = base_id = None
+
+        if object_type == PACK_OFS_DELTA:
+            byte = file_stream.read(1)[0]
+            relative_offset = byte & 0x7F
+
+            while byte & 0x80:
+                byte = file_stream.read(1)[0]
+                relative_offset = ((relative_offset + 1) << 7) | (byte & 0x7F)
+
+            base_offset = offset - relative_offset
+        elif object_type == PACK_REF_DELTA:
+            base_id = binascii.hexlify(file_stream.read(20)).decode()
+
+        decompressor = zlib.decompressobj()
+        content = b""
+
+        while not decompressor.eof:
+            chunk = file_stream.read(64 * 1024)
+
+            if not chunk:
+                raise ValueError("Truncated pack file.")
+
+            content += decompressor.decompress(chunk)
+
+    if object_type in PACK_OBJECT_TYPES:
+        return PACK_OBJECT_TYPES[object_type], content
+
+    if base_offset is not None:
+        base_type, base = read_packed_object_at(
+            common_dir, pack_file, base_offset, depth + 1
+        )
+    elif base_id is not None:
+        base_type, base = read_object(common_dir, base_id, depth + 1)
+    else:
+        raise ValueError(f"Unsupported pack object type: {object_type}")
+
+    return base_type, apply_delta(base, content)
+
+
+def read_object(
+    common_dir: str, object_id: str, depth: int = 0
+) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Reads the given object from the object store - loose or packed.
+
+    :return:
+        The type and the content of the object.
+    """
+
+    loose = read_loose_object(common_dir, object_id)
+
+    if loose is not None:
+        return loose
+
+    binary_id = binascii.unhexlify(object_id)
+
+    for index_file in glob.glob(os.path.join(common_dir, "objects", "pack", "*.idx")):
+        offset = find_in_pack_index(index_file, binary_id)
+
+        if offset is not None:
+            return read_packed_object_at(
+                common_dir, index_file[:-4] + ".pack", offset, depth
+            )
+
+    return None
+
+
+def read_commit_message_from_event(object_id: str) -> Optional[str]:
+    """
+    Reads the message of the given commit from the payload of the GitHub
+    Actions event that triggered us - if it describes that commit.
+    """
+
+    event_path = os.environ.get("GITHUB_EVENT_PATH")
+
+    if not os.environ.get("GITHUB_ACTIONS") or not event_path:
+        return None
+
+    try:
+        with open(event_path, "r", encoding="utf-8") as file_stream:
+            head_commit = json.load(file_stream).get("head_commit") or {}
+    except (OSError, ValueError, AttributeError):
+        return None
+
+    if head_commit.get("id") == object_id and "message" in head_commit:
+        return head_commit["message"]
+
+    return None
+
+
+def read_head_commit_message(start: Optional[str] = None) -> Optional[str]:
+    """
+    Reads the message of the HEAD commit without spawning git.
+
+    :return:
+        :py:class:`None` when it couldn't be read.
+    """
+
+    git_dir = find_git_dir(start)
+
+    if not git_dir:
+        return None
+
+    object_id = resolve_ref(git_dir, "HEAD")
+
+    if not object_id or len(object_id) != 40:
+        # Unborn branch or SHA-256 repository.
+        return None
+
+    message = read_commit_message_from_event(object_id)
+
+    if message is not None:
+        logging.debug("Read the HEAD commit message from the event payload.")
+        return message
+
+    commit = read_object(get_common_dir(git_dir), object_id)
+
+    if not commit or commit[0] != b"commit":
+        return None
+
+    logging.debug("Read the HEAD commit message from the object store.")
+
+    return commit[1].partition(b"\n\n")[-1].decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=None)
+def get_head_commit_message() -> str:
+    """
+    Provides the message of the HEAD commit - resolved once per process.
+
+    The object store (or the GitHub Actions event payload) is read
+    directly; git is only spawned when they can't give us an answer.
+    """
+
+    try:
+        message = read_head_commit_message()
+    except (OSError, ValueError, IndexError, struct.error, zlib.error) as exception:
+        logging.debug("Could not read the HEAD commit: %s", exception)
+        message = None
+
+    if message is None:
+        logging.debug("Could not read the HEAD commit message, asking git.")
+        message = read_last_commit_from_git()
+
+    return message
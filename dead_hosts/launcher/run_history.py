@@ -0,0 +1,156 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the interface for the run history of a workspace.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import json
+import logging
+import os
+from typing import List, Optional
+
+import dead_hosts.launcher.defaults.envs
+import dead_hosts.launcher.defaults.paths
+from dead_hosts.launcher.atomic import write_atomically
+
+
+class RunHistory:
+    """
+    Provides the history of the parts we ran. Each part is a JSON record on
+    its own line.
+
+    :param workspace_dir:
+        The workspace to work with.
+    """
+
+    WORKSPACE_DIR: str = dead_hosts.launcher.defaults.envs.WORKSPACE_DIR
+
+    # The number of records we keep.
+    MAX_RECORDS: int = 500
+
+    SUMMED_INDEXES: List[str] = [
+        "wall_seconds",
+        "user_cpu_seconds",
+        "system_cpu_seconds",
+        "voluntary_context_switches",
+        "involuntary_context_switches",
+    ]
+
+    def __init__(self, workspace_dir: Optional[str] = None) -> None:
+        if workspace_dir is not None:
+            self.WORKSPACE_DIR = workspace_dir  # pylint: disable=invalid-name
+
+        self.path = os.path.join(
+            self.WORKSPACE_DIR, dead_hosts.launcher.defaults.paths.RUN_HISTORY_FILENAME
+        )
+
+    def append(self, record: dict) -> "RunHistory":
+        """
+        Appends the given record.
+        """
+
+        with open(self.path, "a", encoding="utf-8") as file_stream:
+            file_stream.write(json.dumps(record, sort_keys=True) + "\n")
+
+        logging.debug("Appended %r into %r.", record, self.path)
+
+        return self
+
+    def read(self) -> List[dict]:
+        """
+        Provides all the (valid) records.
+        """
+
+        records = []
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file_stream:
+                for line in file_stream:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+
+                    if isinstance(record, dict):
+                        records.append(record)
+        except FileNotFoundError:
+            pass
+
+        return records
+
+    def trim(self) -> "RunHistory":
+        """
+        Drops the oldest records, if we have too much of them.
+        """
+
+        records = self.read()
+
+        if len(records) > self.MAX_RECORDS:
+            write_atomically(
+                self.path,
+                "".join(
+                    json.dumps(x, sort_keys=True) + "\n"
+                    for x in records[-self.MAX_RECORDS :]
+                ),
+            )
+
+        return self
+
+    def summarize(self, cycle_start: float) -> dict:
+        """
+        Provides the totals of the parts of the cycle which started at the
+        given timestamp.
+        """
+
+        records = [x for x in self.read() if x.get("cycle_start") == cycle_start]
+
+        summary = {x: sum(y.get(x, 0) for y in records) for x in self.SUMMED_INDEXES}
+
+        summary["parts"] = len(records)
+        summary["max_rss_kib"] = max(
+            (x.get("max_rss_kib", 0) for x in records), default=0
+        )
+        summary["cpu_seconds"] = (
+            summary["user_cpu_seconds"] + summary["system_cpu_seconds"]
+        )
+
+        # The average number of cores kept busy.
+        summary["cpu_utilization"] = (
+            summary["cpu_seconds"] / summary["wall_seconds"]
+            if summary["wall_seconds"]
+            else 0.0
+        )
+
+        return summary
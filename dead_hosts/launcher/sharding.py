@@ -0,0 +1,502 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the sharding logic. In other words, the way we test a single file
+with multiple PyFunceble processes.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import ExitStack
+from typing import IO, Any, Callable, List, Optional
+
+from PyFunceble.helpers.dict import DictHelper
+
+import dead_hosts.launcher.defaults.paths
+import dead_hosts.launcher.defaults.pyfunceble
+from dead_hosts.launcher.atomic import atomic_open
+from dead_hosts.launcher.command import CommandError, CommandTimeoutError
+from dead_hosts.launcher.engine import PyFuncebleEngine
+from dead_hosts.launcher.normalization import read_canonical
+from dead_hosts.launcher.sorting import DEFAULT_MEMORY_LIMIT, sort_unique, union_sorted
+
+
+def get_shard_index(subject: bytes, shards: int) -> int:
+    """
+    Provides the shard the given subject belongs to.
+
+    Unlike :py:func:`hash`, the result is the same from one process (or
+    machine) to another.
+    """
+
+    return (
+        int.from_bytes(hashlib.blake2b(subject, digest_size=8).digest(), "big") % shards
+    )
+
+
+def find_active_lists(directory: str) -> List[str]:
+    """
+    Provides the ACTIVE lists (:code:`.../ACTIVE/list`) found under the
+    given directory.
+    """
+
+    return sorted(
+        os.path.join(root, "list")
+        for root, _, files in os.walk(directory)
+        if os.path.basename(root) == "ACTIVE" and "list" in files
+    )
+
+
+def find_usage_records(directory: str) -> List[dict]:
+    """
+    Provides the (valid) usage records of the shards found under the given
+    directory.
+    """
+
+    records = []
+
+    for root, _, files in sorted(os.walk(directory)):
+        if dead_hosts.launcher.defaults.paths.SHARD_USAGE_FILENAME not in files:
+            continue
+
+        try:
+            with open(
+                os.path.join(
+                    root, dead_hosts.launcher.defaults.paths.SHARD_USAGE_FILENAME
+                ),
+                "r",
+                encoding="utf-8",
+            ) as file_stream:
+                record = json.load(file_stream)
+        except (OSError, ValueError):
+            continue
+
+        if isinstance(record, dict):
+            records.append(record)
+
+    return records
+
+
+def merge_active_lists(
+    paths: List[str], destination: str, *, memory_limit: int = DEFAULT_MEMORY_LIMIT
+) -> int:
+    """
+    Merges the given ACTIVE lists into the given file - sorted and
+    deduplicated. Each list is sorted on its own, then all of them are merged
+    in a single pass.
+
+    :return:
+        The number of written subjects.
+    """
+
+    sources = [
+        sort_unique(
+            read_canonical(x),
+            memory_limit=memory_limit // max(len(paths), 1),
+            directory=os.path.dirname(os.path.abspath(destination)),
+        )
+        for x in paths
+    ]
+
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    written = 0
+
+    with atomic_open(destination, "wb", buffering=1024 * 1024) as output:
+        for subject in union_sorted(*sources):
+            output.write(subject + b"\n")
+            written += 1
+
+    logging.info(
+        "Merged %d ACTIVE list(s) into %r: %d subject(s).",
+        len(paths),
+        destination,
+        written,
+    )
+
+    return written
+
+
+def combine_usage(usages: List[dict]) -> Optional[dict]:
+    """
+    Provides what processes which ran side by side consumed together.
+
+    The combined usage is flagged as ``timed_out`` when one of the processes
+    was killed because it didn't finish in time.
+    """
+
+    usages = [x for x in usages if x]
+
+    if not usages:
+        return None
+
+    return {
+        "wall_seconds": max(x["wall_seconds"] for x in usages),
+        "user_cpu_seconds": sum(x["user_cpu_seconds"] for x in usages),
+        "system_cpu_seconds": sum(x["system_cpu_seconds"] for x in usages),
+        "max_rss_kib": sum(x["max_rss_kib"] for x in usages),
+        "voluntary_context_switches": sum(
+            x["voluntary_context_switches"] for x in usages
+        ),
+        "involuntary_context_switches": sum(
+            x["involuntary_context_switches"] for x in usages
+        ),
+        "engine": dead_hosts.launcher.defaults.pyfunceble.SUBPROCESS_ENGINE,
+        "shards": len(usages),
+        "timed_out": any(x.get("timed_out") for x in usages),
+    }
+
+
+class ShardSupervisor:
+    """
+    Splits a file into balanced shards and tests them side by side - with one
+    PyFunceble process per shard.
+
+    Every shard gets its own directory with a copy of the configuration -
+    where the continuous integration is disabled - and its own output.
+    That way, the PyFunceble processes never share a file and each of them
+    can continue where it stopped during the next part.
+
+    :param workspace_dir:
+        The directory to work from.
+    :param shards:
+        The number of shards.
+    :param config_dir:
+        The PyFunceble configuration directory to copy.
+    :param timeout:
+        The (wall-clock) number of seconds the shards may run.
+    :param subscribers:
+        The callbacks which get every line of the output of the shards.
+
+    Once the shards ran, :code:`usage` holds what they consumed together.
+    """
+
+    def __init__(
+        self,
+        workspace_dir: Optional[str] = None,
+        *,
+        shards: int,
+        config_dir: str,
+        timeout: Optional[float] = None,
+        subscribers: Optional[List[Callable[[str], Any]]] = None,
+    ) -> None:
+        if workspace_dir is None:
+            workspace_dir = dead_hosts.launcher.defaults.paths.CURRENT_DIRECTORY
+
+        self.workspace_dir = workspace_dir
+        self.shards = shards
+        self.config_dir = config_dir
+        self.timeout = timeout
+        self.subscribers = subscribers or []
+        self.usage: Optional[dict] = None
+
+        self.shards_dir = os.path.join(
+            workspace_dir, dead_hosts.launcher.defaults.paths.SHARDS_DIRNAME
+        )
+        self.lock = threading.Lock()
+
+    def get_shard_dir(self, index: int) -> str:
+        """
+        Provides the directory of the given shard.
+        """
+
+        return os.path.join(self.shards_dir, str(index))
+
+    def get_input_path(self, index: int) -> str:
+        """
+        Provides the file the given shard tests.
+        """
+
+        return os.path.join(
+            self.get_shard_dir(index), dead_hosts.launcher.defaults.paths.SHARD_FILENAME
+        )
+
+    def get_active_list_path(self, index: int) -> str:
+        """
+        Provides the ACTIVE list of the given shard.
+        """
+
+        return os.path.join(
+            self.get_shard_dir(index),
+            "output",
+            dead_hosts.launcher.defaults.paths.SHARD_FILENAME,
+            "domains",
+            "ACTIVE",
+            "list",
+        )
+
+    def get_usage_path(self, index: int) -> str:
+        """
+        Provides the file which holds what the given shard consumed - next to
+        its output.
+        """
+
+        return os.path.join(
+            self.get_shard_dir(index),
+            "output",
+            dead_hosts.launcher.defaults.paths.SHARD_USAGE_FILENAME,
+        )
+
+    def split(self, source: str) -> List[int]:
+        """
+        Distributes the subjects of the given file over the shards - in a
+        round-robin fashion - and prepares their configuration. The shards of
+        the previous cycle are dropped.
+
+        :return:
+            The number of subjects of each shard.
+        """
+
+        shutil.rmtree(self.shards_dir, ignore_errors=True)
+
+        for index in range(self.shards):
+            os.makedirs(self.get_shard_dir(index))
+            self.copy_config(index)
+
+        counts = [0] * self.shards
+
+        with ExitStack() as stack:
+            outputs = [
+                stack.enter_context(
+                    atomic_open(self.get_input_path(x), "wb", buffering=1024 * 1024)
+                )
+                for x in range(self.shards)
+            ]
+
+            with open(source, "rb") as file_stream:
+                for line in file_stream:
+                    subject = line.strip()
+
+                    if not subject or subject.startswith(b"#"):
+                        continue
+
+                    index = sum(counts) % self.shards
+                    outputs[index].write(subject + b"\n")
+                    counts[index] += 1
+
+        logging.info(
+            "Split %r into %d shards of %s subject(s).", source, self.shards, counts
+        )
+
+        return counts
+
+    def split_by_hash(self, source: str, index: int) -> int:
+        """
+        Writes the subjects of the given file which belong to the given shard
+        - according to their hash - and prepares its configuration. That way,
+        every machine can prepare its own shard without any coordination.
+
+        :return:
+            The number of subjects of the shard.
+        """
+
+        shutil.rmtree(self.get_shard_dir(index), ignore_errors=True)
+        os.makedirs(self.get_shard_dir(index))
+        self.copy_config(index)
+
+        count = 0
+
+        with open(source, "rb") as file_stream, atomic_open(
+            self.get_input_path(index), "wb", buffering=1024 * 1024
+        ) as output:
+            for line in file_stream:
+                subject = line.strip()
+
+                if not subject or subject.startswith(b"#"):
+                    continue
+
+                if get_shard_index(subject, self.shards) == index:
+                    output.write(subject + b"\n")
+                    count += 1
+
+        logging.info(
+            "Wrote shard %d/%d of %r: %d subject(s).",
+            index,
+            self.shards,
+            source,
+            count,
+        )
+
+        return count
+
+    def copy_config(self, index: int) -> "ShardSupervisor":
+        """
+        Copies our PyFunceble configuration into the directory of the given
+        shard - with the continuous integration disabled.
+        """
+
+        config_dir = os.path.join(self.get_shard_dir(index), "config")
+        os.makedirs(config_dir, exist_ok=True)
+
+        for file_name in os.listdir(self.config_dir):
+            if os.path.isfile(os.path.join(self.config_dir, file_name)):
+                shutil.copy2(os.path.join(self.config_dir, file_name), config_dir)
+
+        overwrite_path = os.path.join(config_dir, ".PyFunceble.overwrite.yaml")
+
+        if os.path.isfile(overwrite_path):
+            overwrite = DictHelper(
+                DictHelper().from_yaml_file(overwrite_path)
+            ).flatten()
+        else:
+            overwrite = {}
+
+        # Only we may commit or end the test.
+        overwrite["cli_testing.ci.active"] = False
+
+        DictHelper(DictHelper(overwrite).unflatten()).to_yaml_file(overwrite_path)
+
+        return self
+
+    def get_subscriber(self) -> Callable[[str], Any]:
+        """
+        Provides a subscriber which feeds our subscribers - one line at a time.
+        """
+
+        def subscriber(line: str) -> None:
+            with self.lock:
+                for callback in self.subscribers:
+                    callback(line)
+
+        return subscriber
+
+    def run_shard(
+        self, index: int, output: Optional[IO[bytes]] = None
+    ) -> PyFuncebleEngine:
+        """
+        Tests the given shard.
+
+        :param output:
+            The binary stream to copy the output of PyFunceble to. When not
+            given, it goes into the log file of the shard.
+        """
+
+        shard_dir = self.get_shard_dir(index)
+
+        with ExitStack() as stack:
+            if output is None:
+                output = stack.enter_context(
+                    open(
+                        os.path.join(
+                            shard_dir,
+                            dead_hosts.launcher.defaults.paths.SHARD_LOG_FILENAME,
+                        ),
+                        "ab",
+                    )
+                )
+
+            engine = PyFuncebleEngine(
+                timeout=self.timeout,
+                subscribers=[self.get_subscriber()] if self.subscribers else None,
+                env={
+                    **os.environ,
+                    "PYFUNCEBLE_CONFIG_DIR": os.path.join(shard_dir, "config"),
+                    "PYFUNCEBLE_OUTPUT_LOCATION": shard_dir,
+                },
+                output=output,
+            )
+
+            try:
+                engine.run("-f", self.get_input_path(index))
+            finally:
+                logging.info("Shard %d stopped.", index)
+
+        return engine
+
+    def start(self) -> bool:
+        """
+        Tests all shards side by side.
+
+        :return:
+            :py:data:`False` when a shard didn't finish in time.
+
+        :raise CommandError:
+            When a shard failed - once all of them stopped.
+        """
+
+        usages = []
+        errors = []
+        finished = True
+
+        logging.info("Starting %d PyFunceble processes.", self.shards)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.shards) as pool:
+            futures = [pool.submit(self.run_shard, x) for x in range(self.shards)]
+
+            for index, future in enumerate(futures):
+                try:
+                    usages.append(future.result().usage)
+                except CommandTimeoutError as exception:
+                    logging.info(
+                        "Shard %d did not finish in time: %s", index, exception
+                    )
+                    usages.append(exception.usage)
+                    finished = False
+                except CommandError as exception:
+                    logging.critical("Shard %d failed: %s", index, exception)
+                    usages.append(exception.usage)
+                    errors.append(exception)
+
+        self.usage = combine_usage(usages)
+
+        if errors:
+            raise errors[0]
+
+        return finished
+
+    def merge(
+        self, destination: str, *, memory_limit: int = DEFAULT_MEMORY_LIMIT
+    ) -> int:
+        """
+        Merges the ACTIVE lists of the shards into the given file - sorted
+        and deduplicated.
+
+        :return:
+            The number of written subjects.
+        """
+
+        return merge_active_lists(
+            [
+                self.get_active_list_path(x)
+                for x in range(self.shards)
+                if os.path.isfile(self.get_active_list_path(x))
+            ],
+            destination,
+            memory_limit=memory_limit,
+        )
@@ -0,0 +1,206 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Provides the external (disk-backed) sorting of large lists.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import heapq
+import itertools
+import operator
+import tempfile
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+# The memory we let a sorting use before spilling to the disk.
+DEFAULT_MEMORY_LIMIT: int = 64 * 1024 * 1024
+
+# The (rough) memory cost of an item, on top of its length.
+ITEM_OVERHEAD: int = 100
+
+# The number of items we deduplicate at once.
+BATCH_SIZE: int = 16 * 1024
+
+# Drops the new line ending a line of a run.
+STRIP_NEW_LINE = operator.itemgetter(slice(None, -1))
+
+
+def write_run(items: Iterable[bytes], directory: Optional[str]) -> IO:
+    """
+    Writes the given (sorted) items into an anonymous temporary file and
+    provides it - rewound.
+    """
+
+    run = tempfile.TemporaryFile(dir=directory)  # pylint: disable=consider-using-with
+
+    run.writelines(x + b"\n" for x in items)
+    run.seek(0)
+
+    return run
+
+
+def sort_unique(
+    items: Iterable[bytes],
+    *,
+    memory_limit: int = DEFAULT_MEMORY_LIMIT,
+    directory: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Sorts and deduplicates the given items - which may not fit in memory.
+
+    As long as the (unique) items fit into the memory limit, everything
+    happens in memory. Otherwise, sorted runs are written into temporary
+    files which are merged at the end.
+
+    :param items:
+        The items to sort. They can't hold any new line.
+    :param memory_limit:
+        The memory (in bytes) we may use.
+    :param directory:
+        Where to write the temporary runs.
+    """
+
+    runs: List[IO] = []
+    chunk = set()
+    chunk_size = 0
+    items = iter(items)
+
+    try:
+        # The items are handled by batch: the loop itself stays out of the
+        # interpreter. The size of the chunk is estimated from the average
+        # length of the (unique) items of the batch.
+        for batch in iter(lambda: set(itertools.islice(items, BATCH_SIZE)), set()):
+            known = len(chunk)
+            chunk |= batch
+            chunk_size += (len(chunk) - known) * (
+                sum(map(len, batch)) // len(batch) + ITEM_OVERHEAD
+            )
+
+            if chunk_size >= memory_limit:
+                runs.append(write_run(sorted(chunk), directory))
+                chunk = set()
+                chunk_size = 0
+
+        if not runs:
+            yield from sorted(chunk)
+            return
+
+        if chunk:
+            runs.append(write_run(sorted(chunk), directory))
+            chunk = set()
+
+        previous = None
+
+        # The runs are merged on their items - without the new line - just
+        # like they were sorted.
+        for item in heapq.merge(*(map(STRIP_NEW_LINE, x) for x in runs)):
+            if item != previous:
+                yield item
+                previous = item
+    finally:
+        for run in runs:
+            run.close()
+
+
+def read_sorted(path: str) -> Iterator[bytes]:
+    """
+    Provides the (stripped) lines of the given file - which is expected to be
+    sorted. Blank lines and comments are skipped.
+    """
+
+    with open(path, "rb") as file_stream:
+        for line in file_stream:
+            line = line.strip()
+
+            if line and not line.startswith(b"#"):
+                yield line
+
+
+def diff_sorted(
+    old: Iterable[bytes], new: Iterable[bytes]
+) -> Iterator[Tuple[bool, bytes]]:
+    """
+    Provides the differences between two sorted and deduplicated iterables,
+    in a single pass.
+
+    :return:
+        :code:`(True, item)` for the items only in :code:`new`,
+        :code:`(False, item)` for the items only in :code:`old`.
+    """
+
+    old, new = iter(old), iter(new)
+    old_item, new_item = next(old, None), next(new, None)
+
+    while old_item is not None or new_item is not None:
+        if new_item is None or (old_item is not None and old_item < new_item):
+            yield False, old_item
+            old_item = next(old, None)
+        elif old_item is None or new_item < old_item:
+            yield True, new_item
+            new_item = next(new, None)
+        else:
+            old_item, new_item = next(old, None), next(new, None)
+
+
+def intersect_sorted(
+    first: Iterable[bytes], second: Iterable[bytes]
+) -> Iterator[bytes]:
+    """
+    Provides the items of two sorted and deduplicated iterables which are in
+    both of them, in a single pass.
+    """
+
+    first, second = iter(first), iter(second)
+    first_item, second_item = next(first, None), next(second, None)
+
+    while first_item is not None and second_item is not None:
+        if first_item < second_item:
+            first_item = next(first, None)
+        elif second_item < first_item:
+            second_item = next(second, None)
+        else:
+            yield first_item
+            first_item, second_item = next(first, None), next(second, None)
+
+
+def union_sorted(*iterables: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Provides the (deduplicated) items of the given sorted iterables.
+    """
+
+    previous = None
+
+    for item in heapq.merge(*iterables):
+        if item != previous:
+            yield item
+            previous = item
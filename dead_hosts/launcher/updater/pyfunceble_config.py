@@ -109,7 +109,7 @@ class PyFuncebleConfigUpdater(UpdaterBase):
             ).flatten()
 
         local_version = Merge(
-            dead_hosts.launcher.defaults.pyfunceble.CONFIGURATION
+            dead_hosts.launcher.defaults.pyfunceble.get_configuration()
         ).into(local_version, strict=True)
 
         if self.info_manager.custom_pyfunceble_config and isinstance(
@@ -124,6 +124,11 @@ class PyFuncebleConfigUpdater(UpdaterBase):
                 local_version, strict=True
             )
 
+        if self.info_manager.is_input_normalized():
+            # Our normalization already decoded the input: PyFunceble tests
+            # plain subjects.
+            local_version["cli_decoding.adblock"] = False
+
         if self.info_manager.ping:
             logging.info("Ping names given, appending them to the commit message.")
 
@@ -136,11 +141,11 @@ class PyFuncebleConfigUpdater(UpdaterBase):
 
         if not self.info_manager.platform_optout:
             local_version = Merge(
-                dead_hosts.launcher.defaults.pyfunceble.PLATFORM_PERSISTENT_CONFIG
+                dead_hosts.launcher.defaults.pyfunceble.get_platform_persistent_config()
             ).into(local_version, strict=True)
         else:
             local_version = Merge(
-                dead_hosts.launcher.defaults.pyfunceble.PERSISTENT_CONFIG
+                dead_hosts.launcher.defaults.pyfunceble.get_persistent_config()
             ).into(local_version, strict=True)
 
         if FileHelper(
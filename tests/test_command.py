@@ -0,0 +1,201 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the exit codes and timeouts of our commands.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import io
+import os
+import time
+
+import pytest
+
+from dead_hosts.launcher.command import Command, CommandError, CommandTimeoutError
+
+# Closes its output, then exits a bit later.
+LATE_EXIT = "exec >&- 2>&-; sleep 0.3; exit {}"
+
+
+def test_run_provides_the_lines():
+    """
+    The lines of both outputs are given - stripped.
+    """
+
+    command = Command(["sh", "-c", "echo hello; echo world >&2"])
+
+    assert sorted(command.run()) == ["hello", "world"]
+    assert command.usage["returncode"] == 0
+
+
+def test_run_raises_on_error():
+    """
+    A non-zero exit code is raised - with the last lines of the output.
+    """
+
+    with pytest.raises(CommandError) as exception:
+        list(Command(["sh", "-c", "echo failure; exit 3"]).run())
+
+    assert exception.value.returncode == 3
+    assert exception.value.context == ["failure"]
+
+
+def test_execute_provides_the_output():
+    """
+    The whole command - not only its first argument - is executed, with our
+    environment.
+    """
+
+    command = Command(
+        ["sh", "-c", 'echo "$@" "$GREETING"', "sh", "hello"],
+        env=dict(os.environ, GREETING="world"),
+    )
+
+    assert command.execute() == "hello world\n"
+
+
+def test_execute_on_error():
+    """
+    A non-zero exit code gives an empty output - or is raised.
+    """
+
+    assert Command(["sh", "-c", "echo failure; exit 3"]).execute() == ""
+
+    with pytest.raises(CommandError) as exception:
+        Command(["sh", "-c", "echo failure; exit 3"]).execute(raise_on_error=True)
+
+    assert exception.value.returncode == 3
+
+
+def test_execute_timeout():
+    """
+    A timeout is always raised.
+    """
+
+    with pytest.raises(CommandTimeoutError):
+        Command(["sleep", "5"], timeout=0.2).execute()
+
+
+def test_timeout_keeps_the_usage():
+    """
+    What a killed command consumed is kept - and flagged as timed out.
+    """
+
+    command = Command(["sleep", "5"], timeout=0.2)
+
+    with pytest.raises(CommandTimeoutError) as exception:
+        list(command.run())
+
+    assert exception.value.usage is command.usage
+    assert command.usage["timed_out"] is True
+    assert command.usage["wall_seconds"] >= 0.2
+
+
+@pytest.mark.parametrize("exit_code", [0, 3])
+def test_run_waits_for_late_exits(exit_code):
+    """
+    A command which closed its output is waited for - not terminated.
+    """
+
+    command = Command(["sh", "-c", LATE_EXIT.format(exit_code)], timeout=10)
+
+    if exit_code:
+        with pytest.raises(CommandError) as exception:
+            list(command.run())
+
+        assert exception.value.returncode == exit_code
+    else:
+        assert not list(command.run())
+
+    assert command.usage["returncode"] == exit_code
+
+
+def test_run_to_stdout_waits_for_late_exits():
+    """
+    A command which closed its output is waited for - not terminated.
+    """
+
+    command = Command(["sh", "-c", "echo done; " + LATE_EXIT.format(0)])
+    output = io.BytesIO()
+
+    command.run_to_stdout(output)
+
+    assert output.getvalue() == b"done\n"
+    assert command.usage["returncode"] == 0
+
+
+@pytest.mark.parametrize("script", ["echo start; sleep 5", "exec >&- 2>&-; sleep 5"])
+def test_timeout(script):
+    """
+    A command which is still running - with or without its output - once its
+    timeout elapsed is terminated.
+    """
+
+    command = Command(["sh", "-c", script], timeout=0.3)
+    started_at = time.monotonic()
+
+    with pytest.raises(CommandTimeoutError):
+        command.run_to_stdout(io.BytesIO())
+
+    assert time.monotonic() - started_at < 3
+    assert command.usage["returncode"] < 0
+
+
+def test_early_exit_terminates():
+    """
+    A command whose output is not consumed anymore is terminated.
+    """
+
+    command = Command(["sh", "-c", "while true; do echo y; done"])
+    lines = command.run()
+
+    assert next(lines) == "y"
+
+    lines.close()
+
+    assert command.usage["returncode"] < 0
+
+
+def test_error_context_of_a_truncated_tail(monkeypatch):
+    """
+    The tail kept for the error reports may start in the middle of a
+    character.
+    """
+
+    monkeypatch.setattr(Command, "TAIL_SIZE", 5)
+
+    with pytest.raises(CommandError) as exception:
+        Command(["sh", "-c", "printf 'éééé'; exit 1"]).run_to_stdout(io.BytesIO())
+
+    assert exception.value.context == ["�éé"]
@@ -0,0 +1,203 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the publication of the deltas of our output.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import hashlib
+import json
+
+from dead_hosts.launcher.delta import DeltaPublisher
+
+
+def write_output(path, subjects, header="# Generation Time: now") -> None:
+    """
+    Writes an output holding the given subjects.
+    """
+
+    path.write_text(header + "\n\n" + "".join(f"{x}\n" for x in subjects) + "\n")
+
+
+def read_manifest(workspace) -> dict:
+    """
+    Provides the manifest of the given workspace.
+    """
+
+    return json.loads((workspace / "deltas" / "manifest.json").read_text())
+
+
+def apply_delta(subjects, path) -> list:
+    """
+    Applies the given delta to the given (sorted) subjects - like a consumer
+    would.
+    """
+
+    result = set(subjects)
+
+    for line in path.read_text().splitlines():
+        if line.startswith("+"):
+            result.add(line[1:])
+        else:
+            result.remove(line[1:])
+
+    return sorted(result)
+
+
+def get_subjects_sha256(subjects) -> str:
+    """
+    Provides the checksum of the given (sorted) subjects.
+    """
+
+    return hashlib.sha256("".join(f"{x}\n" for x in subjects).encode()).hexdigest()
+
+
+def run_cycle(workspace, subjects, **kwargs):
+    """
+    Replaces the output with the given subjects - and publishes the delta.
+    """
+
+    publisher = DeltaPublisher(
+        str(workspace / "clean.list"), str(workspace / "deltas"), **kwargs
+    )
+
+    publisher.stage()
+    write_output(workspace / "clean.list", subjects, header=f"# {subjects}")
+
+    return publisher.publish()
+
+
+def test_first_publication(tmp_path):
+    """
+    Without a previous output, only the output is described.
+    """
+
+    assert run_cycle(tmp_path, ["b.com", "a.com"]) is None
+
+    assert read_manifest(tmp_path) == {
+        "sequence": 0,
+        "list": {
+            "file": "clean.list",
+            "sequence": 0,
+            "subjects": 2,
+            "subjects_sha256": get_subjects_sha256(["a.com", "b.com"]),
+        },
+        "deltas": [],
+    }
+
+
+def test_delta_round_trip(tmp_path):
+    """
+    Applying the published delta to the previous subjects gives the new
+    ones.
+    """
+
+    previous = ["a.com", "b.com", "c.com"]
+    current = ["A.com", "c.com", "d.com", "e.com"]
+
+    write_output(tmp_path / "clean.list", previous)
+    entry = run_cycle(tmp_path, current)
+
+    manifest = read_manifest(tmp_path)
+    delta_path = tmp_path / "deltas" / "1.delta"
+
+    # The subjects are compared in their canonical form.
+    assert entry["added"] == 2
+    assert entry["removed"] == 1
+    assert manifest["deltas"] == [entry]
+    assert manifest["sequence"] == manifest["list"]["sequence"] == 1
+
+    assert entry["from_subjects_sha256"] == get_subjects_sha256(previous)
+    assert entry["to_subjects_sha256"] == manifest["list"]["subjects_sha256"]
+    assert entry["sha256"] == hashlib.sha256(delta_path.read_bytes()).hexdigest()
+
+    assert apply_delta(previous, delta_path) == ["a.com", "c.com", "d.com", "e.com"]
+    assert (
+        get_subjects_sha256(apply_delta(previous, delta_path))
+        == entry["to_subjects_sha256"]
+    )
+
+
+def test_unchanged_subjects(tmp_path):
+    """
+    An output whose header changed - but not its subjects - doesn't produce
+    any delta, nor change the manifest.
+    """
+
+    write_output(tmp_path / "clean.list", ["a.com"])
+    run_cycle(tmp_path, ["a.com", "b.com"])
+    manifest = (tmp_path / "deltas" / "manifest.json").read_bytes()
+
+    assert run_cycle(tmp_path, ["b.com", "a.com"]) is None
+
+    assert (tmp_path / "deltas" / "manifest.json").read_bytes() == manifest
+    assert sorted(x.name for x in (tmp_path / "deltas").iterdir()) == [
+        "1.delta",
+        "manifest.json",
+    ]
+
+
+def test_history(tmp_path):
+    """
+    Only the latest deltas are kept.
+    """
+
+    write_output(tmp_path / "clean.list", [])
+
+    for index in range(4):
+        run_cycle(tmp_path, [f"{x}.com" for x in range(index + 1)], history=2)
+
+    assert [x["sequence"] for x in read_manifest(tmp_path)["deltas"]] == [3, 4]
+    assert sorted(x.name for x in (tmp_path / "deltas").iterdir()) == [
+        "3.delta",
+        "4.delta",
+        "manifest.json",
+    ]
+
+
+def test_discard(tmp_path):
+    """
+    A staged output which is never published can be discarded.
+    """
+
+    write_output(tmp_path / "clean.list", ["a.com"])
+
+    publisher = DeltaPublisher(str(tmp_path / "clean.list"), str(tmp_path / "deltas"))
+    previous = publisher.stage().previous
+
+    publisher.discard()
+
+    assert previous.closed
+    assert publisher.previous is None
+    assert not (tmp_path / "deltas").exists()
@@ -0,0 +1,159 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the leases of our fleet work queue.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from dead_hosts.launcher.fleet.queue import WorkQueue
+
+
+@pytest.fixture(name="database")
+def fixture_database(tmp_path) -> str:
+    """
+    Provides a database indexing 20 due workspaces.
+    """
+
+    for index in range(20):
+        os.makedirs(tmp_path / "workspaces" / str(index))
+        (tmp_path / "workspaces" / str(index) / "info.json").write_text("{}")
+
+    database = str(tmp_path / "fleet.sqlite")
+
+    with WorkQueue(database) as queue:
+        queue.refresh([str(tmp_path / "workspaces")])
+
+    return database
+
+
+def lease_in_child(database: str, barrier, results) -> None:
+    """
+    Leases some workspaces from a child process - once all of them are
+    ready.
+    """
+
+    with WorkQueue(database) as queue:
+        barrier.wait()
+
+        for _ in range(4):
+            results.extend([x["path"] for x in queue.lease(2, owner=str(os.getpid()))])
+
+
+def test_lease_gives_each_workspace_once(database):
+    """
+    Concurrent runners never lease the same workspace.
+    """
+
+    context = multiprocessing.get_context("fork")
+    processes = 4
+    barrier = context.Barrier(processes)
+
+    with context.Manager() as manager:
+        results = manager.list()
+        children = [
+            context.Process(target=lease_in_child, args=(database, barrier, results))
+            for _ in range(processes)
+        ]
+
+        for child in children:
+            child.start()
+
+        for child in children:
+            child.join()
+            assert child.exitcode == 0
+
+        leased = list(results)
+
+    assert len(leased) == 20
+    assert len(set(leased)) == 20
+
+
+def test_lease_through_another_path(database, monkeypatch):
+    """
+    Runners giving the database through different paths share the lock.
+    """
+
+    monkeypatch.chdir(os.path.dirname(database))
+
+    with WorkQueue(database) as first, WorkQueue(os.path.basename(database)) as second:
+        leased = [x["path"] for x in first.lease(15)]
+        leased += [x["path"] for x in second.lease(15)]
+
+    assert len(leased) == 20
+    assert len(set(leased)) == 20
+
+
+def test_lease_skips_valid_leases(database):
+    """
+    A leased workspace is not leased again while its lease is valid.
+    """
+
+    with WorkQueue(database) as queue:
+        first = queue.lease(1)
+
+        assert first
+        assert first[0]["path"] not in [x["path"] for x in queue.lease(30)]
+
+
+def test_lease_reuses_expired_leases(database):
+    """
+    Expired leases are dropped before leasing.
+    """
+
+    with WorkQueue(database) as queue:
+        leased = queue.lease(20, ttl=0.001)
+        time.sleep(0.01)
+
+        assert len(leased) == 20
+        assert len(queue.lease(20)) == 20
+
+
+def test_renew_and_release(database):
+    """
+    A released lease can't be renewed nor released again.
+    """
+
+    with WorkQueue(database) as queue:
+        token = queue.lease(1)[0]["token"]
+
+        assert queue.renew(token)
+        assert queue.release(token)
+        assert not queue.release(token)
+        assert not queue.renew(token)
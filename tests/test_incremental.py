@@ -0,0 +1,152 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the incremental testing of our inputs.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import pytest
+
+from dead_hosts.launcher.incremental import IncrementalTest
+from dead_hosts.launcher.normalization import InputNormalizer
+from dead_hosts.launcher.output import OutputWriter
+
+
+def read_subjects(path) -> list:
+    """
+    Provides the non-comment lines of the given file.
+    """
+
+    return [x for x in path.read_text().splitlines() if x and not x.startswith("#")]
+
+
+@pytest.fixture(name="workspace")
+def fixture_workspace(tmp_path):
+    """
+    Provides a workspace whose previous cycle tested a hosts file and found
+    a.com and b.com active.
+    """
+
+    (tmp_path / "origin.list").write_text(
+        "# A hosts file.\n0.0.0.0 a.com\n0.0.0.0 b.com\n127.0.0.1 d.com\n"
+    )
+    (tmp_path / "clean.list").write_text("# header\n\na.com\nb.com\n")
+
+    InputNormalizer(
+        str(tmp_path / "origin.list"), str(tmp_path / "subjects.list")
+    ).start()
+    IncrementalTest(str(tmp_path)).stage(str(tmp_path / "subjects.list")).promote()
+
+    return tmp_path
+
+
+def run_cycle(workspace, origin: str, active: str) -> dict:
+    """
+    Runs an incremental cycle over the given (hosts) origin, during which
+    PyFunceble found the given subjects active.
+
+    :return:
+        The statistics of the cycle.
+    """
+
+    (workspace / "origin.list").write_text(origin)
+
+    InputNormalizer(
+        str(workspace / "origin.list"), str(workspace / "subjects.list")
+    ).start()
+
+    incremental_test = IncrementalTest(str(workspace))
+    statistics = incremental_test.stage(str(workspace / "subjects.list")).prepare()
+
+    (workspace / "active.list").write_text("# PyFunceble\n" + active)
+
+    incremental_test.write_output(
+        str(workspace / "active.list"),
+        OutputWriter(str(workspace / "clean.list"), ["# header"]),
+    )
+    incremental_test.promote()
+
+    return statistics
+
+
+def test_only_added_subjects_are_tested(workspace):
+    """
+    Only the subjects added since the previous cycle are tested.
+    """
+
+    statistics = run_cycle(
+        workspace,
+        "0.0.0.0 a.com\n0.0.0.0 b.com\n127.0.0.1 d.com\n0.0.0.0 c.com\n",
+        "c.com\n",
+    )
+
+    assert statistics == {"added": 1, "removed": 0}
+    assert read_subjects(workspace / "added.list") == ["c.com"]
+
+
+def test_previous_results_are_carried_forward(workspace):
+    """
+    The subjects which were active - and are still listed - are kept.
+    """
+
+    run_cycle(
+        workspace,
+        "0.0.0.0 a.com\n0.0.0.0 b.com\n127.0.0.1 d.com\n0.0.0.0 c.com\n",
+        "c.com\n",
+    )
+
+    assert read_subjects(workspace / "clean.list") == ["a.com", "b.com", "c.com"]
+
+
+def test_removed_subjects_are_dropped(workspace):
+    """
+    The subjects removed from the input are dropped from the output.
+    """
+
+    statistics = run_cycle(workspace, "0.0.0.0 a.com\n127.0.0.1 d.com\n", "")
+
+    assert statistics == {"added": 0, "removed": 1}
+    assert read_subjects(workspace / "clean.list") == ["a.com"]
+
+
+def test_snapshot_holds_subjects(workspace):
+    """
+    The snapshot holds the subjects - not the hosts lines - even when staged
+    from the origin itself.
+    """
+
+    incremental_test = IncrementalTest(str(workspace))
+    incremental_test.stage(str(workspace / "origin.list")).promote()
+
+    assert read_subjects(workspace / "snapshot.list") == ["a.com", "b.com", "d.com"]
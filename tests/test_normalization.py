@@ -0,0 +1,126 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the normalization of our inputs.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import pytest
+
+from dead_hosts.launcher.normalization import (
+    InputNormalizer,
+    canonicalize,
+    canonicalize_adblock,
+)
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        (b"example.org\n", [b"example.org"]),
+        (b"  Example.ORG.  \n", [b"example.org"]),
+        (b"0.0.0.0 example.org\n", [b"example.org"]),
+        (b"127.0.0.1\tExample.org # comment\n", [b"example.org"]),
+        (
+            b"0.0.0.0 a.example.org b.example.org\n",
+            [b"a.example.org", b"b.example.org"],
+        ),
+        (b":: example.org\n", [b"example.org"]),
+        (b"a.example.org b.example.org\n", [b"a.example.org", b"b.example.org"]),
+        (b"192.0.2.1\n", [b"192.0.2.1"]),
+        (b"https://Example.org/Path\n", [b"https://Example.org/Path"]),
+        (b"example.org#comment\n", [b"example.org"]),
+        (b"# comment\n", []),
+        (b"! comment\n", []),
+        (b"   \n", []),
+    ],
+)
+def test_canonicalize(line, expected):
+    """
+    The subjects PyFunceble would extract are given - in their canonical
+    form.
+    """
+
+    assert canonicalize(line) == expected
+
+
+def test_canonicalize_adblock():
+    """
+    The adblock filters are decoded like PyFunceble would.
+    """
+
+    assert canonicalize_adblock(b"||Ads.Example.org^$third-party\n") == [
+        b"ads.example.org"
+    ]
+    assert not canonicalize_adblock(b"! comment\n")
+    assert not canonicalize_adblock(b"[Adblock Plus 2.0]\n")
+
+
+def test_input_normalizer_deduplicates_hosts_lines(tmp_path):
+    """
+    The same subject behind different IPs is only tested once.
+    """
+
+    (tmp_path / "origin.list").write_bytes(
+        b"# header\n0.0.0.0 b.example.org\n127.0.0.1 a.example.org\n"
+        b"0.0.0.0 a.example.org\nA.example.org.\n"
+    )
+
+    statistics = InputNormalizer(
+        str(tmp_path / "origin.list"), str(tmp_path / "subjects.list")
+    ).start()
+
+    assert (tmp_path / "subjects.list").read_bytes() == (
+        b"a.example.org\nb.example.org\n"
+    )
+    assert statistics["subjects"] == 4
+    assert statistics["unique_subjects"] == 2
+
+
+def test_input_normalizer_decodes_adblock(tmp_path):
+    """
+    An adblock filter list is decoded into plain subjects.
+    """
+
+    (tmp_path / "origin.list").write_bytes(
+        b"[Adblock Plus 2.0]\n! comment\n||b.example.org^\n||a.example.org^$popup\n"
+    )
+
+    InputNormalizer(
+        str(tmp_path / "origin.list"), str(tmp_path / "subjects.list"), adblock=True
+    ).start()
+
+    assert (tmp_path / "subjects.list").read_bytes() == (
+        b"a.example.org\nb.example.org\n"
+    )
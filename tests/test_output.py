@@ -0,0 +1,162 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the writer of our outputs.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import time
+
+from dead_hosts.launcher.output import OutputWriter
+
+HEADER = ["# Header", "# Second line"]
+
+
+def test_write_keeps_the_layout(tmp_path):
+    """
+    The outputs hold the header, an empty line, the non-comment lines and an
+    empty line.
+    """
+
+    (tmp_path / "ACTIVE").write_bytes(b"# PyFunceble\na.com\nb.com\n")
+
+    written = OutputWriter(str(tmp_path / "clean.list"), HEADER).write(
+        [str(tmp_path / "ACTIVE")]
+    )
+
+    assert written == 2
+    assert (tmp_path / "clean.list").read_bytes() == (
+        b"# Header\n# Second line\n\na.com\nb.com\n\n"
+    )
+
+
+def test_write_without_trailing_new_line(tmp_path):
+    """
+    Without the trailing new line, the outputs end with their last line -
+    even if a source isn't terminated.
+    """
+
+    (tmp_path / "first").write_bytes(b"a.com")
+    (tmp_path / "second").write_bytes(b"# Comment\nb.com\n")
+
+    OutputWriter(str(tmp_path / "clean.list"), HEADER).write(
+        [str(tmp_path / "first"), str(tmp_path / "second")], trailing_new_line=False
+    )
+
+    assert (tmp_path / "clean.list").read_bytes() == (
+        b"# Header\n# Second line\n\na.com\nb.com\n"
+    )
+
+
+def test_write_unterminated_source(tmp_path):
+    """
+    A source which doesn't end with a new line is not followed by an extra
+    empty line.
+    """
+
+    (tmp_path / "ACTIVE").write_bytes(b"# PyFunceble\na.com\nb.com")
+
+    written = OutputWriter(str(tmp_path / "clean.list"), HEADER).write(
+        [str(tmp_path / "ACTIVE")]
+    )
+
+    assert written == 2
+    assert (tmp_path / "clean.list").read_bytes() == (
+        b"# Header\n# Second line\n\na.com\nb.com\n"
+    )
+
+    written = OutputWriter(str(tmp_path / "platform.list"), HEADER).write(
+        [str(tmp_path / "ACTIVE")], keep_empty=False, trailing_new_line=False
+    )
+
+    assert written == 2
+    assert (tmp_path / "platform.list").read_bytes() == (
+        b"# Header\n# Second line\n\na.com\nb.com"
+    )
+
+
+def test_write_nothing_to_write(tmp_path):
+    """
+    The outputs are kept when there is nothing to write - if wanted.
+    """
+
+    (tmp_path / "clean.list").write_bytes(b"previous\n")
+    (tmp_path / "ACTIVE").write_bytes(b"# PyFunceble\n")
+
+    written = OutputWriter(str(tmp_path / "clean.list"), HEADER).write(
+        [str(tmp_path / "ACTIVE")], keep_empty=False
+    )
+
+    assert written == 0
+    assert (tmp_path / "clean.list").read_bytes() == b"previous\n"
+
+
+def test_write_unchanged_subjects(tmp_path, monkeypatch):
+    """
+    The outputs - and their archives - are kept when only their header (or
+    serial) would change.
+    """
+
+    serials = iter(range(1, 100))
+    monkeypatch.setattr(time, "time", lambda: next(serials))
+    (tmp_path / "ACTIVE").write_bytes(b"a.com\nb.com\n")
+
+    def write(header) -> None:
+        OutputWriter(
+            str(tmp_path / "clean.list"),
+            header,
+            formats={"rpz": str(tmp_path / "clean.rpz")},
+            compressions=["gz"],
+        ).write([str(tmp_path / "ACTIVE")])
+
+    write(["# Generation Time: 1"])
+    expected = {x.name: x.read_bytes() for x in tmp_path.glob("clean.*")}
+
+    write(["# Generation Time: 2"])
+
+    assert {x.name: x.read_bytes() for x in tmp_path.glob("clean.*")} == expected
+
+    (tmp_path / "clean.rpz.gz").unlink()
+    write(["# Generation Time: 3"])
+
+    assert (tmp_path / "clean.rpz.gz").exists()
+    assert b"Generation Time: 3" in (tmp_path / "clean.list").read_bytes()
+
+    (tmp_path / "ACTIVE").write_bytes(b"a.com\n")
+    write(["# Generation Time: 4"])
+
+    assert (tmp_path / "clean.list").read_bytes() == (
+        b"# Generation Time: 4\n\na.com\n\n"
+    )
+    assert not list(tmp_path.glob(".*.tmp"))
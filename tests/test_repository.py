@@ -0,0 +1,98 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the lookup of our repository identity.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import pytest
+
+from dead_hosts.launcher.repository import (
+    parse_repository_base,
+    read_remote_url_from_config,
+)
+
+
+def write_config(git_dir, remote_section: str) -> None:
+    """
+    Writes a git configuration with the given remote section.
+    """
+
+    git_dir.mkdir(exist_ok=True)
+    (git_dir / "config").write_text(
+        "[core]\n\trepositoryformatversion = 0\n" + remote_section
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://github.com/dead-hosts/example.git",
+        "https://github.com/dead-hosts/example.git ; the origin",
+        "https://github.com/dead-hosts/example.git# the origin",
+        '"https://github.com/dead-hosts/example.git" # the origin',
+    ],
+)
+def test_read_remote_url(tmp_path, url):
+    """
+    The URL is read without its inline comment and quotes.
+    """
+
+    write_config(tmp_path, f'[remote "origin"]\n\turl = {url}\n\tfetch = x\n')
+
+    remote_url = read_remote_url_from_config(str(tmp_path))
+
+    assert remote_url == "https://github.com/dead-hosts/example.git"
+    assert parse_repository_base(remote_url) == "dead-hosts/example"
+
+
+@pytest.mark.parametrize(
+    "remote_section",
+    [
+        '[remote "origin"]\n\turl = https://a.example/x/y\n'
+        "\turl = https://b.example/x/z\n",
+        '[remote "origin"]\n\turl = https://a.example/x/y\n'
+        '[remote "origin"]\n\turl = https://b.example/x/z\n',
+        '[url "git@github.com:"]\n\tinsteadOf = https://github.com/\n'
+        '[remote "origin"]\n\turl = https://github.com/x/y\n',
+    ],
+)
+def test_read_remote_url_untrusted(tmp_path, remote_section):
+    """
+    Git is asked when the configuration alone can't tell.
+    """
+
+    write_config(tmp_path, remote_section)
+
+    assert read_remote_url_from_config(str(tmp_path)) is None
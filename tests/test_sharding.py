@@ -0,0 +1,103 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests the side by side tests of the shards.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from dead_hosts.launcher.command import CommandError, CommandTimeoutError
+from dead_hosts.launcher.sharding import ShardSupervisor
+
+
+def get_usage(wall_seconds, **kwargs):
+    """
+    Provides the usage of a shard.
+    """
+
+    return {
+        "wall_seconds": wall_seconds,
+        "user_cpu_seconds": 1.0,
+        "system_cpu_seconds": 0.5,
+        "max_rss_kib": 100,
+        "voluntary_context_switches": 10,
+        "involuntary_context_switches": 1,
+        **kwargs,
+    }
+
+
+def test_start_keeps_the_usage_of_killed_shards(tmp_path, monkeypatch):
+    """
+    What a shard consumed before it was killed is part of the usage - which
+    is flagged as timed out.
+    """
+
+    def run_shard(index):
+        if index == 1:
+            raise CommandTimeoutError("Too late.", usage=get_usage(5.0, timed_out=True))
+
+        return SimpleNamespace(usage=get_usage(2.0))
+
+    supervisor = ShardSupervisor(str(tmp_path), shards=2, config_dir=str(tmp_path))
+    monkeypatch.setattr(supervisor, "run_shard", run_shard)
+
+    assert supervisor.start() is False
+    assert supervisor.usage["shards"] == 2
+    assert supervisor.usage["wall_seconds"] == 5.0
+    assert supervisor.usage["max_rss_kib"] == 200
+    assert supervisor.usage["timed_out"] is True
+
+
+def test_start_keeps_the_usage_of_failed_shards(tmp_path, monkeypatch):
+    """
+    What a failed shard consumed is part of the usage too.
+    """
+
+    def run_shard(index):
+        if index == 0:
+            raise CommandError("Failed.", returncode=1, usage=get_usage(1.0))
+
+        return SimpleNamespace(usage=get_usage(2.0))
+
+    supervisor = ShardSupervisor(str(tmp_path), shards=2, config_dir=str(tmp_path))
+    monkeypatch.setattr(supervisor, "run_shard", run_shard)
+
+    with pytest.raises(CommandError):
+        supervisor.start()
+
+    assert supervisor.usage["shards"] == 2
+    assert supervisor.usage["timed_out"] is False
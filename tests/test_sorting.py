@@ -0,0 +1,125 @@
+"""
+Dead Hosts's launcher - The launcher of the Dead-Hosts infrastructure.
+
+Tests our (external) sorting and the merges of sorted iterables.
+
+Author:
+    Nissar Chababy, @funilrys, contactTATAfunilrysTODTODcom
+
+Project link:
+    https://github.com/dead-hosts/infrastructure-launcher
+
+License:
+::
+
+    MIT License
+
+    Copyright (c) 2019, 2020, 2021, 2022, 2023, 2024 Dead Hosts Contributors
+    Copyright (c) 2019, 2020. 2021, 2022, 2023, 2024 Nissar Chababy
+
+    Permission is hereby granted, free of charge, to any person obtaining a copy
+    of this software and associated documentation files (the "Software"), to deal
+    in the Software without restriction, including without limitation the rights
+    to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+    copies of the Software, and to permit persons to whom the Software is
+    furnished to do so, subject to the following conditions:
+
+    The above copyright notice and this permission notice shall be included in all
+    copies or substantial portions of the Software.
+
+    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+    IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+    LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+    OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+    SOFTWARE.
+"""
+
+import random
+
+import pytest
+
+import dead_hosts.launcher.sorting
+from dead_hosts.launcher.sorting import (
+    diff_sorted,
+    intersect_sorted,
+    read_sorted,
+    sort_unique,
+    union_sorted,
+)
+
+# Some of them hold bytes which sort before the new line ending the lines
+# of the runs.
+ITEMS = [b"a", b"a\x01", b"a\t", b"a.com", b"b", b"a\x01b", b"\x00", b"zz"]
+
+
+@pytest.mark.parametrize("memory_limit", [1, 1024 * 1024])
+def test_sort_unique(memory_limit, tmp_path, monkeypatch):
+    """
+    The items are sorted and deduplicated - whether they are spilled to the
+    disk or not.
+    """
+
+    # Many small runs.
+    monkeypatch.setattr(dead_hosts.launcher.sorting, "BATCH_SIZE", 7)
+
+    items = ITEMS * 3 + [f"subject-{x}".encode() for x in range(500)] * 2
+    random.Random(42).shuffle(items)
+
+    assert list(
+        sort_unique(items, memory_limit=memory_limit, directory=str(tmp_path))
+    ) == sorted(set(items))
+
+
+def test_sort_unique_empty():
+    """
+    Nothing to sort gives nothing.
+    """
+
+    assert not list(sort_unique([]))
+
+
+def test_read_sorted(tmp_path):
+    """
+    Blank lines and comments are skipped, the lines are stripped.
+    """
+
+    (tmp_path / "list").write_bytes(b"# comment\n\n a.com \nb.com")
+
+    assert list(read_sorted(str(tmp_path / "list"))) == [b"a.com", b"b.com"]
+
+
+def test_diff_sorted():
+    """
+    The items only in the new iterable are added, the ones only in the old
+    one are removed.
+    """
+
+    old = [b"a", b"b", b"d", b"f"]
+    new = [b"b", b"c", b"d", b"e", b"g"]
+
+    assert list(diff_sorted(old, new)) == [
+        (False, b"a"),
+        (True, b"c"),
+        (True, b"e"),
+        (False, b"f"),
+        (True, b"g"),
+    ]
+    assert not list(diff_sorted(old, old))
+    assert list(diff_sorted([], [b"a"])) == [(True, b"a")]
+    assert list(diff_sorted([b"a"], [])) == [(False, b"a")]
+
+
+def test_intersect_and_union_sorted():
+    """
+    The intersection and the union of sorted iterables are sorted and
+    deduplicated.
+    """
+
+    first = [b"a", b"b", b"d"]
+    second = [b"b", b"c", b"d", b"e"]
+
+    assert list(intersect_sorted(first, second)) == [b"b", b"d"]
+    assert list(union_sorted(first, second)) == [b"a", b"b", b"c", b"d", b"e"]
+    assert not list(intersect_sorted(first, []))